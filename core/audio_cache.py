@@ -0,0 +1,177 @@
+"""
+Ses önbelleği - Zil seslerini bir kez çözüp PCM olarak bellekte tutar
+"""
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Iterable, List, NamedTuple, Optional, Set
+from PySide6.QtCore import QObject, QUrl, Signal
+from PySide6.QtMultimedia import QAudioDecoder, QAudioFormat, QMediaDevices
+
+
+# settings.json -> system.ses_onbellegi_mb
+VARSAYILAN_BUTCE_MB = 64
+
+
+class CozulmusSes(NamedTuple):
+    """Bellekteki çözülmüş ses"""
+    veri: bytes  # Ham PCM
+    bicim: QAudioFormat
+    mtime_ns: Optional[int]  # Dosya değişirse önbellek geçersiz olur
+    
+    @property
+    def boyut(self) -> int:
+        return len(self.veri)
+
+
+class SesOnbellegi(QObject):
+    """Çözülmüş ses dosyaları için bellek bütçeli LRU önbellek
+    
+    Dosyalar arka planda ve sırayla (aynı anda tek dosya) çözülür. Bütçe aşılınca
+    en uzun süredir çalınmayan ses atılır; bütçeden büyük dosyalar hiç tutulmaz.
+    Sabitlenen sesler (acil durum sireni) bütçeye sayılmaz ve hiç atılmaz.
+    """
+    
+    hazir = Signal(str)  # Çözülüp önbelleğe alınan dosya yolu
+    
+    def __init__(self, butce_mb: float = VARSAYILAN_BUTCE_MB):
+        super().__init__()
+        self.butce = int(butce_mb * 1024 * 1024)
+        self._sesler: "OrderedDict[Path, CozulmusSes]" = OrderedDict()
+        self._boyut = 0
+        self._bekleyenler: List[Path] = []
+        self._sabitler: Set[Path] = set()
+        self._sabit_sesler: Dict[Path, CozulmusSes] = {}
+        
+        self._decoder = QAudioDecoder(self)
+        # Cihazın tercih ettiği biçime çözülür; çalarken dönüştürme gerekmez
+        bicim = QMediaDevices.defaultAudioOutput().preferredFormat()
+        bicim.setSampleFormat(QAudioFormat.SampleFormat.Int16)
+        self._decoder.setAudioFormat(bicim)
+        self.bicim = bicim
+        self._decoder.bufferReady.connect(self._on_buffer_ready)
+        self._decoder.finished.connect(self._on_finished)
+        self._decoder.error.connect(self._on_error)
+        self._cozulen: Optional[Path] = None
+        self._parcalar: List[bytes] = []
+        self._format: Optional[QAudioFormat] = None
+    
+    def butce_ayarla(self, butce_mb: float):
+        """Bellek bütçesini değiştir (gerekirse eski sesleri at)"""
+        self.butce = int(max(0.0, butce_mb) * 1024 * 1024)
+        self._sigdir(0)
+    
+    def sabitle(self, yollar: Iterable[Path]):
+        """Verilen sesleri bütçeden bağımsız olarak sürekli bellekte tut (öncekilerin yerine)"""
+        self._sabitler = {Path(yol) for yol in yollar}
+        for yol in list(self._sabit_sesler):
+            if yol not in self._sabitler:
+                # Sabitliği kalkan ses sıradan önbelleğe döner
+                self._ekle(yol, self._sabit_sesler.pop(yol))
+        for yol in self._sabitler:
+            ses = self._sesler.get(yol)
+            if ses is not None:
+                self._cikar(yol)
+                self._sabit_sesler[yol] = ses
+            else:
+                self.iste(yol)
+    
+    def get(self, path: Path) -> Optional[CozulmusSes]:
+        """Önbellekteki güncel sesi döndür ve en yeni kullanılan yap"""
+        sabit = path in self._sabit_sesler
+        ses = self._sabit_sesler.get(path) if sabit else self._sesler.get(path)
+        if ses is None:
+            return None
+        try:
+            mtime_ns = path.stat().st_mtime_ns
+        except OSError:
+            mtime_ns = None
+        if mtime_ns != ses.mtime_ns:
+            if sabit:
+                del self._sabit_sesler[path]
+                self.iste(path)
+            else:
+                self._cikar(path)
+            return None
+        if not sabit:
+            self._sesler.move_to_end(path)
+        return ses
+    
+    def iste(self, path: Path):
+        """Ses önbellekte yoksa çözülmek üzere sıraya al"""
+        path = Path(path)
+        if path in self._sesler or path in self._sabit_sesler or path == self._cozulen or path in self._bekleyenler:
+            return
+        self._bekleyenler.append(path)
+        if self._cozulen is None:
+            self._sonraki()
+    
+    def isit(self, yollar: Iterable[Path]):
+        """Yapılandırılmış seslerin hepsini önceden çöz"""
+        for yol in yollar:
+            self.iste(yol)
+    
+    def boyut(self) -> int:
+        """Önbellekteki toplam bayt"""
+        return self._boyut
+    
+    def _sonraki(self):
+        self._cozulen = None
+        while self._bekleyenler:
+            path = self._bekleyenler.pop(0)
+            if path.exists():
+                self._cozulen = path
+                self._parcalar = []
+                self._format = None
+                self._decoder.setSource(QUrl.fromLocalFile(str(path.absolute())))
+                self._decoder.start()
+                return
+    
+    def _on_buffer_ready(self):
+        buffer = self._decoder.read()
+        if not buffer.isValid():
+            return
+        if self._format is None:
+            self._format = buffer.format()
+        self._parcalar.append(bytes(buffer.constData())[:buffer.byteCount()])
+    
+    def _on_finished(self):
+        path = self._cozulen
+        if path is not None and self._format is not None:
+            veri = b"".join(self._parcalar)
+            try:
+                mtime_ns = path.stat().st_mtime_ns
+            except OSError:
+                mtime_ns = None
+            self._ekle(path, CozulmusSes(veri, self._format, mtime_ns))
+        self._parcalar = []
+        self._decoder.stop()
+        self._sonraki()
+    
+    def _on_error(self, _hata):
+        print(f"Ses çözülemedi: {self._cozulen} ({self._decoder.errorString()})")
+        self._parcalar = []
+        self._decoder.stop()
+        self._sonraki()
+    
+    def _ekle(self, path: Path, ses: CozulmusSes):
+        if path in self._sabitler:
+            self._sabit_sesler[path] = ses
+            self.hazir.emit(str(path))
+            return
+        if ses.boyut > self.butce:
+            return  # Bütçeden büyük dosya diskten çalınmaya devam eder
+        self._cikar(path)
+        self._sigdir(ses.boyut)
+        self._sesler[path] = ses
+        self._boyut += ses.boyut
+        self.hazir.emit(str(path))
+    
+    def _cikar(self, path: Path):
+        ses = self._sesler.pop(path, None)
+        if ses is not None:
+            self._boyut -= ses.boyut
+    
+    def _sigdir(self, yeni_boyut: int):
+        """En eski kullanılan sesleri bütçeye sığana kadar at"""
+        while self._sesler and self._boyut + yeni_boyut > self.butce:
+            self._cikar(next(iter(self._sesler)))
@@ -0,0 +1,281 @@
+"""
+Teneffüs müziği - Ders çıkışından sonraki öğrenci girişine kadar sounds/muzik_yayini/ parçalarını çalar
+"""
+import os
+import random
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Callable, List, Optional
+from PySide6.QtCore import QObject, QTimer, QUrl, Signal
+from PySide6.QtMultimedia import QMediaPlayer, QAudioOutput
+
+from core.timeline import ZamanCizelgesi
+
+
+MUZIK_UZANTILARI = {".mp3", ".wav", ".wma", ".m4a", ".aac", ".ogg", ".flac"}
+
+# settings.json -> muzik
+VARSAYILAN_AYARLAR = {
+    "etkin": False,
+    "karisik": True,
+    "ses_seviyesi": 40,
+    "solma_sn": 8,
+    "kisma_db": -18
+}
+
+# Müzik bu kadar önce tamamen susar; zil hiçbir koşulda müziği beklemez
+ZIL_PAYI_SN = 1.0
+GIRIS_SN = 2.0  # Açılışta sesin yükselme süresi
+KISMA_GECIS_SN = 0.4  # Zil/anons başlayınca kısılma süresi
+ADIM_MS = 50
+# Program değişse veya saat ayarlansa da en geç bu kadar sürede yeniden denetlenir
+DENETIM_SN = 30
+
+
+class TeneffusMuzigi(QObject):
+    """Teneffüslerde müzik yayını
+    
+    Parçalar diskten akıtılarak çalınır (çözülmüş hali bellekte tutulmaz), bu yüzden
+    bellek kullanımı klasörün büyüklüğünden bağımsızdır. Çalan parça sürerken sıradaki
+    ikinci bir oynatıcıya yüklenir. Zil veya anons başlayınca müzik kısılır; teneffüsün
+    sonundaki zilden önce yavaşça susar.
+    """
+    
+    parca_basladi = Signal(str)
+    
+    def __init__(self, sound_player, klasor: Path):
+        super().__init__()
+        self.sound_player = sound_player
+        self.klasor = Path(klasor)
+        self.etkin = False
+        self.karisik = True
+        self.ses_seviyesi = VARSAYILAN_AYARLAR["ses_seviyesi"]
+        self.solma_sn = VARSAYILAN_AYARLAR["solma_sn"]
+        self.kisma = 10 ** (VARSAYILAN_AYARLAR["kisma_db"] / 20)
+        self._cizelge: Optional[ZamanCizelgesi] = None
+        self._calabilir: Callable[[], bool] = lambda: True
+        
+        self._liste: List[Path] = []
+        self._oynatici, self._cikis = self._yeni_oynatici()
+        # Sıradaki parça bu oynatıcıda önceden açılır
+        self._sonraki, self._sonraki_cikis = self._yeni_oynatici()
+        self._sonraki_yol: Optional[Path] = None
+        self._son_yol: Optional[Path] = None
+        self._caliyor = False
+        self._hatalar = 0
+        
+        self._bitis: Optional[datetime] = None  # Çalınan teneffüsü bitiren zil
+        self._atlanan: Optional[datetime] = None  # Elle durdurulan teneffüs (yeniden başlamaz)
+        self._susuyor = False
+        self._kisik = False
+        self._seviye = 0.0
+        self._hiz = 0.0
+        
+        self._timer = QTimer()
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self._denetle)
+        self._seviye_timer = QTimer()
+        self._seviye_timer.setInterval(ADIM_MS)
+        self._seviye_timer.timeout.connect(self._seviye_adimi)
+        
+        sound_player.oge_basladi.connect(lambda _oge: self._kis(True))
+        sound_player.finished.connect(lambda: self._kis(False))
+    
+    def _yeni_oynatici(self):
+        player = QMediaPlayer()
+        output = QAudioOutput()
+        output.setVolume(0.0)
+        player.setAudioOutput(output)
+        player.mediaStatusChanged.connect(lambda durum, p=player: self._on_media_status(p, durum))
+        player.errorOccurred.connect(lambda _hata, _mesaj, p=player: self._on_error(p))
+        player.playbackStateChanged.connect(lambda durum, p=player: self._on_playback_state(p, durum))
+        return player, output
+    
+    def ayarla(self, ayarlar: dict):
+        """settings.json'daki muzik bölümünü uygula"""
+        ayarlar = {**VARSAYILAN_AYARLAR, **(ayarlar if isinstance(ayarlar, dict) else {})}
+        try:
+            self.etkin = bool(ayarlar["etkin"])
+            self.karisik = bool(ayarlar["karisik"])
+            self.ses_seviyesi = max(0, min(100, int(ayarlar["ses_seviyesi"])))
+            self.solma_sn = max(0.0, float(ayarlar["solma_sn"]))
+            self.kisma = 10 ** (min(0.0, float(ayarlar["kisma_db"])) / 20)
+        except (TypeError, ValueError):
+            pass
+        self._liste = []
+        self._denetle()
+    
+    def programi_ayarla(self, cizelge: ZamanCizelgesi, calabilir: Callable[[], bool]):
+        """Derlenmiş programı ve müziğin çalabileceği durumları (zil açık, tatil/sınav değil) ver"""
+        self._cizelge = cizelge
+        self._calabilir = calabilir
+        self._denetle()
+    
+    def caliyor_mu(self) -> bool:
+        return self._caliyor
+    
+    def durdur(self, sure_sn: float = 0.5):
+        """Müziği bu teneffüs için kapat (sonraki teneffüste yeniden başlar)"""
+        self._atlanan = self._bitis
+        self._sustur(sure_sn)
+    
+    def _teneffus(self, simdi: datetime) -> Optional[datetime]:
+        """Şu an teneffüsteyse teneffüsü bitiren zilin zamanı"""
+        if self._cizelge is None:
+            return None
+        dakika = simdi.hour * 60 + simdi.minute + simdi.second / 60
+        gun_basi = datetime.combine(simdi.date(), datetime.min.time())
+        for bas, bit in self._cizelge.tarih(simdi.date()).teneffusler():
+            if bas <= dakika < bit:
+                return gun_basi + timedelta(minutes=bit)
+        return None
+    
+    def _denetle(self):
+        """Teneffüs başladıysa müziği aç, bitmek üzereyse sustur; sonraki denetimi kur"""
+        simdi = datetime.now()
+        bitis = self._teneffus(simdi)
+        if bitis is None or not self.etkin or not self._calabilir() or bitis == self._atlanan:
+            if self._caliyor and not self._susuyor:
+                self._sustur(1.0)
+            self._bitis = None
+            self._timer.start(DENETIM_SN * 1000)
+            return
+        
+        self._bitis = bitis
+        kalan = (bitis - simdi).total_seconds() - ZIL_PAYI_SN
+        if kalan <= self.solma_sn:
+            # Zil yaklaştı: kalan sürede sus (zil beklemez)
+            if self._caliyor and not self._susuyor:
+                self._sustur(max(0.0, kalan))
+            self._timer.start(int(max(1.0, kalan + ZIL_PAYI_SN + 1) * 1000))
+            return
+        if not self._caliyor:
+            self._baslat()
+        self._timer.start(int(min(DENETIM_SN, kalan - self.solma_sn) * 1000))
+    
+    def _parcalar(self) -> List[Path]:
+        """Klasördeki müzik dosyaları (yalnızca yollar tutulur)"""
+        parcalar = []
+        if self.klasor.is_dir():
+            for kok, _, dosyalar in os.walk(self.klasor):
+                parcalar.extend(Path(kok) / ad for ad in dosyalar if Path(ad).suffix.lower() in MUZIK_UZANTILARI)
+        if self.karisik:
+            random.shuffle(parcalar)
+        else:
+            parcalar.sort(key=lambda p: str(p).casefold())
+        return parcalar
+    
+    def _siradaki_yol(self) -> Optional[Path]:
+        if not self._liste:
+            self._liste = self._parcalar()
+            # Karışık listenin yeniden başında aynı parça arka arkaya gelmesin
+            if len(self._liste) > 1 and self._liste[0] == self._son_yol:
+                self._liste.append(self._liste.pop(0))
+        if not self._liste:
+            return None
+        self._son_yol = self._liste.pop(0)
+        return self._son_yol
+    
+    def _baslat(self):
+        self._caliyor = True
+        self._susuyor = False
+        self._hatalar = 0
+        self._seviye = 0.0
+        self._kisik = self.sound_player.is_playing()
+        self._hiz = 1.0 / (GIRIS_SN * 1000 / ADIM_MS)
+        if not self._parca_cal():
+            self._caliyor = False
+            return
+        self._seviye_timer.start()
+    
+    def _parca_cal(self) -> bool:
+        """Sıradaki parçayı çal ve ondan sonrakini önceden yükle"""
+        yol = self._sonraki_yol if self._sonraki_yol is not None else self._siradaki_yol()
+        if yol is None:
+            return False
+        if yol == self._sonraki_yol:
+            # Önceden açılmış oynatıcı öne alınır
+            self._oynatici, self._sonraki = self._sonraki, self._oynatici
+            self._cikis, self._sonraki_cikis = self._sonraki_cikis, self._cikis
+        else:
+            self._oynatici.setSource(QUrl.fromLocalFile(str(yol)))
+        self._sonraki_yol = None
+        self._sonraki.setSource(QUrl())
+        self._cikis.setVolume(self._cikis_seviyesi())
+        self._oynatici.play()
+        self.parca_basladi.emit(yol.stem)
+        
+        self._sonraki_yol = self._siradaki_yol()
+        if self._sonraki_yol is not None:
+            # Sessizce başlatılıp durdurulur; çözücü ve dosya hazır bekler
+            self._sonraki_cikis.setVolume(0.0)
+            self._sonraki.setSource(QUrl.fromLocalFile(str(self._sonraki_yol)))
+            self._sonraki.play()
+        return True
+    
+    def _on_media_status(self, player: QMediaPlayer, durum):
+        if player is self._oynatici and durum == QMediaPlayer.MediaStatus.EndOfMedia and self._caliyor:
+            if not self._susuyor:
+                self._hatalar = 0
+                self._parca_cal()
+    
+    def _on_playback_state(self, player: QMediaPlayer, durum):
+        if player is self._sonraki and durum == QMediaPlayer.PlaybackState.PlayingState:
+            player.pause()
+            player.setPosition(0)
+    
+    def _on_error(self, player: QMediaPlayer):
+        if player is self._sonraki:
+            # Açılamayan parça atlanır
+            self._sonraki_yol = None
+            return
+        if not self._caliyor or self._susuyor:
+            return
+        print(f"Müzik çalınamadı: {player.source().toLocalFile()} ({player.errorString()})")
+        self._hatalar += 1
+        # Klasördeki hiçbir parça açılmıyorsa bu teneffüs için vazgeç
+        if self._hatalar > max(3, len(self._liste)) or not self._parca_cal():
+            self._bitir()
+    
+    def _kis(self, kisik: bool):
+        """Zil/anons çalarken müziği kıs, bitince geri aç"""
+        self._kisik = kisik
+        if self._caliyor and not self._susuyor:
+            self._hiz = 1.0 / (KISMA_GECIS_SN * 1000 / ADIM_MS)
+    
+    def _sustur(self, sure_sn: float):
+        """Müziği sure_sn içinde sıfıra indirip durdur"""
+        if not self._caliyor:
+            return
+        if sure_sn <= 0:
+            self._bitir()
+            return
+        self._susuyor = True
+        self._hiz = max(self._seviye, 1e-3) / (sure_sn * 1000 / ADIM_MS)
+    
+    def _hedef(self) -> float:
+        if self._susuyor:
+            return 0.0
+        return self.kisma if self._kisik else 1.0
+    
+    def _cikis_seviyesi(self) -> float:
+        return self.ses_seviyesi / 100.0 * self._seviye
+    
+    def _seviye_adimi(self):
+        hedef = self._hedef()
+        if self._seviye < hedef:
+            self._seviye = min(hedef, self._seviye + self._hiz)
+        else:
+            self._seviye = max(hedef, self._seviye - self._hiz)
+        self._cikis.setVolume(self._cikis_seviyesi())
+        if self._susuyor and self._seviye <= 0.0:
+            self._bitir()
+    
+    def _bitir(self):
+        self._seviye_timer.stop()
+        self._caliyor = False
+        self._susuyor = False
+        self._oynatici.stop()
+        self._sonraki.stop()
+        self._sonraki.setSource(QUrl())
+        self._sonraki_yol = None
@@ -0,0 +1,119 @@
+"""
+Acil durum - Siren ve siren + İstiklal Marşı'nı bellekte hazır tutar, tetiklenince çalan her şeyi keser
+"""
+import time
+from collections import deque
+from typing import Callable, Deque, List, Optional, Tuple
+from PySide6.QtCore import QObject, Signal
+
+from core.sound_player import CalmaOgesi, CalmaOturumu
+
+
+# Tetikleme türleri (tepsi menüsü, kısayollar ve yerel komutlar aynı adları kullanır)
+ACIL_SIREN = "siren"
+ACIL_SIREN_MARS = "siren_mars"
+TURLER = (ACIL_SIREN, ACIL_SIREN_MARS)
+
+# settings.json -> system.acil_kisayollari
+VARSAYILAN_KISAYOLLAR = {
+    ACIL_SIREN: "Ctrl+Alt+F12",
+    ACIL_SIREN_MARS: "Ctrl+Alt+F11"
+}
+
+# Gecikme özeti için tutulan son ölçüm sayısı
+OLCUM_SAYISI = 50
+# Siren tetiklenmek üzereyken (pencere etkinleşti, tepsi menüsü açıldı) ses cihazı bu kadar açık tutulur
+HAZIR_TUT_SN = 120
+
+
+class AcilDurum(QObject):
+    """Acil durum ve tatbikat sirenleri
+    
+    Siren sesleri önbelleğe sabitlenir (bütçeye sayılmaz, hiç atılmaz). Pencere
+    etkinleşince veya tepsi menüsü açılınca karıştırıcının ses cihazı kısa bir süre açık
+    tutulur; kısayol ve komutla tetiklemede cihazın açılması beklenir. Tetiklenince çalan
+    zil, anons ve arka plan sesleri kesilir, siren en yüksek öncelikle bellekten çalmaya
+    başlar. Tetiklemeden sesin ses cihazına yazıldığı ana kadar geçen süre ölçülür ve
+    calindi sinyaliyle bildirilir.
+    """
+    
+    calindi = Signal(str, str, float)  # (tür, tetikleyen, tetiklemeden sese ms)
+    
+    def __init__(self, sound_player, settings):
+        super().__init__()
+        self.sound_player = sound_player
+        self.settings = settings
+        self.gecikmeler: Deque[float] = deque(maxlen=OLCUM_SAYISI)
+        # Sesi henüz başlamamış tetikleme: (tür, tetikleyen, monotonic zaman)
+        self._bekleyen: Optional[Tuple[str, str, float]] = None
+        sound_player.basladi.connect(self._on_basladi)
+    
+    def ogeler(self, tur: str) -> List[CalmaOgesi]:
+        """Tetikleme türünün çalacağı sesler"""
+        sounds = self.settings.sounds()
+        siren = sounds.get("siren", "siren/siren.mp3")
+        if tur == ACIL_SIREN:
+            return [CalmaOgesi(siren, self.settings.volume("siren"), aciklama="Siren çalındı")]
+        try:
+            bosluk_ms = max(0, int(self.settings.system("sira_boslugu_ms", 0)))
+        except (TypeError, ValueError):
+            bosluk_ms = 0
+        return [
+            CalmaOgesi(sounds.get("siren_mars_siren", siren), self.settings.volume("siren"),
+                       aciklama="Siren çalındı"),
+            CalmaOgesi(sounds.get("siren_mars_mars", sounds.get("mars", "marslar/istiklal.mp3")),
+                       self.settings.volume("mars"), bosluk_ms, "İstiklal Marşı çalındı")
+        ]
+    
+    def kisayollar(self) -> dict:
+        """Tür -> tuş birleşimi (ayarlarda boş bırakılan kısayol kapalıdır)"""
+        ayar = self.settings.system("acil_kisayollari", {})
+        return {**VARSAYILAN_KISAYOLLAR, **(ayar if isinstance(ayar, dict) else {})}
+    
+    def hazirla(self):
+        """Acil durum seslerini çözüp belleğe sabitle (ayarlar değişince yeniden çağrılır)"""
+        self.sound_player.sabitle(oge.dosya for tur in TURLER for oge in self.ogeler(tur))
+    
+    def hazir_tut(self):
+        """Siren birazdan tetiklenebilir: ses cihazını HAZIR_TUT_SN açık tut"""
+        self.sound_player.cihazi_acik_tut(HAZIR_TUT_SN)
+    
+    def tetikle(self, tur: str, tetikleyen: str,
+                her_ogede: Optional[Callable[[CalmaOgesi], None]] = None) -> Optional[CalmaOturumu]:
+        """Çalan her şeyi kesip sireni çal
+        
+        Args:
+            tur: ACIL_SIREN veya ACIL_SIREN_MARS
+            tetikleyen: Gecikme kaydında görünecek kaynak (düğme, tepsi, kısayol, komut)
+        
+        Returns:
+            Çalma oturumu; tür bilinmiyorsa None
+        """
+        baslangic = time.monotonic()
+        if tur not in TURLER:
+            return None
+        self._bekleyen = (tur, tetikleyen, baslangic)
+        oturum = self.sound_player.acil_cal(self.ogeler(tur), her_ogede)
+        # Siren başlamadan başka bir sesle kesilirse o sesin gecikmesi sirene yazılmasın
+        oturum.bitince(lambda _oturum: self._vazgec(baslangic))
+        return oturum
+    
+    def _vazgec(self, baslangic: float):
+        if self._bekleyen is not None and self._bekleyen[2] == baslangic:
+            self._bekleyen = None
+    
+    def _on_basladi(self, _gecikme_ms: float, _hazirdan: bool):
+        if self._bekleyen is None:
+            return
+        tur, tetikleyen, baslangic = self._bekleyen
+        self._bekleyen = None
+        gecikme_ms = (time.monotonic() - baslangic) * 1000
+        self.gecikmeler.append(gecikme_ms)
+        self.calindi.emit(tur, tetikleyen, gecikme_ms)
+    
+    def ozet(self) -> Optional[Tuple[float, float]]:
+        """Son ölçümlerin (ortanca, en kötü) gecikmesi (ms)"""
+        if not self.gecikmeler:
+            return None
+        sirali = sorted(self.gecikmeler)
+        return sirali[len(sirali) // 2], sirali[-1]
@@ -0,0 +1,212 @@
+"""
+Olay günlüğü - Zil olaylarını aylık JSONL dosyalarına ekler, gün başına konum diziniyle sorgular
+"""
+import json
+import os
+import threading
+from datetime import date, datetime
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from core.journal import SONUC_CALINDI, SONUC_KACIRILDI
+from core.persistence import atomic_write_json
+
+
+# Olay türleri
+TUR_OTOMATIK = "otomatik"  # Zil programından çalan zil
+TUR_MANUEL = "manuel"  # Düğmeyle çalınan zil, marş, saygı duruşu
+TUR_ACIL = "acil"  # Siren ve siren + marş
+TUR_MUZIK = "muzik"  # Teneffüs müziği parçası
+TURLER = (TUR_OTOMATIK, TUR_MANUEL, TUR_ACIL, TUR_MUZIK)
+
+# Olay sonuçları (çalındı/kaçırıldı zil günlüğüyle aynı adları kullanır)
+SONUC_GEC_CALINDI = "gec_calindi"  # Kaçırılan zil tolerans içinde geç çalındı
+SONUC_ENGELLENDI = "engellendi"  # Zil kapalı veya tatil modu
+SONUC_HATA = "hata"  # Ses dosyası bulunamadı / çalınamadı
+SONUCLAR = (SONUC_CALINDI, SONUC_GEC_CALINDI, SONUC_KACIRILDI, SONUC_ENGELLENDI, SONUC_HATA)
+# "Bu ayın hataları" sorgusunun saydığı sonuçlar
+BASARISIZ_SONUCLAR = (SONUC_KACIRILDI, SONUC_HATA)
+
+DOSYA_ON_EKI = "olaylar-"
+
+
+def ay_anahtari(tarih: date) -> str:
+    return f"{tarih.year:04d}-{tarih.month:02d}"
+
+
+def _sonraki_ay(tarih: date) -> date:
+    """Sonraki ayın ilk günü"""
+    return date(tarih.year + tarih.month // 12, tarih.month % 12 + 1, 1)
+
+
+class OlayGunlugu:
+    """Sadece eklenen, yapılandırılmış olay günlüğü
+    
+    Her ay için bir olaylar-YYYY-AA.jsonl dosyası tutulur; her satır bir olaydır.
+    Yanındaki .idx dosyası her günün kayıtlarının dosyadaki [başlangıç, bitiş) bayt
+    aralığını tutar, böylece bir günün sorgusu yalnızca o aralığı okur. Dizin olay
+    zamanına göredir (kaçırılan zil, fark edildiği günün dizinindedir; planlanan
+    alanı asıl zamanı taşır). Dizin eksik veya geride kalmışsa okurken dosyanın
+    kalan kısmı taranarak tamamlanır.
+    
+    Yazar dizini bellekte günceller ve diske yalnızca gün değişince ve kaydet()
+    çağrılınca (kapanışta) yazar; diskteki dizin en fazla bugünün kayıtları kadar geride
+    kalır. ekle() yalnızca log dinleyicisinin iş parçacığından çağrılır; sorgular her
+    seferinde diskteki dizini okuduğu için başka iş parçacıklarından güvenle çağrılabilir.
+    """
+    
+    def __init__(self, klasor: Path):
+        self.klasor = Path(klasor)
+        self._kilit = threading.Lock()
+        # Ay -> yazarın bellekteki dizini
+        self._dizinler: Dict[str, dict] = {}
+        # Diske yazılmamış değişikliği olan aylar
+        self._kirli: Set[str] = set()
+    
+    def dosya(self, ay: str) -> Path:
+        return self.klasor / f"{DOSYA_ON_EKI}{ay}.jsonl"
+    
+    @staticmethod
+    def _dizin_yolu(dosya: Path) -> Path:
+        return dosya.with_suffix(".idx")
+    
+    def ekle(self, kayit: dict):
+        """Olayı ayın dosyasının sonuna ekle ve günün dizinini güncelle"""
+        zaman = datetime.fromisoformat(kayit["zaman"])
+        ay = ay_anahtari(zaman.date())
+        dosya = self.dosya(ay)
+        satir = (json.dumps(kayit, ensure_ascii=False) + "\n").encode("utf-8")
+        with self._kilit:
+            try:
+                self.klasor.mkdir(parents=True, exist_ok=True)
+                dizin = self._dizinler.get(ay)
+                if dizin is None:
+                    dizin = self._dizinler[ay] = self._dizin(dosya)
+                with open(dosya, 'ab') as f:
+                    baslangic = f.tell()
+                    f.write(satir)
+                    f.flush()
+                    os.fsync(f.fileno())
+                gun = zaman.date().isoformat()
+                yeni_gun = gun not in dizin["gunler"]
+                aralik = dizin["gunler"].setdefault(gun, [baslangic, baslangic])
+                aralik[1] = baslangic + len(satir)
+                dizin["boyut"] = baslangic + len(satir)
+                self._kirli.add(ay)
+            except OSError as e:
+                print(f"Olay günlüğüne yazılamadı: {e}")
+                return
+            if yeni_gun:
+                # Önceki günler (ve ay değiştiyse önceki ay) kesinleşti; eski aylar bellekten atılır
+                self._kaydet()
+                for eski in [a for a in self._dizinler if a != ay]:
+                    del self._dizinler[eski]
+    
+    def kaydet(self):
+        """Bellekteki dizinlerin diske yazılmamış değişikliklerini yaz"""
+        with self._kilit:
+            self._kaydet()
+    
+    def _kaydet(self):
+        for ay in sorted(self._kirli):
+            dizin = self._dizinler.get(ay)
+            if dizin is None:
+                continue
+            try:
+                atomic_write_json(self._dizin_yolu(self.dosya(ay)), dizin, yedek_sayisi=0)
+            except OSError as e:
+                print(f"Olay günlüğü dizini yazılamadı: {e}")
+        self._kirli.clear()
+    
+    def _dizin(self, dosya: Path) -> dict:
+        """Ayın dizinini oku; dosyanın dizine girmemiş sonunu tarayıp ekle"""
+        try:
+            with open(self._dizin_yolu(dosya), 'r', encoding='utf-8') as f:
+                dizin = json.load(f)
+            if not isinstance(dizin.get("gunler"), dict) or not isinstance(dizin.get("boyut"), int):
+                raise ValueError
+        except (OSError, ValueError):
+            dizin = {"boyut": 0, "gunler": {}}
+        try:
+            boyut = dosya.stat().st_size
+        except OSError:
+            return {"boyut": 0, "gunler": {}}
+        if boyut < dizin["boyut"]:
+            # Dosya dışarıdan kısaltılmış veya değiştirilmiş: dizin baştan kurulur
+            dizin = {"boyut": 0, "gunler": {}}
+        if boyut > dizin["boyut"]:
+            with open(dosya, 'rb') as f:
+                f.seek(dizin["boyut"])
+                konum = dizin["boyut"]
+                for satir in f:
+                    if not satir.endswith(b"\n"):
+                        break  # Yarım kalmış son satır
+                    try:
+                        gun = json.loads(satir)["zaman"][:10]
+                    except (ValueError, KeyError, TypeError):
+                        konum += len(satir)
+                        continue
+                    aralik = dizin["gunler"].setdefault(gun, [konum, konum])
+                    konum += len(satir)
+                    aralik[1] = konum
+                dizin["boyut"] = konum
+        return dizin
+    
+    def _oku(self, dosya: Path, araliklar: List[Tuple[int, int]]) -> Iterator[dict]:
+        try:
+            with open(dosya, 'rb') as f:
+                for baslangic, bitis in araliklar:
+                    f.seek(baslangic)
+                    for satir in f.read(bitis - baslangic).splitlines():
+                        try:
+                            yield json.loads(satir)
+                        except ValueError:
+                            continue
+        except OSError:
+            return
+    
+    def sorgula(self, bas: date, bit: Optional[date] = None,
+                turler: Optional[Iterable[str]] = None,
+                sonuclar: Optional[Iterable[str]] = None) -> Iterator[dict]:
+        """[bas, bit] günlerindeki olaylar (zamana göre sıralı, bit verilmezse yalnızca bas günü)
+        
+        Yalnızca istenen günlerin bayt aralıkları okunur; tür ve sonuç süzgeci okunan
+        kayıtlara uygulanır.
+        """
+        bit = bit or bas
+        turler = set(turler) if turler else None
+        sonuclar = set(sonuclar) if sonuclar else None
+        bas_anahtar, bit_anahtar = bas.isoformat(), bit.isoformat()
+        ay = date(bas.year, bas.month, 1)
+        while ay <= bit:
+            dosya = self.dosya(ay_anahtari(ay))
+            if dosya.exists():
+                gunler = self._dizin(dosya)["gunler"]
+                araliklar = [gunler[gun] for gun in sorted(gunler) if bas_anahtar <= gun <= bit_anahtar]
+                for kayit in self._oku(dosya, araliklar):
+                    # Saat geri alındıysa bir günün aralığı başka günün kayıtlarını kapsayabilir
+                    if not bas_anahtar <= str(kayit.get("zaman", ""))[:10] <= bit_anahtar:
+                        continue
+                    if turler is not None and kayit.get("tur") not in turler:
+                        continue
+                    if sonuclar is not None and kayit.get("sonuc") not in sonuclar:
+                        continue
+                    yield kayit
+            ay = _sonraki_ay(ay)
+    
+    def gun(self, tarih: date, turler: Optional[Iterable[str]] = None) -> List[dict]:
+        """Günün olayları (ör. 2026-10-12'de çalan tüm ziller: gun(tarih, [TUR_OTOMATIK]))"""
+        return list(self.sorgula(tarih, turler=turler))
+    
+    def basarisizlar(self, yil: int, ay: int) -> List[dict]:
+        """Ayın kaçırılan veya çalınamayan zilleri"""
+        bas = date(yil, ay, 1)
+        bit = date.fromordinal(_sonraki_ay(bas).toordinal() - 1)
+        return list(self.sorgula(bas, bit, sonuclar=BASARISIZ_SONUCLAR))
+    
+    def gunler(self) -> List[str]:
+        """Olay kaydı olan günler (en yenisi başta)"""
+        gunler = []
+        for dosya in self.klasor.glob(f"{DOSYA_ON_EKI}*.jsonl"):
+            gunler.extend(self._dizin(dosya)["gunler"])
+        return sorted(gunler, reverse=True)
@@ -0,0 +1,113 @@
+"""
+Genel kısayollar - Uygulama penceresi odakta değilken (veya bir iletişim kutusu açıkken) de çalışan tuş birleşimleri
+"""
+import ctypes
+import sys
+from typing import Dict, Optional, Tuple
+from PySide6.QtCore import QAbstractNativeEventFilter, QCoreApplication, QObject, Signal
+
+if sys.platform == "win32":
+    import ctypes.wintypes
+
+
+WM_HOTKEY = 0x0312
+MOD_ALT = 0x0001
+MOD_CONTROL = 0x0002
+MOD_SHIFT = 0x0004
+MOD_WIN = 0x0008
+MOD_NOREPEAT = 0x4000  # Basılı tutulan tuş tekrar tekrar tetiklemez
+
+_DEGISTIRICILER = {"ctrl": MOD_CONTROL, "alt": MOD_ALT, "shift": MOD_SHIFT, "meta": MOD_WIN, "win": MOD_WIN}
+
+
+def tus_kodu(tuslar: str) -> Optional[Tuple[int, int]]:
+    """Ctrl+Alt+F12 gibi bir birleşimi Windows (değiştiriciler, sanal tuş kodu) çiftine çevir
+    
+    Desteklenen tuşlar: F1-F24, A-Z ve 0-9. En az bir değiştirici gerekir.
+    """
+    parcalar = [p.strip() for p in tuslar.split("+") if p.strip()]
+    if len(parcalar) < 2:
+        return None
+    degistiriciler = 0
+    for parca in parcalar[:-1]:
+        deger = _DEGISTIRICILER.get(parca.lower())
+        if deger is None:
+            return None
+        degistiriciler |= deger
+    tus = parcalar[-1].upper()
+    if len(tus) == 1 and tus.isascii() and tus.isalnum():
+        return degistiriciler, ord(tus)
+    if tus.startswith("F") and tus[1:].isdigit() and 1 <= int(tus[1:]) <= 24:
+        return degistiriciler, 0x70 + int(tus[1:]) - 1  # VK_F1 = 0x70
+    return None
+
+
+class _WindowsFiltresi(QAbstractNativeEventFilter):
+    """İş parçacığının mesaj kuyruğuna gelen WM_HOTKEY mesajlarını yakalar"""
+    
+    def __init__(self, kisayollar: "GenelKisayollar"):
+        super().__init__()
+        self._kisayollar = kisayollar
+    
+    def nativeEventFilter(self, olay_turu, mesaj):
+        if bytes(olay_turu) in (b"windows_generic_MSG", b"windows_dispatcher_MSG"):
+            msg = ctypes.wintypes.MSG.from_address(int(mesaj))
+            if msg.message == WM_HOTKEY:
+                self._kisayollar._on_hotkey(int(msg.wParam))
+                return True, 0
+        return False, 0
+
+
+class GenelKisayollar(QObject):
+    """İşletim sistemi düzeyinde kaydedilen kısayollar
+    
+    Windows'ta RegisterHotKey ile kaydedilir; tuşa hangi pencere odaktayken basılırsa
+    basılsın (uygulamada kalıcı bir iletişim kutusu açık olsa da) olay döngüsüne gelir.
+    Diğer sistemlerde kaydetme başarısız olur; çağıran uygulama içi kısayola düşmelidir.
+    """
+    
+    tetiklendi = Signal(str)  # Kaydedilirken verilen ad
+    
+    def __init__(self):
+        super().__init__()
+        self._kayitlar: Dict[int, str] = {}
+        self._sayac = 0
+        self._filtre: Optional[_WindowsFiltresi] = None
+        if sys.platform == "win32":
+            self._user32 = ctypes.windll.user32
+            self._filtre = _WindowsFiltresi(self)
+            QCoreApplication.instance().installNativeEventFilter(self._filtre)
+    
+    @staticmethod
+    def kullanilabilir() -> bool:
+        """Sistem genelinde kısayol kaydedilebilir mi? (yalnızca Windows)"""
+        return sys.platform == "win32"
+    
+    def kaydet(self, ad: str, tuslar: str) -> bool:
+        """Kısayolu kaydet
+        
+        Returns:
+            Kaydedildiyse True; tuş birleşimi geçersizse, başka bir uygulama kullanıyorsa
+            veya sistem desteklemiyorsa False
+        """
+        if self._filtre is None:
+            return False
+        kod = tus_kodu(tuslar)
+        if kod is None:
+            return False
+        self._sayac += 1
+        if not self._user32.RegisterHotKey(None, self._sayac, kod[0] | MOD_NOREPEAT, kod[1]):
+            return False
+        self._kayitlar[self._sayac] = ad
+        return True
+    
+    def temizle(self):
+        """Tüm kısayolların kaydını sil"""
+        for kimlik in self._kayitlar:
+            self._user32.UnregisterHotKey(None, kimlik)
+        self._kayitlar.clear()
+    
+    def _on_hotkey(self, kimlik: int):
+        ad = self._kayitlar.get(kimlik)
+        if ad is not None:
+            self.tetiklendi.emit(ad)
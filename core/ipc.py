@@ -0,0 +1,107 @@
+"""
+Yerel komutlar - Çalışan uygulamaya aynı bilgisayardan komut gönderir (main.py --acil)
+"""
+import getpass
+from typing import Callable, Dict, Optional
+from PySide6.QtCore import QObject
+from PySide6.QtNetwork import QLocalServer, QLocalSocket
+
+
+# Bir komut satırı en fazla bu kadar bayt olabilir
+EN_UZUN_KOMUT = 256
+
+
+def sunucu_adi() -> str:
+    """Kullanıcıya özel yerel sunucu adı (Windows'ta adlandırılmış kanal)"""
+    try:
+        kullanici = getpass.getuser()
+    except Exception:
+        kullanici = ""
+    return f"okul-zili-{kullanici}" if kullanici else "okul-zili"
+
+
+def komut_gonder(komut: str, zaman_asimi_ms: int = 2000) -> Optional[str]:
+    """Çalışan uygulamaya komutu gönder ve yanıtını bekle
+    
+    Returns:
+        Yanıt satırı ("tamam" veya "hata: ..."); uygulama çalışmıyorsa None
+    """
+    soket = QLocalSocket()
+    soket.connectToServer(sunucu_adi())
+    if not soket.waitForConnected(zaman_asimi_ms):
+        return None
+    soket.write((komut + "\n").encode("utf-8"))
+    soket.waitForBytesWritten(zaman_asimi_ms)
+    while not soket.canReadLine():
+        if not soket.waitForReadyRead(zaman_asimi_ms):
+            return "hata: yanıt alınamadı"
+    yanit = bytes(soket.readLine()).decode("utf-8", "replace").strip()
+    soket.disconnectFromServer()
+    return yanit
+
+
+class KomutSunucusu(QObject):
+    """Yerel komut sunucusu
+    
+    Her bağlantı tek satırlık bir komut gönderir; komutun işleyicisi GUI thread'inde
+    çağrılır ve sonucu tek satır olarak yanıtlanır. Olay döngüsünde çalıştığı için
+    kalıcı bir iletişim kutusu açıkken de komutlar işlenir. Yalnızca aynı kullanıcı
+    bağlanabilir.
+    """
+    
+    def __init__(self):
+        super().__init__()
+        self._isleyiciler: Dict[str, Callable[[], bool]] = {}
+        self._sunucu = QLocalServer(self)
+        self._sunucu.setSocketOptions(QLocalServer.SocketOption.UserAccessOption)
+        self._sunucu.newConnection.connect(self._on_baglanti)
+    
+    def ekle(self, komut: str, isleyici: Callable[[], bool]):
+        """Komutu işleyecek fonksiyonu ekle (başarılıysa True döndürmeli)"""
+        self._isleyiciler[komut] = isleyici
+    
+    def baslat(self) -> bool:
+        """Sunucuyu dinlemeye başlat
+        
+        Returns:
+            Dinleniyorsa True (aynı ad kullanımdaysa False)
+        """
+        ad = sunucu_adi()
+        # Bazı sistemlerde dinlemek aynı addaki sunucuyu sessizce devralır; önce çalışan var mı bakılır
+        deneme = QLocalSocket()
+        deneme.connectToServer(ad)
+        if deneme.waitForConnected(200):
+            deneme.disconnectFromServer()
+            print("Komut sunucusu başlatılamadı: uygulama zaten çalışıyor")
+            return False
+        if self._sunucu.listen(ad):
+            return True
+        # Çöken bir önceki çalışmadan kalan soket dosyası (Windows dışı)
+        QLocalServer.removeServer(ad)
+        if self._sunucu.listen(ad):
+            return True
+        print(f"Komut sunucusu başlatılamadı: {self._sunucu.errorString()}")
+        return False
+    
+    def _on_baglanti(self):
+        while self._sunucu.hasPendingConnections():
+            soket = self._sunucu.nextPendingConnection()
+            soket.readyRead.connect(lambda s=soket: self._on_okunabilir(s))
+            soket.disconnected.connect(soket.deleteLater)
+    
+    def _on_okunabilir(self, soket: QLocalSocket):
+        if not soket.canReadLine():
+            if soket.bytesAvailable() > EN_UZUN_KOMUT:
+                soket.abort()
+            return
+        komut = bytes(soket.readLine(EN_UZUN_KOMUT)).decode("utf-8", "replace").strip()
+        isleyici = self._isleyiciler.get(komut)
+        if isleyici is None:
+            yanit = f"hata: bilinmeyen komut: {komut}"
+        else:
+            try:
+                yanit = "tamam" if isleyici() else "hata: komut yerine getirilemedi"
+            except Exception as e:
+                yanit = f"hata: {e}"
+        soket.write((yanit + "\n").encode("utf-8"))
+        soket.disconnectFromServer()
@@ -0,0 +1,90 @@
+"""
+Zil günlüğü - Çalınan/kaçırılan zilleri diske ekler, yeniden başlatmada aynı zil iki kez çalmaz
+"""
+import os
+from datetime import date
+from pathlib import Path
+from typing import List, Set, Tuple
+
+from core.persistence import atomic_write_text
+from core.timeline import ZilOlayi
+
+
+# Kayıt sonuçları
+SONUC_CALINDI = "calindi"
+SONUC_KACIRILDI = "kacirildi"
+
+
+class ZilGunlugu:
+    """Sadece eklenen, satır tabanlı zil günlüğü
+    
+    Her satır: tarih, planlanan saat, gün, vardiya, ders, tip, sonuç (sekme ile ayrılmış).
+    Dosya her gün sıkıştırılıp yalnızca o günün kayıtları bırakıldığı için
+    açılışta okuma süresi yıl boyunca sabit kalır.
+    """
+    
+    def __init__(self, path: Path):
+        self.path = Path(path)
+    
+    def _satirlar(self) -> Tuple[List[List[str]], bool]:
+        """Geçerli satırları oku (elektrik kesintisinde yarım kalan satır atlanır)
+        
+        Returns:
+            (satırlar, dosyada bozuk satır var mı)
+        """
+        try:
+            with open(self.path, 'r', encoding='utf-8', errors='replace') as f:
+                metin = f.read()
+        except OSError:
+            return [], False
+        satirlar = []
+        bozuk = bool(metin) and not metin.endswith("\n")
+        for satir in metin.split("\n"):
+            if not satir:
+                continue
+            alanlar = satir.split("\t")
+            if len(alanlar) == 7:
+                satirlar.append(alanlar)
+            else:
+                bozuk = True
+        return satirlar, bozuk
+    
+    def oku(self, tarih: date) -> Set[Tuple[str, str, int, str]]:
+        """Verilen gün işlenmiş zillerin kimlikleri"""
+        anahtar = tarih.isoformat()
+        kimlikler = set()
+        for alanlar in self._satirlar()[0]:
+            if alanlar[0] != anahtar:
+                continue
+            try:
+                kimlikler.add((alanlar[2], alanlar[3], int(alanlar[4]), alanlar[5]))
+            except ValueError:
+                continue
+        return kimlikler
+    
+    def ekle(self, tarih: date, olay: ZilOlayi, sonuc: str = SONUC_CALINDI):
+        """Bir kaydı dosyanın sonuna ekle ve diske işle"""
+        satir = "\t".join([
+            tarih.isoformat(), olay.saat_str, olay.gun, olay.vardiya, str(olay.ders), olay.tip, sonuc
+        ])
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(satir + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+        except OSError as e:
+            print(f"Zil günlüğüne yazılamadı: {e}")
+    
+    def sikistir(self, tarih: date):
+        """Verilen günden önceki kayıtları ve bozuk satırları at"""
+        anahtar = tarih.isoformat()
+        satirlar, bozuk = self._satirlar()
+        kalanlar = [alanlar for alanlar in satirlar if alanlar[0] >= anahtar]
+        # Yarım satır bırakılırsa sonraki kayıt onunla birleşip kaybolur
+        if len(kalanlar) == len(satirlar) and not bozuk:
+            return
+        try:
+            atomic_write_text(self.path, "".join("\t".join(a) + "\n" for a in kalanlar), yedek_sayisi=0)
+        except OSError as e:
+            print(f"Zil günlüğü sıkıştırılamadı: {e}")
@@ -0,0 +1,149 @@
+"""
+Log okuyucu - Etkin log dosyasını konumdan devam ederek izler, log bölümlerinde yeniden eskiye arar
+"""
+import gzip
+import mmap
+import os
+import re
+from array import array
+from collections import deque
+from pathlib import Path
+from typing import Callable, Deque, Iterable, List, Optional
+
+from core.logger import BOLUM_SON_EKI, LOG_DOSYASI
+
+
+# Bir aramada en fazla bu kadar satır (en yeniler) döndürülür
+EN_FAZLA_SONUC = 50000
+
+_SATIR_SONU = re.compile(rb"\n")
+
+
+def satir_baslangiclari(veri, baslangic: int = 0) -> array:
+    """veri[baslangic:] içindeki tam satırların başlangıç konumları (son satır \\n ile bitmeli)"""
+    konumlar = array('Q')
+    onceki = baslangic
+    for eslesme in _SATIR_SONU.finditer(veri, baslangic):
+        konumlar.append(onceki)
+        onceki = eslesme.end()
+    return konumlar
+
+
+def bolum_oku(yol: Path) -> bytes:
+    """Log bölümünün tamamı (sıkıştırılmış bölüm açılır; yarım kalan son satır atılır)"""
+    yol = Path(yol)
+    if yol.name.endswith(BOLUM_SON_EKI):
+        with gzip.open(yol, 'rb') as f:
+            veri = f.read()
+    else:
+        with open(yol, 'rb') as f:
+            veri = f.read()
+    son = veri.rfind(b"\n")
+    return veri[:son + 1]
+
+
+class LogTakibi:
+    """Etkin log dosyasının yeni eklenen satırlarını okunan konumdan devam ederek verir
+    
+    Dosya açık tutulmaz (Windows'ta açık dosya bölüm dönüşünde yeniden adlandırılamaz).
+    """
+    
+    def __init__(self, yol: Path):
+        self.yol = Path(yol)
+        self.konum = 0
+        self._kimlik = None  # (aygıt, dosya no): dönüşte yeni dosya oluşturulur
+    
+    def yeni_satirlar(self) -> Optional[bytes]:
+        """Son okumadan bu yana eklenen tam satırlar
+        
+        Returns:
+            Yeni satırlar (yoksa b""); dosya döndüyse veya kısaldıysa None (baştan okunmalı)
+        """
+        try:
+            bilgi = os.stat(self.yol)
+        except OSError:
+            return b""
+        boyut = bilgi.st_size
+        kimlik = (bilgi.st_dev, bilgi.st_ino)
+        if self._kimlik is None:
+            self._kimlik = kimlik
+        if boyut < self.konum or kimlik != self._kimlik:
+            self.konum = 0
+            self._kimlik = None
+            return None
+        if boyut == self.konum:
+            return b""
+        try:
+            with open(self.yol, 'rb') as f:
+                f.seek(self.konum)
+                veri = f.read(boyut - self.konum)
+        except OSError:
+            return b""
+        # Yazılmakta olan yarım satır bir sonraki okumaya kalır
+        son = veri.rfind(b"\n")
+        if son < 0:
+            return b""
+        self.konum += son + 1
+        return veri[:son + 1]
+
+
+def _esleyen_satirlar(tampon, desen: bytes, etiket: Optional[bytes], sonuclar: Deque[bytes],
+                      iptal: Callable[[], bool]):
+    """Tamponda deseni içeren (ve etiket verilmişse etiketi de içeren) satırları ekle
+    
+    sonuclar sınırlı bir deque'dur; dolunca eski eşleşmeler düşer, bölümün son eşleşmeleri kalır.
+    """
+    konum = 0
+    while True:
+        bulunan = tampon.find(desen, konum)
+        if bulunan < 0 or iptal():
+            return
+        bas = tampon.rfind(b"\n", 0, bulunan) + 1
+        bit = tampon.find(b"\n", bulunan)
+        if bit < 0:
+            bit = len(tampon)
+        satir = tampon[bas:bit]
+        if etiket is None or etiket in satir:
+            sonuclar.append(bytes(satir))
+        konum = bit + 1
+
+
+def ara(bolumler: Iterable[Path], metin: str = "", etiket: str = "",
+        iptal: Callable[[], bool] = lambda: False, en_fazla: int = EN_FAZLA_SONUC) -> List[bytes]:
+    """Log bölümlerinde metni ve/veya etiketi içeren en yeni en_fazla satır (eskiden yeniye sıralı)
+    
+    Bölümler yeniden eskiye taranır; yeterince eşleşme bulununca daha eski bölümler
+    açılmaz. En yeni kapalı bölümler sıkıştırılmadan saklanır (ACIK_BOLUM_SAYISI) ve bellek
+    eşlenerek taranır; daha eski sıkıştırılmış bölümler açılarak taranır. Etkin log dosyası
+    tek seferde okunup kapatılır (bellek eşlemesi Windows'ta log dönüşündeki yeniden
+    adlandırmayı engeller). Metin büyük/küçük harfe duyarlıdır.
+    
+    Args:
+        bolumler: Eskiden yeniye bölümler (segmentler())
+        etiket: Satırda ayrıca bulunması gereken etiket (ör. "[HATA]")
+        iptal: True döndürürse arama yarıda bırakılır
+    """
+    desen = metin.encode("utf-8") if metin else etiket.encode("utf-8")
+    etiket_b = etiket.encode("utf-8") if metin and etiket else None
+    if not desen:
+        return []
+    # Yeniden eskiye bölümlerin eşleşmeleri
+    parcalar: List[Deque[bytes]] = []
+    kalan = en_fazla
+    for yol in reversed(list(bolumler)):
+        if iptal() or kalan <= 0:
+            break
+        bulunanlar: Deque[bytes] = deque(maxlen=kalan)
+        try:
+            if yol.name.endswith(BOLUM_SON_EKI) or yol.name == LOG_DOSYASI:
+                _esleyen_satirlar(bolum_oku(yol), desen, etiket_b, bulunanlar, iptal)
+            else:
+                with open(yol, 'rb') as f:
+                    if os.fstat(f.fileno()).st_size > 0:
+                        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as tampon:
+                            _esleyen_satirlar(tampon, desen, etiket_b, bulunanlar, iptal)
+        except (OSError, EOFError, gzip.BadGzipFile) as e:
+            print(f"Log bölümü okunamadı ({yol.name}): {e}")
+        parcalar.append(bulunanlar)
+        kalan -= len(bulunanlar)
+    return [satir for bulunanlar in reversed(parcalar) for satir in bulunanlar]
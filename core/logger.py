@@ -1,35 +1,225 @@
 """
-Log sistemi - Tüm olayları logs/zil.log dosyasına yazar
+Log sistemi - Tüm olayları logs/zil.log dosyasına arka planda yazar, eski bölümleri sıkıştırır
 """
+import atexit
+import gzip
 import logging
+import logging.handlers
 import os
-from datetime import datetime
+import queue
+import shutil
+import sys
+import uuid
+from datetime import date, datetime
 from pathlib import Path
+from typing import Dict, List, Optional
+
+from core.event_log import OlayGunlugu
+
+
+# Etkin log dosyası bu boyutu aşınca veya gün değişince yeni bölüme geçilir
+EN_BUYUK_BOYUT = 5 * 1024 * 1024
+# Eski bölümlerden bu kadarı saklanır (en eskiler silinir)
+BOLUM_SAYISI = 60
+# En yeni bu kadar kapalı bölüm sıkıştırılmaz: log aramasında bellek eşlenerek taranır,
+# daha eskiler gzip ile sıkıştırılır
+ACIK_BOLUM_SAYISI = 7
+
+LOG_DOSYASI = "zil.log"
+# Eski bölümler: zil-2026-10-12_235959-01.log, sıkıştırılınca .log.gz (adına göre sıralama zamana göre sıralamadır)
+BOLUM_ON_EKI = "zil-"
+BOLUM_SON_EKI = ".log.gz"
+# Sıkıştırılmamış kapalı bölüm (en yeniler veya sıkıştırması yarım kalmış olan)
+ACIK_SON_EKI = ".log"
+
+BICIM = '[%(asctime)s] [%(levelname)s] %(message)s'
+TARIH_BICIMI = '%Y-%m-%d %H:%M:%S'
+
+
+def _kapali_bolumler(log_dir: Path) -> Dict[str, List[Path]]:
+    """Kapalı bölümler: sıkıştırılmamış ad -> dosyaları (sıkıştırılmamış olan önce)
+    
+    Sıkıştırma yarıda kaldıysa bölüm .log olarak kalır; yanındaki .log.gz eksik olabilir.
+    """
+    bolumler: Dict[str, List[Path]] = {}
+    for yol in log_dir.glob(f"{BOLUM_ON_EKI}*{BOLUM_SON_EKI}"):
+        bolumler.setdefault(yol.name[:-len(".gz")], []).append(yol)
+    for yol in log_dir.glob(f"{BOLUM_ON_EKI}*{ACIK_SON_EKI}"):
+        bolumler.setdefault(yol.name, []).insert(0, yol)
+    return bolumler
+
+
+def segmentler(log_dir: Path) -> List[Path]:
+    """Log bölümleri eskiden yeniye (kapalı bölümler, en sonda etkin dosya)"""
+    log_dir = Path(log_dir)
+    bolumler = _kapali_bolumler(log_dir)
+    eski = [bolumler[ad][0] for ad in sorted(bolumler)]
+    etkin = log_dir / LOG_DOSYASI
+    return eski + ([etkin] if etkin.exists() else [])
+
+
+def _sikistir(yol: Path):
+    """Kapalı bölümü .log.gz olarak sıkıştır; olmazsa .log kalır, sonraki dönüşte yeniden denenir"""
+    hedef = yol.with_name(yol.name + ".gz")
+    try:
+        with open(yol, 'rb') as kaynak, gzip.open(hedef, 'wb') as sikistirilmis:
+            shutil.copyfileobj(kaynak, sikistirilmis)
+    except OSError as e:
+        print(f"Log bölümü sıkıştırılamadı: {e}")
+        try:
+            hedef.unlink()
+        except OSError:
+            pass
+        return
+    try:
+        os.remove(yol)
+    except OSError as e:
+        print(f"Sıkıştırılan log bölümü silinemedi: {e}")
+
+
+class _DonenDosyaIsleyicisi(logging.handlers.BaseRotatingHandler):
+    """Boyut veya gün değişince dönen, eski bölümleri gzip ile sıkıştıran dosya işleyicisi
+    
+    Yalnızca kuyruk dinleyicisinin iş parçacığında çağrılır; sıkıştırma zil yolunu bekletmez.
+    """
+    
+    def __init__(self, dosya: Path, en_buyuk_boyut: int = EN_BUYUK_BOYUT, bolum_sayisi: int = BOLUM_SAYISI,
+                 acik_bolum_sayisi: int = ACIK_BOLUM_SAYISI):
+        super().__init__(str(dosya), 'a', encoding='utf-8')
+        self.en_buyuk_boyut = en_buyuk_boyut
+        self.bolum_sayisi = bolum_sayisi
+        self.acik_bolum_sayisi = acik_bolum_sayisi
+        # Etkin dosyanın günü (uygulama ertesi gün açılırsa dünkü kayıtlar ilk yazmada döner)
+        try:
+            self._gun = date.fromtimestamp(os.path.getmtime(dosya))
+        except OSError:
+            self._gun = date.today()
+        self._kayit_gunu = self._gun
+    
+    def shouldRollover(self, record) -> bool:
+        if self.stream is None:
+            self.stream = self._open()
+        self._kayit_gunu = date.fromtimestamp(record.created)
+        if self._kayit_gunu != self._gun:
+            if self.stream.tell() > 0:
+                return True
+            # Boş dosya dönmez ama yeni güne geçer (bölüm adı doğru güne çıksın)
+            self._gun = self._kayit_gunu
+            return False
+        mesaj = self.format(record) + self.terminator
+        return self.stream.tell() + len(mesaj.encode('utf-8')) > self.en_buyuk_boyut
+    
+    def doRollover(self):
+        if self.stream:
+            self.stream.close()
+            self.stream = None
+        etkin = Path(self.baseFilename)
+        zaman = datetime.now()
+        if zaman.date() != self._gun:
+            # Gün değiştiyse bölüm kapandığı günün son saniyesiyle adlandırılır
+            zaman = datetime.combine(self._gun, datetime.max.time())
+        # Aynı saniyede birden fazla dönüş olursa sıra numarası artar
+        no = 1
+        while True:
+            hedef = etkin.with_name(f"{BOLUM_ON_EKI}{zaman.strftime('%Y-%m-%d_%H%M%S')}-{no:02d}{ACIK_SON_EKI}")
+            if not hedef.exists() and not hedef.with_name(hedef.name + ".gz").exists():
+                break
+            no += 1
+        try:
+            # Bölüm sıkıştırılmadan kapanır; etkin dosya hemen yeni kayıtlara açılır
+            os.replace(etkin, hedef)
+        except OSError as e:
+            print(f"Log bölümü kapatılamadı: {e}")
+        self._bolumleri_duzenle(etkin.parent)
+        self._gun = self._kayit_gunu
+        self.stream = self._open()
+    
+    def _bolumleri_duzenle(self, log_dir: Path):
+        """En yeni acik_bolum_sayisi bölüm dışındaki kapalı bölümleri sıkıştır, en eskileri sil"""
+        bolumler = _kapali_bolumler(log_dir)
+        adlar = sorted(bolumler)
+        silinecek = max(0, len(adlar) - self.bolum_sayisi)
+        for ad in adlar[:silinecek]:
+            for dosya in bolumler[ad]:
+                try:
+                    dosya.unlink()
+                except OSError:
+                    pass
+        # Önceki dönüşlerde sıkıştırması yarım kalanlar da yeniden denenir
+        for ad in adlar[silinecek:max(silinecek, len(adlar) - self.acik_bolum_sayisi)]:
+            if bolumler[ad][0].name.endswith(ACIK_SON_EKI):
+                _sikistir(bolumler[ad][0])
+
+
+class _OlayIsleyicisi(logging.Handler):
+    """Olay taşıyan kayıtları yapılandırılmış olay günlüğüne ekler"""
+    
+    def __init__(self, gunluk: OlayGunlugu):
+        super().__init__()
+        self.gunluk = gunluk
+    
+    def emit(self, record):
+        self.gunluk.ekle(record.olay)
+    
+    def close(self):
+        # logging.shutdown() çağırır (dinleyici durduktan sonra): günün dizini diske yazılır
+        self.gunluk.kaydet()
+        super().close()
+
+
+def _olay_mi(record) -> bool:
+    return hasattr(record, "olay")
 
 
 class ZilLogger:
-    """Okul zil programı için log yöneticisi"""
+    """Okul zil programı için log yöneticisi
+    
+    Kayıtlar çağıran iş parçacığında yalnızca bir kuyruğa eklenir; dosyaya ve konsola
+    yazma arka plandaki bir dinleyici iş parçacığında yapılır. Aynı log klasörü için
+    birden fazla ZilLogger oluşturulabilir (main.py ve ana pencere), işleyiciler bir kez kurulur.
+    """
+    
+    # Log klasörü -> arka plan dinleyicisi
+    _dinleyiciler: Dict[Path, logging.handlers.QueueListener] = {}
     
     def __init__(self, log_dir: str = "logs"):
         # Çalışma dizinini bul (main.py'nin olduğu yer)
         base_dir = Path(__file__).parent.parent
-        self.log_dir = base_dir / log_dir
+        self.log_dir = (base_dir / log_dir).resolve()
         self.log_dir.mkdir(exist_ok=True)
+        self.log_file = self.log_dir / LOG_DOSYASI
         
-        log_file = self.log_dir / "zil.log"
-        
+        self.logger = logging.getLogger('ZilProgrami')
+        # Yapılandırılmış olaylar: logs/olaylar/olaylar-YYYY-AA.jsonl (sorgular için de kullanılır)
+        self.olaylar = OlayGunlugu(self.log_dir / "olaylar")
+        if self.log_dir not in self._dinleyiciler:
+            self._kur()
+    
+    def _kur(self):
         # Log formatı: [TARIH SAAT] [SEVIYE] Mesaj
-        logging.basicConfig(
-            level=logging.INFO,
-            format='[%(asctime)s] [%(levelname)s] %(message)s',
-            datefmt='%Y-%m-%d %H:%M:%S',
-            handlers=[
-                logging.FileHandler(log_file, encoding='utf-8'),
-                logging.StreamHandler()  # Konsola da yaz
-            ]
-        )
+        bicim = logging.Formatter(BICIM, datefmt=TARIH_BICIMI)
+        isleyiciler = [_DonenDosyaIsleyicisi(self.log_file)]
+        # pythonw ile çalışırken konsol yoktur
+        if sys.stderr is not None:
+            isleyiciler.append(logging.StreamHandler())  # Konsola da yaz
+        for isleyici in isleyiciler:
+            isleyici.setFormatter(bicim)
+            # Olay kayıtları metin loguna yazılmaz (metin satırı ayrıca log_* ile yazılır)
+            isleyici.addFilter(lambda record: not _olay_mi(record))
+        olay_isleyicisi = _OlayIsleyicisi(OlayGunlugu(self.olaylar.klasor))
+        olay_isleyicisi.addFilter(_olay_mi)
+        isleyiciler.append(olay_isleyicisi)
         
-        self.logger = logging.getLogger('ZilProgrami')
+        kuyruk = queue.SimpleQueue()
+        dinleyici = logging.handlers.QueueListener(kuyruk, *isleyiciler, respect_handler_level=True)
+        dinleyici.start()
+        # Kapanırken kuyrukta kalan kayıtlar yazılır
+        atexit.register(dinleyici.stop)
+        self._dinleyiciler[self.log_dir] = dinleyici
+        
+        self.logger.setLevel(logging.INFO)
+        self.logger.addHandler(logging.handlers.QueueHandler(kuyruk))
+        self.logger.propagate = False
     
     def log_otomatik(self, mesaj: str):
         """Otomatik zil çalma olaylarını logla"""
@@ -50,4 +240,35 @@ class ZilLogger:
     def log_uyari(self, mesaj: str):
         """Uyarı olaylarını logla"""
         self.logger.warning(f"[UYARI] {mesaj}")
-
+    
+    def olay(self, tur: str, sonuc: str, aciklama: str = "", ses: str = "",
+             planlanan: Optional[datetime] = None, ders: Optional[int] = None,
+             vardiya: str = "", tip: str = "", mod: str = "") -> str:
+        """Yapılandırılmış olay kaydı ekle (yazma arka planda yapılır)
+        
+        Args:
+            tur: TUR_OTOMATIK, TUR_MANUEL, TUR_ACIL veya TUR_MUZIK
+            sonuc: SONUC_CALINDI, SONUC_GEC_CALINDI, SONUC_KACIRILDI, SONUC_ENGELLENDI veya SONUC_HATA
+            planlanan: Programdaki zil saati (otomatik ziller)
+            mod: Olay anındaki zil modu
+        
+        Returns:
+            Olay kimliği
+        """
+        zaman = datetime.now()
+        kimlik = uuid.uuid4().hex
+        self.logger.info(aciklama, extra={"olay": {
+            "id": kimlik,
+            "zaman": zaman.isoformat(timespec="milliseconds"),
+            "tur": tur,
+            "sonuc": sonuc,
+            "aciklama": aciklama,
+            "ses": ses,
+            "planlanan": planlanan.isoformat(timespec="seconds") if planlanan else None,
+            "gecikme_ms": round((zaman - planlanan).total_seconds() * 1000) if planlanan else None,
+            "ders": ders,
+            "vardiya": vardiya,
+            "tip": tip,
+            "mod": mod
+        }})
+        return kimlik
@@ -0,0 +1,247 @@
+"""
+Ses yüksekliği - Her sesin EBU R128 entegre yüksekliğini ölçer, seviyeleri eşitlemek için kazanç verir
+"""
+import math
+import os
+import shutil
+import subprocess
+import time
+import wave
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, Optional, Set
+from PySide6.QtCore import QObject, Signal
+
+from core.persistence import read_json, writer_for
+
+try:
+    import numpy as np
+except ImportError:  # numpy yoksa ölçüm yapılmaz, sesler ayarlanan seviyede çalar
+    np = None
+
+
+# settings.json -> system.hedef_lufs
+VARSAYILAN_HEDEF_LUFS = -20.0
+# Kazanç sınırları (dB): çok sessiz/bozuk dosyalar aşırı yükseltilmesin
+EN_AZ_KAZANC_DB = -24.0
+EN_COK_KAZANC_DB = 12.0
+
+OLCUM_HIZI = 48000
+# Ölçümde bir seferde çözülen 100 ms'lik dilim sayısı (stereo float ~2.5 MB)
+AKIS_DILIM_SAYISI = 64
+# ffmpeg çözümü bu süreyi aşarsa dosya ölçülmez (sn)
+CEVIRME_ZAMAN_ASIMI = 300
+_ffmpeg = shutil.which("ffmpeg")
+_SUBPROCESS_BAYRAKLARI = getattr(subprocess, "CREATE_NO_WINDOW", 0)
+
+# numpy FFT'si GIL'i bıraktığı için iş parçacıkları paralel çalışır
+_olcucu = ThreadPoolExecutor(max_workers=min(4, os.cpu_count() or 1), thread_name_prefix="ses-yukseklik")
+
+# ITU-R BS.1770 K ağırlıklandırma süzgeci (48 kHz): raf süzgeci + RLB yüksek geçiren
+_K_SUZGECLERI = (
+    ((1.53512485958697, -2.69169618940638, 1.19839281085285), (1.0, -1.69065929318241, 0.73248077421585)),
+    ((1.0, -2.0, 1.0), (1.0, -1.99004745483398, 0.99007225036621)),
+)
+
+
+def _k_agirligi(n: int, hiz: int):
+    """n noktalı rfft kutuları için K süzgecinin güç kazancı |H(f)|²"""
+    z = np.exp(-2j * np.pi * np.fft.rfftfreq(n, 1.0 / hiz) / hiz)
+    h = np.ones_like(z)
+    for (b0, b1, b2), (a0, a1, a2) in _K_SUZGECLERI:
+        h *= (b0 + b1 * z + b2 * z * z) / (a0 + a1 * z + a2 * z * z)
+    return np.abs(h) ** 2
+
+
+def _parseval_agirligi(dilim: int, hiz: int):
+    """rfft kutularının Parseval ağırlığı (iki yanlı spektrum) ile K süzgeci birlikte"""
+    agirlik = _k_agirligi(dilim, hiz)
+    agirlik[1:(dilim + 1) // 2] *= 2
+    return agirlik
+
+
+def _gecitle(enerji) -> Optional[float]:
+    """100 ms'lik dilim güçlerinden BS.1770 geçitli entegre yükseklik (LUFS)"""
+    if len(enerji) < 4:
+        return None
+    bloklar = (enerji[:-3] + enerji[1:-2] + enerji[2:-1] + enerji[3:]) / 4
+    with np.errstate(divide="ignore"):
+        blok_yukseklik = -0.691 + 10 * np.log10(bloklar)
+    gecen = bloklar[blok_yukseklik > -70.0]
+    if gecen.size == 0:
+        return None
+    goreli_esik = -0.691 + 10 * math.log10(float(gecen.mean())) - 10.0
+    gecen = bloklar[(blok_yukseklik > -70.0) & (blok_yukseklik > goreli_esik)]
+    return round(-0.691 + 10 * math.log10(float(gecen.mean())), 2)
+
+
+def _akis_yuksekligi(parcalar: Iterable, hiz: int = OLCUM_HIZI) -> Optional[float]:
+    """Sırayla gelen (n, kanal) örnek parçalarının entegre yüksekliği (LUFS)
+    
+    K ağırlıklı güç, 100 ms'lik dilimlerin FFT'sinden (Parseval) hesaplanır;
+    400 ms'lik bloklar %75 örtüşmeyle dilimlerden oluşturulur ve BS.1770
+    mutlak (-70 LUFS) ve göreli (-10 LU) geçitleri uygulanır. Yalnızca dilim
+    güçleri (saniyede 10 sayı) birikir; parçalar tam dilimlerden oluşmalıdır
+    (sonuncusu hariç, artan örnekler atılır).
+    """
+    dilim = hiz // 10
+    agirlik = _parseval_agirligi(dilim, hiz)
+    enerjiler = []
+    for ornekler in parcalar:
+        dilim_sayisi = len(ornekler) // dilim
+        if dilim_sayisi == 0:
+            continue
+        x = ornekler[:dilim_sayisi * dilim].reshape(dilim_sayisi, dilim, ornekler.shape[1])
+        spektrum = np.fft.rfft(x, axis=1)
+        guc = spektrum.real ** 2 + spektrum.imag ** 2
+        enerjiler.append(np.einsum("skc,k->s", guc, agirlik) / (dilim * dilim))
+    return _gecitle(np.concatenate(enerjiler)) if enerjiler else None
+
+
+def entegre_yukseklik(ornekler, hiz: int = OLCUM_HIZI) -> Optional[float]:
+    """Çok kanallı örneklerin (n, kanal) entegre yüksekliği (LUFS)"""
+    if ornekler.ndim == 1:
+        ornekler = ornekler[:, None]
+    parca = AKIS_DILIM_SAYISI * (hiz // 10)  # Bellek kullanımını sınırla
+    return _akis_yuksekligi((ornekler[bas:bas + parca] for bas in range(0, len(ornekler), parca)), hiz)
+
+
+def _wav_parcalari(w: wave.Wave_read) -> Iterator:
+    """16 bit WAV'ı sabit boyutlu parçalar halinde float örneklere çöz"""
+    kanal = w.getnchannels()
+    while True:
+        veri = w.readframes(AKIS_DILIM_SAYISI * (OLCUM_HIZI // 10))
+        if not veri:
+            return
+        yield np.frombuffer(veri, dtype="<i2", count=len(veri) // 2 // kanal * kanal).reshape(-1, kanal) / 32768.0
+
+
+def _ffmpeg_parcalari(path: Path) -> Iterator:
+    """Dosyayı ffmpeg ile 48 kHz stereo float örneklere çöz, sabit boyutlu parçalar halinde ver
+    
+    Çıktı tek bir tampona okunur; dosyanın tamamı hiçbir zaman bellekte tutulmaz.
+    Verilen parça bir sonraki parçaya kadar geçerlidir.
+    """
+    tampon = bytearray(AKIS_DILIM_SAYISI * (OLCUM_HIZI // 10) * 2 * 4)
+    gorunum = memoryview(tampon)
+    son_an = time.monotonic() + CEVIRME_ZAMAN_ASIMI
+    surec = subprocess.Popen(
+        [_ffmpeg, "-v", "error", "-i", str(path), "-vn", "-ac", "2", "-ar", str(OLCUM_HIZI),
+         "-f", "f32le", "-"],
+        stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, creationflags=_SUBPROCESS_BAYRAKLARI
+    )
+    try:
+        while True:
+            dolu = 0
+            while dolu < len(tampon):
+                okunan = surec.stdout.readinto(gorunum[dolu:])
+                if not okunan:
+                    break
+                dolu += okunan
+            if time.monotonic() > son_an:
+                raise subprocess.TimeoutExpired(_ffmpeg, CEVIRME_ZAMAN_ASIMI)
+            dolu -= dolu % 8
+            if dolu:
+                yield np.frombuffer(tampon, dtype="<f4", count=dolu // 4).reshape(-1, 2)
+            if dolu < len(tampon):
+                break
+        if surec.wait() != 0:
+            raise subprocess.CalledProcessError(surec.returncode, _ffmpeg)
+    finally:
+        surec.stdout.close()
+        if surec.poll() is None:
+            surec.kill()
+            surec.wait()
+
+
+def dosya_yuksekligi(path: Path) -> Optional[float]:
+    """Dosyanın entegre yüksekliği (LUFS); ölçülemezse None
+    
+    Dosya parça parça çözülüp ölçülür; uzun müzik dosyalarında da bellek kullanımı sabittir.
+    """
+    if path.suffix.lower() == ".wav":
+        try:
+            with wave.open(str(path), 'rb') as w:
+                if w.getsampwidth() == 2 and w.getframerate() == OLCUM_HIZI:
+                    return _akis_yuksekligi(_wav_parcalari(w))
+        except (wave.Error, EOFError, ValueError):
+            pass
+    if _ffmpeg is None:
+        return None
+    try:
+        return _akis_yuksekligi(_ffmpeg_parcalari(path))
+    except (subprocess.SubprocessError, OSError):
+        return None
+
+
+class YukseklikOnbellegi(QObject):
+    """Ses kütüphanesindeki dosyaların ölçülmüş yükseklikleri
+    
+    Ölçümler içerik özetine göre data/cache/yukseklik.json'da saklanır; kütüphane her
+    güncellendiğinde yalnızca yeni içerikler ölçülür. Hedef yükseklik değişse de
+    yeniden ölçüm gerekmez (kazanç çalma anında hesaplanır).
+    """
+    
+    olculdu = Signal(str, float)  # (içerik özeti, LUFS)
+    _sonuc = Signal(str, object)  # İşçi iş parçacığından GUI thread'ine
+    
+    def __init__(self, kutuphane, dosya: Path):
+        super().__init__()
+        self.kutuphane = kutuphane
+        self.dosya = Path(dosya)
+        data = read_json(self.dosya)
+        # özet -> LUFS (None: ölçülemedi, yeniden denenmez)
+        self._olcumler: Dict[str, Optional[float]] = data if isinstance(data, dict) else {}
+        self._yollar: Dict[Path, float] = {}
+        self._bekleyenler: Set[str] = set()
+        self._sonuc.connect(self._on_sonuc)
+        self.kutuphane.guncellendi.connect(self.analiz_et)
+    
+    @staticmethod
+    def kullanilabilir() -> bool:
+        """numpy kurulu mu?"""
+        return np is not None
+    
+    def analiz_et(self):
+        """Kütüphanede ölçülmemiş içerikleri arka planda ölç"""
+        self._yollari_guncelle()
+        if np is None:
+            return
+        for bilgi in self.kutuphane.sorgula():
+            if not bilgi.ozet or bilgi.ozet in self._olcumler or bilgi.ozet in self._bekleyenler:
+                continue
+            self._bekleyenler.add(bilgi.ozet)
+            _olcucu.submit(dosya_yuksekligi, self.kutuphane.sounds_dir / bilgi.yol).add_done_callback(
+                lambda g, ozet=bilgi.ozet: self._sonuc.emit(ozet, None if g.exception() else g.result())
+            )
+    
+    def _on_sonuc(self, ozet: str, lufs: Optional[float]):
+        self._bekleyenler.discard(ozet)
+        self._olcumler[ozet] = lufs
+        # Binlerce dosyada her sonuçta yeniden kurmamak için toplu güncellenir
+        if not self._bekleyenler:
+            writer_for(self.dosya).save(self._olcumler)
+            self._yollari_guncelle()
+        if lufs is not None:
+            self.olculdu.emit(ozet, lufs)
+    
+    def _yollari_guncelle(self):
+        """Çalma anında O(1) arama için dosya yolu -> LUFS tablosu"""
+        yollar = {}
+        for bilgi in self.kutuphane.sorgula():
+            lufs = self._olcumler.get(bilgi.ozet)
+            if lufs is not None:
+                yollar[self.kutuphane.sounds_dir / bilgi.yol] = lufs
+        self._yollar = yollar
+    
+    def yukseklik(self, path: Path) -> Optional[float]:
+        """Dosyanın ölçülmüş yüksekliği (LUFS)"""
+        return self._yollar.get(path)
+    
+    def carpan(self, path: Path, hedef_lufs: float = VARSAYILAN_HEDEF_LUFS) -> float:
+        """Dosyayı hedef yüksekliğe getiren doğrusal ses çarpanı (ölçülmediyse 1.0)"""
+        lufs = self._yollar.get(path)
+        if lufs is None:
+            return 1.0
+        kazanc_db = max(EN_AZ_KAZANC_DB, min(EN_COK_KAZANC_DB, hedef_lufs - lufs))
+        return 10 ** (kazanc_db / 20)
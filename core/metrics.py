@@ -0,0 +1,216 @@
+"""
+Zil ölçümleri - Zilin planlanan saatinden sesin başlamasına kadar her aşamanın gecikmesini ölçer
+"""
+import math
+import time
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional
+from PySide6.QtCore import QObject, Signal
+
+from core.persistence import atomic_write_json, read_json, writer_for
+
+
+# Zil hattının aşamaları (sırasıyla); her biri monotonik saatle damgalanır
+ASAMA_TETIK = "tetik"  # Zamanlayıcı uyandı
+ASAMA_YAYIN = "yayin"  # zil_calindi gönderildi
+ASAMA_COZUM = "cozum"  # Ses dosyasının yolu çözüldü
+ASAMA_KAYNAK = "kaynak"  # Kaynak yüklendi (setSource, hazır oynatıcı veya bellek), play() çağrılıyor
+ASAMA_CALMA = "calma"  # Ses çalmaya başladı (PlayingState / ilk blok cihazda)
+ASAMALAR = (ASAMA_TETIK, ASAMA_YAYIN, ASAMA_COZUM, ASAMA_KAYNAK, ASAMA_CALMA)
+
+# Ölçülen aralıklar: bir önceki aşamadan (ilki planlanan saatten) bu aşamaya geçen süre
+ARALIK_TOPLAM = "toplam"  # Planlanan saatten sesin başlamasına
+ARALIKLAR = ASAMALAR + (ARALIK_TOPLAM,)
+ARALIK_ADLARI = {
+    ASAMA_TETIK: "Zamanlayıcı gecikmesi",
+    ASAMA_YAYIN: "Zil sinyali",
+    ASAMA_COZUM: "Ayar ve dosya yolu",
+    ASAMA_KAYNAK: "Kaynak yükleme",
+    ASAMA_CALMA: "Ses cihazının açılması",
+    ARALIK_TOPLAM: "Toplam"
+}
+
+# Histogram kutuları: onluk başına KUTU_SAYISI logaritmik kutu (~%12 çözünürlük)
+KUTU_SAYISI = 20
+EN_KUCUK_MS = 0.1
+# Bu kadar günün histogramı, son KAYIT_GUN_SAYISI günün tek tek zil kayıtları saklanır
+GUN_SAYISI = 365
+KAYIT_GUN_SAYISI = 14
+# Sesi bu kadar sürede başlamayan ölçüm tamamlanmamış sayılır
+ZAMAN_ASIMI_SN = 30
+
+
+def kutu(ms: float) -> int:
+    """Gecikmenin histogram kutusu"""
+    return math.floor(KUTU_SAYISI * math.log10(max(ms, EN_KUCUK_MS)))
+
+
+def kutu_ust_siniri(no: int) -> float:
+    return 10 ** ((no + 1) / KUTU_SAYISI)
+
+
+def yuzdelik(kutular: Dict[int, int], oran: float, en_buyuk: float) -> float:
+    """Histogramdan yüzdelik (kutunun üst sınırı, gerçek en büyük değeri aşmaz)"""
+    toplam = sum(kutular.values())
+    esik = oran * toplam
+    birikim = 0
+    for no in sorted(kutular):
+        birikim += kutular[no]
+        if birikim >= esik:
+            return min(kutu_ust_siniri(no), en_buyuk)
+    return en_buyuk
+
+
+class _Olcum:
+    """Ölçülmekte olan tek zil"""
+    
+    def __init__(self, planlanan: datetime, aciklama: str, tetik_duvar: datetime, tetik_mono: float):
+        self.planlanan = planlanan
+        self.aciklama = aciklama
+        # Planlanan saat yalnızca duvar saatiyle bilinir; monotonik eksene tetik anından taşınır
+        self.planlanan_mono = tetik_mono - (tetik_duvar - planlanan).total_seconds()
+        self.damgalar: Dict[str, float] = {ASAMA_TETIK: tetik_mono}
+    
+    def araliklar(self) -> Dict[str, float]:
+        """Aralık -> ms"""
+        sonuc = {}
+        onceki = self.planlanan_mono
+        for asama in ASAMALAR:
+            damga = self.damgalar.get(asama)
+            if damga is None:
+                continue
+            sonuc[asama] = (damga - onceki) * 1000
+            onceki = damga
+        if ASAMA_CALMA in self.damgalar:
+            sonuc[ARALIK_TOPLAM] = (self.damgalar[ASAMA_CALMA] - self.planlanan_mono) * 1000
+        return sonuc
+
+
+class ZilOlcumleri(QObject):
+    """Otomatik zillerin aşama aşama gecikmeleri
+    
+    Zamanlayıcı bir zil gönderirken ölçüm başlar; oynatıcı ve ana pencere sıradaki
+    aşamaları işaretler, ses başlayınca ölçüm kapanır. Her gün için aralık başına
+    logaritmik histogram (sayı, p50/p95, en kötü) data/olcumler.json'da tutulur.
+    Elle çalınan sesler ölçülmez (etkin ölçüm yokken işaretler yok sayılır).
+    """
+    
+    olculdu = Signal(str, object)  # (açıklama, aralık -> ms)
+    
+    _ornekler: Dict[Path, "ZilOlcumleri"] = {}
+    
+    @classmethod
+    def instance(cls, dosya: str = "data/olcumler.json") -> "ZilOlcumleri":
+        """Dosya başına tek ölçüm deposu döndür"""
+        base_dir = Path(__file__).parent.parent
+        yol = (base_dir / dosya).resolve()
+        if yol not in cls._ornekler:
+            cls._ornekler[yol] = cls(yol)
+        return cls._ornekler[yol]
+    
+    def __init__(self, dosya: Path):
+        super().__init__()
+        self.dosya = Path(dosya)
+        data = read_json(self.dosya)
+        gunler = data.get("gunler") if isinstance(data, dict) else None
+        # Gün (ISO) -> {"araliklar": {aralık: {"sayi", "max", "kutular"}}, "kayitlar": [...]}
+        self._gunler: Dict[str, dict] = gunler if isinstance(gunler, dict) else {}
+        self._aktif: Optional[_Olcum] = None
+    
+    def basla(self, planlanan: datetime, aciklama: str, tetik_duvar: datetime, tetik_mono: float):
+        """Zamanlayıcı bir zil gönderiyor: ölçümü başlat (tetik anı zamanlayıcının uyandığı an)"""
+        self._aktif = _Olcum(planlanan, aciklama, tetik_duvar, tetik_mono)
+    
+    def isaretle(self, asama: str):
+        """Etkin ölçümde aşamaya ulaşıldı (her aşamanın ilk işareti sayılır)"""
+        olcum = self._aktif
+        if olcum is None or asama in olcum.damgalar:
+            return
+        simdi = time.monotonic()
+        if simdi - olcum.damgalar[ASAMA_TETIK] > ZAMAN_ASIMI_SN:
+            self._aktif = None
+            return
+        olcum.damgalar[asama] = simdi
+        if asama == ASAMA_CALMA:
+            self._aktif = None
+            self._kaydet(olcum)
+    
+    def iptal(self):
+        """Zil çalınmadı (zil kapalı, tatil veya dosya bulunamadı): ölçüm kaydedilmez"""
+        self._aktif = None
+    
+    def _kaydet(self, olcum: _Olcum):
+        araliklar = olcum.araliklar()
+        gun_anahtari = olcum.planlanan.date().isoformat()
+        gun = self._gunler.setdefault(gun_anahtari, {"araliklar": {}, "kayitlar": []})
+        for ad, ms in araliklar.items():
+            ozet = gun["araliklar"].setdefault(ad, {"sayi": 0, "max": 0.0, "kutular": {}})
+            ozet["sayi"] += 1
+            ozet["max"] = round(max(ozet["max"], ms), 3)
+            # JSON anahtarları metin olduğu için kutu numarası metin olarak tutulur
+            no = str(kutu(ms))
+            ozet["kutular"][no] = ozet["kutular"].get(no, 0) + 1
+        gun["kayitlar"].append({
+            "planlanan": olcum.planlanan.strftime("%H:%M:%S"),
+            "aciklama": olcum.aciklama,
+            # Her aşamanın planlanan saatten uzaklığı (ms)
+            "asamalar": {asama: round((damga - olcum.planlanan_mono) * 1000, 3)
+                         for asama, damga in olcum.damgalar.items()}
+        })
+        self._budama(olcum.planlanan.date())
+        writer_for(self.dosya).save({"surum": 1, "gunler": self._gunler})
+        self.olculdu.emit(olcum.aciklama, araliklar)
+    
+    def _budama(self, bugun: date):
+        """Eski günlerin histogramlarını ve zil kayıtlarını at"""
+        en_eski = (bugun - timedelta(days=GUN_SAYISI)).isoformat()
+        kayit_siniri = (bugun - timedelta(days=KAYIT_GUN_SAYISI)).isoformat()
+        for anahtar in list(self._gunler):
+            if anahtar < en_eski:
+                del self._gunler[anahtar]
+            elif anahtar < kayit_siniri:
+                self._gunler[anahtar]["kayitlar"] = []
+    
+    def gunler(self) -> List[str]:
+        """Ölçüm olan günler (en yenisi başta)"""
+        return sorted(self._gunler, reverse=True)
+    
+    def ozet(self, gun: str) -> Dict[str, dict]:
+        """Günün aralık özetleri: aralık -> {"sayi", "p50", "p95", "max"} (ms)"""
+        sonuc = {}
+        for ad, ozet in self._gunler.get(gun, {}).get("araliklar", {}).items():
+            kutular = {int(no): sayi for no, sayi in ozet["kutular"].items()}
+            sonuc[ad] = {
+                "sayi": ozet["sayi"],
+                "p50": round(yuzdelik(kutular, 0.50, ozet["max"]), 1),
+                "p95": round(yuzdelik(kutular, 0.95, ozet["max"]), 1),
+                "max": ozet["max"]
+            }
+        return sonuc
+    
+    def histogram(self, gun: str, aralik: str) -> List[dict]:
+        """Aralığın histogramı: [{"ust_ms": kutunun üst sınırı, "sayi": ...}] (küçükten büyüğe)"""
+        kutular = self._gunler.get(gun, {}).get("araliklar", {}).get(aralik, {}).get("kutular", {})
+        return [{"ust_ms": round(kutu_ust_siniri(no), 3), "sayi": kutular[str(no)]}
+                for no in sorted(int(no) for no in kutular)]
+    
+    def kayitlar(self, gun: str) -> List[dict]:
+        """Günün tek tek zil ölçümleri (son KAYIT_GUN_SAYISI gün için)"""
+        return list(self._gunler.get(gun, {}).get("kayitlar", []))
+    
+    def disa_aktar(self, yol: Path):
+        """Tüm günlerin özetlerini, histogramlarını ve zil kayıtlarını JSON olarak yaz"""
+        atomic_write_json(Path(yol), {
+            "surum": 1,
+            "olusturulma": datetime.now().isoformat(timespec="seconds"),
+            "kutu_sayisi_onluk_basina": KUTU_SAYISI,
+            "gunler": {
+                gun: {
+                    "ozet": self.ozet(gun),
+                    "histogram": {ad: self.histogram(gun, ad) for ad in self._gunler[gun]["araliklar"]},
+                    "kayitlar": self.kayitlar(gun)
+                }
+                for gun in self.gunler()
+            }
+        }, yedek_sayisi=0)
@@ -0,0 +1,321 @@
+"""
+Ses karıştırıcı - Birden çok PCM kaynağını tek çıkışta toplar (zil çalarken müzik kısılır, anons müziğin üstünden okunur)
+"""
+import itertools
+import time
+from threading import Lock
+from typing import Dict, Optional
+from PySide6.QtCore import QCoreApplication, QObject, QThread, QTimer, Signal
+from PySide6.QtMultimedia import QAudioFormat, QAudioSink, QMediaDevices
+
+try:
+    import numpy as np
+except ImportError:  # numpy yoksa karıştırıcı kullanılmaz, sesler tek tek çalınır
+    np = None
+
+
+# Öncelikler: çalan en yüksek öncelikten düşük kaynaklar kısılır
+ONCELIK_MUZIK = 0
+ONCELIK_ANONS = 1
+ONCELIK_ZIL = 2
+ONCELIK_ACIL = 3
+
+# Düşük öncelikli kaynakların kısılma miktarı ve geçiş süresi
+VARSAYILAN_KISMA_DB = -18.0
+GECIS_MS = 250
+
+# Her turda karıştırılan süre; cihaz tamponunda BLOK_SAYISI blok tutulur (gecikme ≈ 80 ms)
+BLOK_MS = 20
+BLOK_SAYISI = 4
+# Bu kadar süre hiçbir şey çalmazsa ses cihazı kapatılır
+BOSTA_KAPAT_SN = 30
+
+
+class _Kaynak:
+    """Karıştırılan tek ses (yalnızca ses iş parçacığında değiştirilir)"""
+    __slots__ = ("kimlik", "ornekler", "konum", "seviye", "oncelik", "carpan", "giris_hizi", "cikis_hizi",
+                 "bitiyor", "duyuruldu")
+    
+    def __init__(self, kimlik: int, ornekler, seviye: float, oncelik: int, giris_hizi: Optional[float]):
+        self.kimlik = kimlik
+        self.ornekler = ornekler  # int16 (örnek, kanal) - çözülmüş sesin belleğine bakar, kopyalanmaz
+        self.konum = 0
+        self.seviye = seviye
+        self.oncelik = oncelik
+        # Uygulanan kazanç; hedefe blok başına en fazla "hız" kadar yaklaşır (tık sesi olmaz)
+        self.carpan = 0.0 if giris_hizi else seviye
+        self.giris_hizi = giris_hizi
+        self.cikis_hizi: Optional[float] = None
+        self.bitiyor = False
+        self.duyuruldu = False
+
+
+class _Isci(QObject):
+    """Ses iş parçacığında çalışan karıştırıcı; ses cihazına itme kipinde yazar"""
+    
+    basladi = Signal(int)
+    bitti = Signal(int)
+    
+    def __init__(self, bicim: QAudioFormat, durum: Dict[int, int], durum_kilidi: Lock):
+        super().__init__()
+        self.bicim = bicim
+        self.kanal = bicim.channelCount()
+        self.blok = bicim.sampleRate() * BLOK_MS // 1000
+        self._kaynaklar: Dict[int, _Kaynak] = {}
+        self._harici = -1
+        self._kisma = 10 ** (VARSAYILAN_KISMA_DB / 20)
+        self._gecis_hizi = BLOK_MS / GECIS_MS
+        self._durum = durum
+        self._durum_kilidi = durum_kilidi
+        self._sink: Optional[QAudioSink] = None
+        self._cihaz = None
+        self._timer: Optional[QTimer] = None
+        self._kapat_timer: Optional[QTimer] = None
+        self._acik_tut_bitis = 0.0  # monotonic; bu ana kadar cihaz boşta da kapatılmaz
+    
+    def baslat(self):
+        # Zamanlayıcılar ve ses cihazı bu iş parçacığında oluşturulmalı
+        self._timer = QTimer()
+        self._timer.setInterval(BLOK_MS // 2)
+        self._timer.timeout.connect(self._doldur)
+        self._kapat_timer = QTimer()
+        self._kapat_timer.setSingleShot(True)
+        self._kapat_timer.timeout.connect(self._bosta_kapat)
+    
+    def ekle(self, kaynak: _Kaynak):
+        self._kaynaklar[kaynak.kimlik] = kaynak
+        self._durumu_yayinla()
+        self._cihazi_ac()
+        self._doldur()
+    
+    def _cihazi_ac(self):
+        if self._sink is None:
+            self._sink = QAudioSink(QMediaDevices.defaultAudioOutput(), self.bicim)
+            self._sink.setBufferSize(self.blok * self.kanal * 2 * BLOK_SAYISI)
+            self._cihaz = self._sink.start()
+        self._kapat_timer.stop()
+        if not self._timer.isActive():
+            self._timer.start()
+    
+    def durdur(self, kimlik: int, cikis_ms: int):
+        kaynak = self._kaynaklar.get(kimlik)
+        if kaynak is None:
+            return
+        if cikis_ms <= 0:
+            del self._kaynaklar[kimlik]
+            self._durumu_yayinla()
+            self.bitti.emit(kimlik)
+            return
+        kaynak.bitiyor = True
+        kaynak.cikis_hizi = max(kaynak.carpan, 1e-6) * BLOK_MS / cikis_ms
+    
+    def seviye_ayarla(self, kimlik: int, seviye: float):
+        kaynak = self._kaynaklar.get(kimlik)
+        if kaynak is not None:
+            kaynak.seviye = seviye
+    
+    def harici_oncelik(self, oncelik: int):
+        self._harici = oncelik
+    
+    def kisma_ayarla(self, db: float):
+        self._kisma = 10 ** (min(0.0, db) / 20)
+    
+    def acik_tut(self, sure_sn: float):
+        self._acik_tut_bitis = time.monotonic() + sure_sn if sure_sn > 0 else 0.0
+        if sure_sn > 0:
+            self._cihazi_ac()
+            self._doldur()
+        elif not self._kaynaklar and self._sink is not None:
+            self._bosa_gec()
+    
+    def kapat(self):
+        if self._timer is not None:
+            self._timer.stop()
+            self._kapat_timer.stop()
+        self._cihazi_kapat()
+    
+    def _cihazi_kapat(self):
+        if self._sink is not None:
+            self._sink.stop()
+            self._sink = None
+            self._cihaz = None
+    
+    def _doldur(self):
+        """Cihaz tamponunda yer oldukça yeni bloklar karıştırıp yaz"""
+        if self._sink is None:
+            return
+        blok_bayt = self.blok * self.kanal * 2
+        while self._kaynaklar and self._sink.bytesFree() >= blok_bayt:
+            self._cihaz.write(self.karistir(self.blok))
+        if not self._kaynaklar:
+            self._bosa_gec()
+    
+    def _bosa_gec(self):
+        """Çalan kaynak kalmadı: yazmayı bırak, cihazı bir süre sonra kapat
+        
+        Boştayken sessizlik yazılmaz ve zamanlayıcı durur; cihaz açık kaldığı sürece yeni
+        ses cihaz açılışını beklemeden başlar.
+        """
+        self._timer.stop()
+        kalan_ms = (self._acik_tut_bitis - time.monotonic()) * 1000
+        self._kapat_timer.start(int(max(BOSTA_KAPAT_SN * 1000, kalan_ms)))
+    
+    def _bosta_kapat(self):
+        if not self._kaynaklar:
+            self._cihazi_kapat()
+    
+    def karistir(self, n: int) -> bytes:
+        """Etkin kaynakların sonraki n örneğini topla (16 bit PCM)"""
+        toplam = np.zeros((n, self.kanal), dtype=np.float32)
+        en_yuksek = max([k.oncelik for k in self._kaynaklar.values() if not k.bitiyor] + [self._harici])
+        bitenler = []
+        for kaynak in list(self._kaynaklar.values()):
+            if kaynak.bitiyor:
+                hedef, hiz = 0.0, kaynak.cikis_hizi
+            else:
+                hedef = kaynak.seviye * (self._kisma if kaynak.oncelik < en_yuksek else 1.0)
+                hiz = kaynak.giris_hizi if kaynak.giris_hizi and kaynak.carpan < hedef else self._gecis_hizi
+            yeni = min(hedef, kaynak.carpan + hiz) if kaynak.carpan < hedef else max(hedef, kaynak.carpan - hiz)
+            
+            parca = kaynak.ornekler[kaynak.konum:kaynak.konum + n]
+            if len(parca):
+                if yeni == kaynak.carpan:
+                    toplam[:len(parca)] += parca * np.float32(yeni)
+                else:
+                    rampa = np.linspace(kaynak.carpan, yeni, len(parca), dtype=np.float32)
+                    toplam[:len(parca)] += parca * rampa[:, None]
+            kaynak.carpan = yeni
+            kaynak.konum += len(parca)
+            if not kaynak.duyuruldu:
+                kaynak.duyuruldu = True
+                self.basladi.emit(kaynak.kimlik)
+            if kaynak.konum >= len(kaynak.ornekler) or (kaynak.bitiyor and yeni <= 0.0):
+                bitenler.append(kaynak.kimlik)
+        
+        for kimlik in bitenler:
+            del self._kaynaklar[kimlik]
+            self.bitti.emit(kimlik)
+        if bitenler:
+            self._durumu_yayinla()
+        np.clip(toplam, -32768, 32767, out=toplam)
+        return toplam.astype("<i2").tobytes()
+    
+    def _durumu_yayinla(self):
+        with self._durum_kilidi:
+            self._durum.clear()
+            self._durum.update({k.kimlik: k.oncelik for k in self._kaynaklar.values()})
+
+
+class KarisimMotoru(QObject):
+    """Çözülmüş sesleri aynı anda çalan karıştırıcı
+    
+    Karıştırma ayrı bir ses iş parçacığında numpy dizileriyle yapılır. Çalan en yüksek
+    öncelikten düşük kaynaklar yumuşak geçişle kısılır; kaynak bitince veya durdurulunca
+    bitti sinyali gelir. Yalnızca karıştırıcı biçimindeki (ses önbelleğinin çözdüğü)
+    sesler eklenebilir.
+    """
+    
+    basladi = Signal(int)  # Kaynağın ilk bloğu cihaza yazıldı
+    bitti = Signal(int)  # Kaynak sona erdi veya durduruldu
+    _ekle_istegi = Signal(object)
+    _durdur_istegi = Signal(int, int)
+    _seviye_istegi = Signal(int, float)
+    _harici_istegi = Signal(int)
+    _kisma_istegi = Signal(float)
+    _acik_tut_istegi = Signal(float)
+    _kapat_istegi = Signal()
+    
+    def __init__(self, bicim: QAudioFormat):
+        super().__init__()
+        self.bicim = bicim
+        self._sayac = itertools.count(1)
+        self._durum: Dict[int, int] = {}
+        self._durum_kilidi = Lock()
+        
+        self._thread = QThread()
+        self._thread.setObjectName("ses-karistirici")
+        self._isci = _Isci(bicim, self._durum, self._durum_kilidi)
+        self._isci.moveToThread(self._thread)
+        self._thread.started.connect(self._isci.baslat)
+        # İstekler kuyruklu bağlantıyla ses iş parçacığında işlenir
+        self._ekle_istegi.connect(self._isci.ekle)
+        self._durdur_istegi.connect(self._isci.durdur)
+        self._seviye_istegi.connect(self._isci.seviye_ayarla)
+        self._harici_istegi.connect(self._isci.harici_oncelik)
+        self._kisma_istegi.connect(self._isci.kisma_ayarla)
+        self._acik_tut_istegi.connect(self._isci.acik_tut)
+        self._kapat_istegi.connect(self._isci.kapat)
+        self._isci.basladi.connect(self.basladi)
+        self._isci.bitti.connect(self.bitti)
+        self._thread.start(QThread.Priority.TimeCriticalPriority)
+        
+        uygulama = QCoreApplication.instance()
+        if uygulama is not None:
+            uygulama.aboutToQuit.connect(self.kapat)
+    
+    @staticmethod
+    def kullanilabilir() -> bool:
+        """numpy kurulu mu?"""
+        return np is not None
+    
+    def uyumlu(self, bicim: QAudioFormat) -> bool:
+        """Bu biçimdeki PCM karıştırılabilir mi?"""
+        return (bicim.sampleFormat() == QAudioFormat.SampleFormat.Int16
+                and bicim.sampleRate() == self.bicim.sampleRate()
+                and bicim.channelCount() == self.bicim.channelCount())
+    
+    def ekle(self, ses, seviye: float, oncelik: int, giris_ms: int = 0) -> Optional[int]:
+        """Çözülmüş sesi (CozulmusSes) karışıma ekle
+        
+        Args:
+            seviye: 0.0 - 1.0
+            oncelik: ONCELIK_* (yüksek olan düşükleri kısar)
+            giris_ms: Sesin sıfırdan açılma süresi (0: hemen tam seviye)
+        
+        Returns:
+            Kaynak kimliği; biçim uyumsuzsa None
+        """
+        if not self.uyumlu(ses.bicim):
+            return None
+        kanal = self.bicim.channelCount()
+        ornekler = np.frombuffer(ses.veri, dtype="<i2")
+        ornekler = ornekler[:len(ornekler) - len(ornekler) % kanal].reshape(-1, kanal)
+        kimlik = next(self._sayac)
+        giris_hizi = seviye * BLOK_MS / giris_ms if giris_ms > 0 else None
+        self._ekle_istegi.emit(_Kaynak(kimlik, ornekler, seviye, oncelik, giris_hizi))
+        return kimlik
+    
+    def durdur(self, kimlik: int, cikis_ms: int = 0):
+        """Kaynağı (isteğe bağlı olarak yavaşça kısarak) durdur"""
+        self._durdur_istegi.emit(kimlik, cikis_ms)
+    
+    def seviye_ayarla(self, kimlik: int, seviye: float):
+        self._seviye_istegi.emit(kimlik, seviye)
+    
+    def harici_oncelik(self, oncelik: int):
+        """Karıştırıcı dışında çalan sesin önceliği (-1: yok); düşük öncelikli kaynaklar ona göre kısılır"""
+        self._harici_istegi.emit(oncelik)
+    
+    def kisma_ayarla(self, db: float):
+        """Düşük öncelikli kaynakların kısılma miktarı (dB, 0 veya eksi)"""
+        self._kisma_istegi.emit(db)
+    
+    def acik_tut(self, sure_sn: float):
+        """Ses cihazını şimdiden açıp boştayken de sure_sn saniye açık tut (0: normal kapanış)
+        
+        Bu sürede eklenen ses cihaz açılışını beklemeden başlar; süre dolunca cihaz her
+        zamanki gibi boşta kaldıktan BOSTA_KAPAT_SN sonra kapanır.
+        """
+        self._acik_tut_istegi.emit(float(sure_sn))
+    
+    def aktifler(self) -> Dict[int, int]:
+        """Çalan kaynaklar (kimlik -> öncelik)"""
+        with self._durum_kilidi:
+            return dict(self._durum)
+    
+    def kapat(self):
+        """Ses iş parçacığını durdur"""
+        if self._thread.isRunning():
+            self._kapat_istegi.emit()
+            self._thread.quit()
+            self._thread.wait(1000)
@@ -0,0 +1,161 @@
+"""
+Kalıcı kayıt - JSON dosyalarını elektrik kesintisine dayanıklı, toplu ve arka planda yazar
+"""
+import json
+import os
+import shutil
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Optional
+from PySide6.QtCore import QObject, QTimer, Signal
+
+
+# Her dosya için tutulan yedek sayısı (dosya.json.bak1 en yenisi)
+YEDEK_SAYISI = 3
+# Art arda gelen kayıtlar bu süre içinde tek yazmaya birleştirilir
+BIRLESTIRME_MS = 500
+
+# Tüm yazmalar tek bir arka plan iş parçacığında sırayla yapılır
+_yazici = ThreadPoolExecutor(max_workers=1, thread_name_prefix="json-yazici")
+
+
+def _yedek_yolu(path: Path, no: int) -> Path:
+    return path.with_name(f"{path.name}.bak{no}")
+
+
+def _fsync_dir(klasor: Path):
+    """Yeniden adlandırmanın diske işlenmesi için klasörü fsync et (Windows'ta desteklenmez)"""
+    if os.name == "nt":
+        return
+    try:
+        fd = os.open(str(klasor), os.O_RDONLY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+    except OSError:
+        pass
+
+
+def atomic_write_text(path: Path, metin: str, yedek_sayisi: int = YEDEK_SAYISI):
+    """Metni geçici dosyaya yaz, fsync et ve canlı dosyanın yerine koy
+    
+    Yazma yarıda kalırsa canlı dosya bozulmaz; eski sürüm .bak1 olarak saklanır.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    gecici = path.with_name(path.name + ".tmp")
+    
+    with open(gecici, 'w', encoding='utf-8') as f:
+        f.write(metin)
+        f.flush()
+        os.fsync(f.fileno())
+    
+    # Yedek nesillerini kaydır: bak(n-1) -> bakn ... bak1 -> bak2, canlı -> bak1
+    if yedek_sayisi > 0 and path.exists():
+        for no in range(yedek_sayisi, 1, -1):
+            onceki = _yedek_yolu(path, no - 1)
+            if onceki.exists():
+                os.replace(onceki, _yedek_yolu(path, no))
+        shutil.copy2(path, _yedek_yolu(path, 1))
+    
+    os.replace(gecici, path)
+    _fsync_dir(path.parent)
+
+
+def atomic_write_json(path: Path, data, yedek_sayisi: int = YEDEK_SAYISI):
+    """JSON'u atomik olarak yaz (senkron)"""
+    atomic_write_text(path, json.dumps(data, ensure_ascii=False, indent=2), yedek_sayisi)
+
+
+def read_json(path: Path, yedek_sayisi: int = YEDEK_SAYISI) -> Optional[Dict]:
+    """JSON'u oku; bozuksa en yeni sağlam yedeğe dön (hiçbiri yoksa None)"""
+    path = Path(path)
+    adaylar = [path] + [_yedek_yolu(path, no) for no in range(1, yedek_sayisi + 1)]
+    for aday in adaylar:
+        try:
+            if not aday.exists():
+                continue
+            with open(aday, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if aday != path:
+                print(f"{path.name} bozuk, yedekten yüklendi: {aday.name}")
+            return data
+        except Exception as e:
+            print(f"{aday.name} okunamadı: {e}")
+    return None
+
+
+def read_json_async(path: Path) -> Future:
+    """JSON'u yazma thread'inde oku (yarım kalmış bir kaydın ortasına denk gelmez)"""
+    return _yazici.submit(read_json, Path(path))
+
+
+class JsonWriter(QObject):
+    """Bir JSON dosyası için toplu (debounce) ve arka planda çalışan yazıcı"""
+    
+    yazildi = Signal(str)  # Dosya yolu
+    hata = Signal(str, str)  # (dosya yolu, hata mesajı)
+    
+    def __init__(self, path: Path, gecikme_ms: int = BIRLESTIRME_MS):
+        super().__init__()
+        self.path = Path(path)
+        self._bekleyen: Optional[str] = None
+        self._gelecek: Optional[Future] = None
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(gecikme_ms)
+        self._timer.timeout.connect(self._gonder)
+    
+    def save(self, data: Dict):
+        """Verinin anlık kopyasını al ve kısa süre sonra yazılmak üzere sıraya koy"""
+        # Serileştirme GUI thread'inde yapılır ki arka planda değişen sözlük yazılmasın
+        self._bekleyen = json.dumps(data, ensure_ascii=False, indent=2)
+        self._timer.start()
+    
+    def bekliyor(self) -> bool:
+        """Henüz diske inmemiş bir kayıt var mı?"""
+        return self._bekleyen is not None or (self._gelecek is not None and not self._gelecek.done())
+    
+    def flush(self):
+        """Bekleyen kaydı hemen yaz ve bitmesini bekle"""
+        self._timer.stop()
+        self._gonder()
+        if self._gelecek is not None:
+            try:
+                self._gelecek.result()
+            except Exception:
+                pass  # Hata sinyal ile bildirildi
+    
+    def _gonder(self):
+        if self._bekleyen is None:
+            return
+        metin, self._bekleyen = self._bekleyen, None
+        self._gelecek = _yazici.submit(atomic_write_text, self.path, metin)
+        self._gelecek.add_done_callback(self._on_done)
+    
+    def _on_done(self, gelecek: Future):
+        """Arka plan thread'inde çağrılır; sinyaller GUI thread'ine kuyruklanır"""
+        hata = gelecek.exception()
+        if hata is not None:
+            print(f"{self.path.name} kaydedilirken hata: {hata}")
+            self.hata.emit(str(self.path), str(hata))
+        else:
+            self.yazildi.emit(str(self.path))
+
+
+_yazicilar: Dict[Path, JsonWriter] = {}
+
+
+def writer_for(path: Path) -> JsonWriter:
+    """Dosya başına tek yazıcı (aynı dosyaya yazan modüller sırayı paylaşır)"""
+    path = Path(path).resolve()
+    if path not in _yazicilar:
+        _yazicilar[path] = JsonWriter(path)
+    return _yazicilar[path]
+
+
+def flush_all():
+    """Uygulama kapanırken bekleyen tüm kayıtları diske yaz"""
+    for yazici in list(_yazicilar.values()):
+        yazici.flush()
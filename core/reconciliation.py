@@ -0,0 +1,150 @@
+"""
+Zil mutabakatı - Programdaki zilleri olay günlüğüyle eşleştirip zamanında/geç/kaçırılan/çift/engellenen olarak sınıflar
+"""
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+from itertools import groupby
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+from core.event_log import (
+    SONUC_CALINDI, SONUC_ENGELLENDI, SONUC_GEC_CALINDI, SONUC_HATA, TUR_OTOMATIK, OlayGunlugu
+)
+from core.timeline import ZamanCizelgesi, ZilOlayi
+
+
+# Sınıflar
+SINIF_ZAMANINDA = "zamaninda"
+SINIF_GEC = "gec"
+SINIF_KACIRILDI = "kacirildi"
+SINIF_CIFT = "cift"
+SINIF_ENGELLENDI = "engellendi"
+SINIF_PROGRAM_DISI = "program_disi"  # Kayıt var ama programda (artık) böyle bir zil yok
+SINIFLAR = (SINIF_ZAMANINDA, SINIF_GEC, SINIF_KACIRILDI, SINIF_CIFT, SINIF_ENGELLENDI, SINIF_PROGRAM_DISI)
+SINIF_ADLARI = {
+    SINIF_ZAMANINDA: "Zamanında",
+    SINIF_GEC: "Geç",
+    SINIF_KACIRILDI: "Kaçırıldı",
+    SINIF_CIFT: "Birden fazla çaldı",
+    SINIF_ENGELLENDI: "Engellendi",
+    SINIF_PROGRAM_DISI: "Programda yok"
+}
+
+# Planlanan saatten bu kadar sonra başlayan zil geç sayılır
+GEC_ESIGI_MS = 5000
+# Kaçırılan zil en geç bu kadar gün sonra kaydedilir (zamanlayıcının geri bakış süresi)
+GERI_BAKIS_GUN = 1
+
+
+class MutabakatSatiri(NamedTuple):
+    """Raporun tek satırı"""
+    planlanan: datetime
+    aciklama: str
+    vardiya: str
+    sinif: str
+    gecikme_ms: Optional[int] = None
+    ayrinti: str = ""
+
+
+def _anahtar(planlanan: str, vardiya: str, ders, tip: str) -> Tuple[str, str, int, str]:
+    return planlanan, vardiya or "", ders or 0, tip or ""
+
+
+def _kayit_anahtari(kayit: dict) -> Tuple[str, str, int, str]:
+    return _anahtar(kayit["planlanan"], kayit.get("vardiya"), kayit.get("ders"), kayit.get("tip"))
+
+
+def _gunluk_kayitlar(olaylar: OlayGunlugu, bas: date, bit: date) -> Iterator[Tuple[date, List[dict]]]:
+    """bas..bit her gün için o güne planlanmış otomatik zil kayıtları (anahtara göre sıralı)
+    
+    Olay günlüğü kayıt zamanına göre sıralıdır; kaçırılan zil en geç GERI_BAKIS_GUN sonra
+    kaydedildiği için bir gün, günlükte o günden sonraki günlere geçildiğinde tamamlanır.
+    Bellekte aynı anda yalnızca birkaç günün kayıtları tutulur.
+    """
+    bekleyen: Dict[date, List[dict]] = defaultdict(list)
+    gun = bas
+    for kayit in olaylar.sorgula(bas, bit + timedelta(days=GERI_BAKIS_GUN), turler=[TUR_OTOMATIK]):
+        kayit_gunu = date.fromisoformat(kayit["zaman"][:10])
+        while gun <= bit and kayit_gunu > gun + timedelta(days=GERI_BAKIS_GUN):
+            yield gun, sorted(bekleyen.pop(gun, []), key=_kayit_anahtari)
+            gun += timedelta(days=1)
+        planlanan = kayit.get("planlanan")
+        if not planlanan:
+            continue
+        planlanan_gun = date.fromisoformat(planlanan[:10])
+        if bas <= planlanan_gun <= bit:
+            bekleyen[planlanan_gun].append(kayit)
+    while gun <= bit:
+        yield gun, sorted(bekleyen.pop(gun, []), key=_kayit_anahtari)
+        gun += timedelta(days=1)
+
+
+def _siniflandir(zaman: datetime, aciklama: str, vardiya: str, kayitlar: List[dict]) -> MutabakatSatiri:
+    """Programdaki bir zilin kayıtlarına göre sınıfı"""
+    calinanlar = [k for k in kayitlar if k.get("sonuc") in (SONUC_CALINDI, SONUC_GEC_CALINDI)]
+    if len(calinanlar) > 1:
+        return MutabakatSatiri(zaman, aciklama, vardiya, SINIF_CIFT, calinanlar[0].get("gecikme_ms"),
+                               f"{len(calinanlar)} kez çaldı")
+    if calinanlar:
+        gecikme = calinanlar[0].get("gecikme_ms")
+        sinif = SINIF_GEC if gecikme is not None and gecikme > GEC_ESIGI_MS else SINIF_ZAMANINDA
+        return MutabakatSatiri(zaman, aciklama, vardiya, sinif, gecikme)
+    engellenen = next((k for k in kayitlar if k.get("sonuc") == SONUC_ENGELLENDI), None)
+    if engellenen is not None:
+        ayrinti = "Tatil modu" if engellenen.get("mod") == "tatil" else "Zil kapalı"
+        return MutabakatSatiri(zaman, aciklama, vardiya, SINIF_ENGELLENDI, ayrinti=ayrinti)
+    if any(k.get("sonuc") == SONUC_HATA for k in kayitlar):
+        return MutabakatSatiri(zaman, aciklama, vardiya, SINIF_KACIRILDI, ayrinti="Ses dosyası çalınamadı")
+    if kayitlar:
+        return MutabakatSatiri(zaman, aciklama, vardiya, SINIF_KACIRILDI,
+                               ayrinti="Zamanında çalınamadı (uyku, saat değişikliği)")
+    return MutabakatSatiri(zaman, aciklama, vardiya, SINIF_KACIRILDI,
+                           ayrinti="Kayıt yok (uygulama kapalı olabilir)")
+
+
+def mutabakat(cizelge: ZamanCizelgesi, olaylar: OlayGunlugu, bas: date, bit: date,
+              simdi: Optional[datetime] = None) -> Iterator[MutabakatSatiri]:
+    """bas..bit günlerinin mutabakatı (planlanan saate göre sıralı)
+    
+    Her gün için derlenmiş programdaki ziller ile olay günlüğündeki kayıtlar aynı anahtara
+    (planlanan zaman, vardiya, ders, zil tipi) göre sıralanıp birleştirme-eşleştirme ile
+    yürünür. Program bugünkü haliyle kullanılır; sonradan değişen ziller "programda yok"
+    olarak görünür. Henüz zamanı gelmemiş ziller rapora girmez.
+    """
+    simdi = simdi or datetime.now()
+    for gun, kayitlar in _gunluk_kayitlar(olaylar, bas, bit):
+        gun_basi = datetime.combine(gun, datetime.min.time())
+        beklenenler: List[Tuple[Tuple[str, str, int, str], datetime, ZilOlayi]] = []
+        for olay in cizelge.tarih(gun).olaylar:
+            zaman = gun_basi + timedelta(minutes=olay.dakika)
+            if zaman > simdi:
+                break
+            anahtar = _anahtar(zaman.isoformat(timespec="seconds"), olay.vardiya, olay.ders, olay.tip)
+            beklenenler.append((anahtar, zaman, olay))
+        beklenenler.sort(key=lambda b: b[0])
+        
+        gruplar = [(anahtar, list(grup)) for anahtar, grup in groupby(kayitlar, key=_kayit_anahtari)]
+        i = j = 0
+        while i < len(beklenenler) or j < len(gruplar):
+            if j >= len(gruplar) or (i < len(beklenenler) and beklenenler[i][0] < gruplar[j][0]):
+                _, zaman, olay = beklenenler[i]
+                yield _siniflandir(zaman, olay.aciklama, olay.vardiya, [])
+                i += 1
+            elif i >= len(beklenenler) or gruplar[j][0] < beklenenler[i][0]:
+                anahtar, grup = gruplar[j]
+                yield MutabakatSatiri(datetime.fromisoformat(anahtar[0]), grup[0].get("aciklama", ""),
+                                      anahtar[1], SINIF_PROGRAM_DISI, grup[0].get("gecikme_ms"),
+                                      f"{len(grup)} kayıt")
+                j += 1
+            else:
+                _, zaman, olay = beklenenler[i]
+                yield _siniflandir(zaman, olay.aciklama, olay.vardiya, gruplar[j][1])
+                i += 1
+                j += 1
+
+
+def ozet(satirlar: Iterable[MutabakatSatiri]) -> Dict[str, int]:
+    """Sınıf -> zil sayısı"""
+    sayilar = {sinif: 0 for sinif in SINIFLAR}
+    for satir in satirlar:
+        sayilar[satir.sinif] += 1
+    return sayilar
@@ -1,17 +1,47 @@
 """
 Zamanlama motoru - Zil saatlerini kontrol eder ve çalar
 """
-import json
-from datetime import datetime, time, timedelta
+import heapq
+import time
+from datetime import date, datetime, timedelta
 from pathlib import Path
-from typing import Dict, List, Optional
-from PySide6.QtCore import QTimer, QObject, Signal
+from typing import Dict, List, Optional, Set, Tuple
+from PySide6.QtCore import QTimer, QObject, Signal, Qt, QFileSystemWatcher
+
+from core.journal import SONUC_KACIRILDI, ZilGunlugu
+from core.metrics import ASAMA_YAYIN, ZilOlcumleri
+from core.persistence import read_json, read_json_async, writer_for
+from core.settings_store import SettingsStore
+from core.timeline import GUN_ADLARI, ZamanCizelgesi, ZilOlayi, derle, yeniden_derle
+
+
+# Zamanlayıcı en fazla bu kadar uyur (saat ayarı değişikliklerine karşı güvenlik kontrolü)
+MAKS_BEKLEME_MS = 10 * 60 * 1000
+# Dakika başını kesin geçmiş olmak için hedefe eklenen pay
+HIZALAMA_PAYI_MS = 20
+# Duvar saati monotonik saatten bu kadar saniye saparsa saat ayarı değişmiş sayılır
+SICRAMA_ESIGI_SN = 5.0
+# Kaçırılan ziller için en fazla bu kadar geriye bakılır
+MAKS_GERI_BAKIS = timedelta(days=1)
+# schedule.json değiştikten sonra bu kadar sessizlik beklenip tek seferde yeniden yüklenir
+YENIDEN_YUKLEME_MS = 300
+
+# Kaçırılan zil politikaları (settings.json -> scheduler.kacirilan_zil)
+KACIRILAN_CAL = "cal"  # Tolerans süresi içindeyse en son kaçırılan zili çal
+KACIRILAN_ATLA = "atla"  # Sessizce geç
+KACIRILAN_LOGLA = "logla"  # Çalma, sadece bildir
 
 
 class Scheduler(QObject):
     """Zil zamanlama motoru"""
     
     zil_calindi = Signal(str, str, str, str)  # (tip, açıklama, ses_dosyasi, anons_dosyasi) - anons_dosyasi opsiyonel
+    zil_kacirildi = Signal(str, str, str)  # (planlanan saat HH:MM, açıklama, sonuç: "gec_calindi" / "kacirildi")
+    olay_kacirildi = Signal(object, object)  # (planlanan zaman, ZilOlayi) - politika ne olursa olsun, olay günlüğü için
+    zaman_atlamasi = Signal(str, float)  # (tür: "saat_ileri" / "saat_geri" / "duraklama", saniye)
+    zil_yaklasiyor = Signal(str, str)  # (tip, ses_dosyasi) - zilden birkaç saniye önce, ses hazırlığı için
+    program_yenilendi = Signal(list)  # Dosyadan yeniden yüklenince değişen gün adları
+    _program_okundu = Signal(object)  # Arka planda okunan schedule.json (GUI thread'ine taşır)
     
     def __init__(self, schedule_file: str = "data/schedule.json"):
         super().__init__()
@@ -19,37 +49,145 @@ class Scheduler(QObject):
         base_dir = Path(__file__).parent.parent
         self.schedule_file = base_dir / schedule_file
         self.schedule_data: Dict = {}
+        self.cizelge = ZamanCizelgesi({})
+        self.settings = SettingsStore.instance()
+        # Sabit aralıklı yoklama yerine bir sonraki zile kurulan tek atımlık zamanlayıcı
         self.timer = QTimer()
+        self.timer.setSingleShot(True)
+        self.timer.setTimerType(Qt.TimerType.PreciseTimer)
         self.timer.timeout.connect(self._check_schedule)
-        self.timer.setInterval(1000)  # Her 1 saniyede kontrol
+        self._calisiyor = False
+        self._planlanan_bekleme_ms = 0
+        self._kurulum_mono = 0.0
         
-        # Bugün çalınan zilleri takip et (aynı zil 2 kez çalmasın)
-        self._bugun_calan_ziller: set = set()
+        # Kaçırılan ziller için son kontrolün duvar saati ve monotonik saati
+        self._son_kontrol_duvar: Optional[datetime] = None
+        self._son_kontrol_mono: Optional[float] = None
+        self.kacirilan_politikasi = KACIRILAN_CAL
+        self.kacirilan_toleransi = timedelta(minutes=5)
+        
+        # Ses yolunu önceden ısıtmak için zilden bu kadar önce zil_yaklasiyor gönderilir
+        self.on_hazirlik = timedelta(seconds=5)
+        self._hazirlanan: Optional[datetime] = None  # Hazırlığı yapılmış zil zamanı
+        
+        # Çalınan zilleri (tarih, olay kimliği) olarak takip et (aynı zil 2 kez çalmasın)
+        self._calinan_olaylar: Set[Tuple[date, tuple]] = set()
         self._son_kontrol_tarihi: Optional[datetime] = None
+        # Yeniden başlatmada aynı zil tekrar çalmasın diye işlenen ziller diske de yazılır
+        self.gunluk = ZilGunlugu(base_dir / "data/calinan_ziller.log")
+        self._ilk_baslatma = True
+        # Zilin planlanan saatten sesin başlamasına kadarki aşamaları ölçülür
+        self.olcumler = ZilOlcumleri.instance()
+        # zil_calindi gönderilirken tek çalmada birleştirilen ziller: [(planlanan zaman, ZilOlayi)]
+        self.gonderilen: List[Tuple[datetime, ZilOlayi]] = []
+        
+        # schedule.json dışarıdan değişirse program yeniden başlatmadan güncellenir
+        self._mtime_ns: Optional[int] = None
+        self._watcher = QFileSystemWatcher()
+        self._watcher.fileChanged.connect(self._on_file_changed)
+        self._watcher.directoryChanged.connect(self._on_file_changed)
+        self._reload_timer = QTimer()
+        self._reload_timer.setSingleShot(True)
+        self._reload_timer.setInterval(YENIDEN_YUKLEME_MS)
+        self._reload_timer.timeout.connect(self._reload_schedule)
+        self._program_okundu.connect(self._apply_reloaded)
+        writer_for(self.schedule_file).yazildi.connect(self._on_written)
         
         self._load_schedule()
+        # Ayarlardaki zil sesleri ve politika derlenmiş çizelgeye gömülü
+        self.settings.degisti.connect(self._compile_schedule)
     
     def _load_schedule(self):
         """Zaman çizelgesini yükle"""
-        try:
-            if self.schedule_file.exists():
-                with open(self.schedule_file, 'r', encoding='utf-8') as f:
-                    self.schedule_data = json.load(f)
+        self._mtime_ns = self._file_mtime()
+        if self.schedule_file.exists():
+            # Bozuk dosyada en yeni sağlam yedeğe dönülür
+            data = read_json(self.schedule_file)
+            if isinstance(data, dict):
+                self.schedule_data = data
             else:
+                print("Zaman çizelgesi yüklenemedi, varsayılan program kullanılıyor")
                 self.schedule_data = self._default_schedule()
-                self._save_schedule()
-        except Exception as e:
-            print(f"Zaman çizelgesi yüklenirken hata: {e}")
+        else:
             self.schedule_data = self._default_schedule()
+            self._save_schedule()
+        self._compile_schedule()
+        self._watch()
     
-    def _save_schedule(self):
-        """Zaman çizelgesini kaydet"""
+    def _file_mtime(self) -> Optional[int]:
         try:
-            self.schedule_file.parent.mkdir(parents=True, exist_ok=True)
-            with open(self.schedule_file, 'w', encoding='utf-8') as f:
-                json.dump(self.schedule_data, f, ensure_ascii=False, indent=2)
-        except Exception as e:
-            print(f"Zaman çizelgesi kaydedilirken hata: {e}")
+            return self.schedule_file.stat().st_mtime_ns
+        except OSError:
+            return None
+    
+    def _watch(self):
+        """Dosyayı ve klasörünü izle (atomik yazmada dosya yer değiştirince izleme düşer)"""
+        for yol in (self.schedule_file, self.schedule_file.parent):
+            if yol.exists() and str(yol) not in self._watcher.files() + self._watcher.directories():
+                self._watcher.addPath(str(yol))
+    
+    def _on_file_changed(self, _path: str = ""):
+        """Art arda gelen değişiklik bildirimlerini tek yeniden yüklemede birleştir"""
+        self._watch()
+        self._reload_timer.start()
+    
+    def _on_written(self, _path: str):
+        """Kendi yazdığımız dosyayı dış değişiklik sanma"""
+        self._mtime_ns = self._file_mtime()
+        self._watch()
+    
+    def _reload_schedule(self):
+        """Dosya gerçekten değiştiyse arka planda oku (ayrıştırma GUI thread'ini bloklamaz)"""
+        mtime_ns = self._file_mtime()
+        # Bekleyen kendi kaydımız varsa diskteki eski içerik bellektekini ezmesin
+        if mtime_ns is None or mtime_ns == self._mtime_ns or writer_for(self.schedule_file).bekliyor():
+            return
+        self._mtime_ns = mtime_ns
+        read_json_async(self.schedule_file).add_done_callback(
+            lambda gelecek: self._program_okundu.emit(None if gelecek.exception() else gelecek.result())
+        )
+    
+    def _apply_reloaded(self, data):
+        """Okunan programı uygula; sadece değişen günler yeniden derlenir"""
+        if not isinstance(data, dict):
+            print("Değişen zaman çizelgesi okunamadı, mevcut program korunuyor")
+            return
+        # Çalınmış zillerin kimlikleri değişmediğinden aynı zil yeniden çalmaz
+        self.cizelge, degisenler = yeniden_derle(self.cizelge, self.schedule_data, data, self.settings.sounds())
+        self.schedule_data = data
+        if not degisenler:
+            return
+        print(f"Zaman çizelgesi yeniden yüklendi: {', '.join(degisenler)}")
+        if self._calisiyor:
+            self._arm_timer()
+        self.program_yenilendi.emit(degisenler)
+    
+    def set_schedule_data(self, schedule_data: Dict):
+        """Düzenleyiciden gelen programı diski beklemeden uygula"""
+        self.schedule_data = schedule_data
+        self._compile_schedule()
+    
+    def _compile_schedule(self):
+        """Programı sıralı zaman çizelgesine derle (her tick'te yeniden ayrıştırılmaz)"""
+        self.cizelge = derle(self.schedule_data, self.settings.sounds())
+        
+        # Kaçırılan zil politikası
+        politika = self.settings.scheduler("kacirilan_zil", KACIRILAN_CAL)
+        self.kacirilan_politikasi = politika if politika in (KACIRILAN_CAL, KACIRILAN_ATLA, KACIRILAN_LOGLA) else KACIRILAN_CAL
+        try:
+            self.kacirilan_toleransi = timedelta(minutes=float(self.settings.scheduler("kacirilan_zil_toleransi_dk", 5)))
+        except (TypeError, ValueError):
+            self.kacirilan_toleransi = timedelta(minutes=5)
+        try:
+            self.on_hazirlik = timedelta(seconds=max(0.0, float(self.settings.scheduler("on_hazirlik_sn", 5))))
+        except (TypeError, ValueError):
+            self.on_hazirlik = timedelta(seconds=5)
+        if self._calisiyor:
+            self._arm_timer()
+    
+    def _save_schedule(self):
+        """Zaman çizelgesini kaydet (arka planda, atomik)"""
+        writer_for(self.schedule_file).save(self.schedule_data)
     
     def _default_schedule(self) -> Dict:
         """Varsayılan zaman çizelgesi"""
@@ -114,222 +252,198 @@ class Scheduler(QObject):
     
     def start(self):
         """Zamanlayıcıyı başlat"""
-        self.timer.start()
-        self._check_schedule()  # İlk kontrolü hemen yap
+        self._calisiyor = True
+        if self._ilk_baslatma:
+            # Uygulama yeniden açıldı: bugün çalınan zilleri günlükten geri yükle,
+            # tolerans penceresinde çalınmamış ziller kaçırılan zil politikasına girer
+            self._ilk_baslatma = False
+            simdi = datetime.now()
+            self._calinan_olaylar |= {(simdi.date(), kimlik) for kimlik in self.gunluk.oku(simdi.date())}
+            self._son_kontrol_duvar = simdi - self.kacirilan_toleransi
+            self._son_kontrol_mono = None
+        else:
+            # Zil kapalıyken geçen ziller kaçırılmış sayılmaz
+            self._son_kontrol_duvar = None
+        self._check_schedule()  # İlk kontrolü hemen yap (zamanlayıcıyı da kurar)
     
     def stop(self):
         """Zamanlayıcıyı durdur"""
+        self._calisiyor = False
         self.timer.stop()
     
+    def _arm_timer(self):
+        """Zamanlayıcıyı bir sonraki zilin dakika başına (veya gün dönümüne) kur"""
+        simdi = datetime.now()
+        
+        # Gün dönümü (çalınan zillerin sıfırlanması için)
+        hedef = datetime.combine(simdi.date() + timedelta(days=1), datetime.min.time())
+        sonraki = self.cizelge.sonraki_olay(simdi)
+        if sonraki is not None:
+            zaman = sonraki[0]
+            # Henüz hazırlanmadıysa önce hazırlık anına kurulur, sonra zilin kendisine
+            if self.on_hazirlik and zaman != self._hazirlanan and zaman - self.on_hazirlik > simdi:
+                zaman -= self.on_hazirlik
+            hedef = min(hedef, zaman)
+        
+        bekleme_ms = int((hedef - simdi).total_seconds() * 1000) + HIZALAMA_PAYI_MS
+        # Erken uyanılırsa _check_schedule hiçbir şey çalmadan kalan süreye yeniden kurar
+        self._planlanan_bekleme_ms = max(0, min(bekleme_ms, MAKS_BEKLEME_MS))
+        self._kurulum_mono = time.monotonic()
+        self.timer.start(self._planlanan_bekleme_ms)
+    
     def _check_schedule(self):
         """Zaman çizelgesini kontrol et"""
         simdi = datetime.now()
-        gun_adi = self._get_day_name(simdi.weekday())
-        simdiki_saat = simdi.time()
+        simdi_mono = time.monotonic()
+        kuyruk: List[Tuple[int, int, int, datetime, ZilOlayi]] = []
         
-        # Gün değiştiyse çalınan zilleri temizle
+        # Son kontrolden bu yana saat atladıysa veya bilgisayar uyuduysa aradaki zilleri işle
+        if self._son_kontrol_duvar is not None:
+            if self._son_kontrol_mono is not None:
+                self._check_time_jump(simdi, simdi_mono)
+            for zaman, olay in self._handle_missed(self._son_kontrol_duvar.replace(second=0, microsecond=0), simdi):
+                self._kuyruga_ekle(kuyruk, zaman, olay)
+        self._son_kontrol_duvar = simdi
+        self._son_kontrol_mono = simdi_mono
+        
+        # Gün değiştiyse önceki günlerin çalınan zillerini temizle
         if self._son_kontrol_tarihi is None or self._son_kontrol_tarihi.date() != simdi.date():
-            self._bugun_calan_ziller.clear()
+            self._calinan_olaylar = {k for k in self._calinan_olaylar if k[0] == simdi.date()}
             self._son_kontrol_tarihi = simdi
+            self.gunluk.sikistir(simdi.date())
         
-        # Bugünün derslerini kontrol et
-        if gun_adi not in self.schedule_data.get("days", {}):
-            return
+        # Bu dakikada çalması gereken tüm ziller (derlenmiş çizelgeden)
+        dakika_basi = simdi.replace(second=0, microsecond=0)
+        for olay in self.cizelge.tarih(simdi.date()).dakikadaki_olaylar(simdi.hour * 60 + simdi.minute):
+            if (simdi.date(), olay.kimlik) not in self._calinan_olaylar:
+                self._kuyruga_ekle(kuyruk, dakika_basi, olay)
         
-        gun_ayarlari = self.schedule_data["days"][gun_adi]
+        if kuyruk:
+            self._dispatch(kuyruk, simdi, simdi_mono)
         
-        if not gun_ayarlari.get("active", False):
+        self._check_preroll(simdi)
+        if self._calisiyor:
+            self._arm_timer()
+    
+    def _check_preroll(self, simdi: datetime):
+        """Sıradaki zil hazırlık süresi içindeyse bir kez zil_yaklasiyor gönder"""
+        if not self.on_hazirlik:
+            return
+        sonraki = self.cizelge.sonraki_olay(simdi)
+        if sonraki is None:
             return
+        zaman, olay = sonraki
+        if zaman != self._hazirlanan and zaman - simdi <= self.on_hazirlik:
+            self._hazirlanan = zaman
+            # Aynı dakikada birden çok zil varsa kuyrukta başa geçecek olan hazırlanır
+            olay = max(self.cizelge.tarih(zaman.date()).dakikadaki_olaylar(olay.dakika), key=lambda o: o.oncelik)
+            self.zil_yaklasiyor.emit(olay.tip, olay.ses)
+    
+    def _kuyruga_ekle(self, kuyruk: list, zaman: datetime, olay: ZilOlayi):
+        """Olayı öncelik kuyruğuna ekle: en yeni dakika, sonra en yüksek öncelik başa gelir"""
+        heapq.heappush(kuyruk, (-int(zaman.timestamp() // 60), -olay.oncelik, len(kuyruk), zaman, olay))
+    
+    def _dispatch(self, kuyruk: list, simdi: datetime, simdi_mono: float):
+        """Kuyruktaki zilleri tek bir çalma olarak gönder
         
-        # Sabahçı-öğlenci sistemi kontrolü
-        lessons_to_check = []
+        Aynı tick'te biriken ziller ayrı ayrı gönderilirse her biri bir öncekini keser.
+        Bu yüzden kuyruğun başındaki zil (en yeni, en yüksek öncelikli) kendi sesi ve anonsuyla
+        gönderilir; işlenen tüm ziller sırasıyla gonderilen listesinde kalır, diğer zillerin
+        farklı sesleri ve anonsları ana pencerede aynı oturuma eklenir. Her olay tam bir kez
+        işlenmiş olarak işaretlenir; sonucu (çalındı, engellendi, hata) günlüğe çalmayı yapan
+        taraf yazar. Zamanında çalan zilin gecikmesi zamanlayıcının uyandığı andan (simdi)
+        itibaren ölçülür.
+        """
+        _, _, _, bas_zaman, bas_olay = heapq.heappop(kuyruk)
+        islenenler = [(bas_zaman, bas_olay)]
+        self._calinan_olaylar.add((bas_zaman.date(), bas_olay.kimlik))
+        while kuyruk:
+            _, _, _, zaman, olay = heapq.heappop(kuyruk)
+            islenenler.append((zaman, olay))
+            self._calinan_olaylar.add((zaman.date(), olay.kimlik))
         
-        # Eğer sabahci ve oglenci alanları varsa, shift sistemi aktif
-        if "sabahci" in gun_ayarlari and "oglenci" in gun_ayarlari:
-            # Saate göre aktif shift'i belirle (varsayılan: 12:00'den önce sabahçı)
-            shift_ayirma_saati = gun_ayarlari.get("shift_ayirma_saati", "12:00")
-            try:
-                ayirma_saat, ayirma_dakika = map(int, shift_ayirma_saati.split(":"))
-                ayirma_zamani = time(ayirma_saat, ayirma_dakika)
-                
-                if simdiki_saat < ayirma_zamani:
-                    # Sabahçı shift'i aktif
-                    if gun_ayarlari["sabahci"].get("active", False):
-                        lessons_to_check = gun_ayarlari["sabahci"].get("lessons", [])
-                else:
-                    # Öğlenci shift'i aktif
-                    if gun_ayarlari["oglenci"].get("active", False):
-                        lessons_to_check = gun_ayarlari["oglenci"].get("lessons", [])
-            except:
-                # Hata durumunda normal lessons kullan
-                lessons_to_check = gun_ayarlari.get("lessons", [])
-        else:
-            # Normal mod - lessons kullan
-            lessons_to_check = gun_ayarlari.get("lessons", [])
+        # Baş zille aynı sesi paylaşan ziller tek ses olarak çalar
+        aciklamalar = []
+        for _, olay in islenenler:
+            if olay.ses == bas_olay.ses and olay.aciklama not in aciklamalar:
+                aciklamalar.append(olay.aciklama)
+        aciklama = " + ".join(aciklamalar)
+        # Kaçırılıp geç çalınan ziller gecikme ölçümüne katılmaz
+        if bas_zaman == simdi.replace(second=0, microsecond=0):
+            self.olcumler.basla(bas_zaman, aciklama, simdi, simdi_mono)
+            self.olcumler.isaretle(ASAMA_YAYIN)
+        self.gonderilen = islenenler
+        self.zil_calindi.emit(bas_olay.tip, aciklama, bas_olay.ses, bas_olay.anons)
+    
+    def sonuc_kaydet(self, zaman: datetime, olay: ZilOlayi, sonuc: str):
+        """Gönderilen bir zilin gerçek sonucunu günlüğe yaz (yeniden başlatmada tekrar çalmaz)"""
+        self.gunluk.ekle(zaman.date(), olay, sonuc)
+    
+    def _check_time_jump(self, simdi: datetime, simdi_mono: float):
+        """Duvar saatini monotonik saatle karşılaştırarak saat ayarı ve duraklamaları algıla"""
+        gecen_mono = simdi_mono - self._son_kontrol_mono
+        sapma = (simdi - self._son_kontrol_duvar).total_seconds() - gecen_mono
+        if sapma > SICRAMA_ESIGI_SN:
+            self.zaman_atlamasi.emit("saat_ileri", sapma)
+        elif sapma < -SICRAMA_ESIGI_SN:
+            self.zaman_atlamasi.emit("saat_geri", -sapma)
         
-        # Her ders için kontrol et
-        for ders in lessons_to_check:
-            # Öğrenci giriş
-            if "ogrenci_giris" in ders:
-                zil_anahtari = f"{simdi.date()}_{ders['lesson']}_ogrenci_giris"
-                if self._zaman_eslesiyor_mu(simdiki_saat, ders["ogrenci_giris"]) and zil_anahtari not in self._bugun_calan_ziller:
-                    self._bugun_calan_ziller.add(zil_anahtari)
-                    # Öncelik sırası: Ayarlardan seçilen ses > Ders özel sesi > Ders genel sesi > Varsayılan
-                    settings_sound = self._get_default_sound("ogrenci")
-                    if settings_sound and settings_sound.strip():
-                        ses_dosyasi = settings_sound
-                    elif ders.get("ogrenci_sound"):
-                        ses_dosyasi = ders.get("ogrenci_sound")
-                    elif ders.get("sound"):
-                        ses_dosyasi = ders.get("sound")
-                    else:
-                        ses_dosyasi = "ziller/zil1.mp3"
-                    anons_dosyasi = ders.get("ogrenci_anons", "")
-                    self.zil_calindi.emit("ogrenci_giris", f"{ders['lesson']}. Ders Öğrenci Giriş", ses_dosyasi, anons_dosyasi)
-                    return
-            
-            # Öğretmen giriş
-            if "ogretmen_giris" in ders:
-                zil_anahtari = f"{simdi.date()}_{ders['lesson']}_ogretmen_giris"
-                if self._zaman_eslesiyor_mu(simdiki_saat, ders["ogretmen_giris"]) and zil_anahtari not in self._bugun_calan_ziller:
-                    self._bugun_calan_ziller.add(zil_anahtari)
-                    # Öncelik sırası: Ayarlardan seçilen ses > Ders özel sesi > Ders genel sesi > Varsayılan
-                    settings_sound = self._get_default_sound("ogretmen")
-                    if settings_sound and settings_sound.strip():
-                        ses_dosyasi = settings_sound
-                    elif ders.get("ogretmen_sound"):
-                        ses_dosyasi = ders.get("ogretmen_sound")
-                    elif ders.get("sound"):
-                        ses_dosyasi = ders.get("sound")
-                    else:
-                        ses_dosyasi = "ziller/zil1.mp3"
-                    anons_dosyasi = ders.get("ogretmen_anons", "")
-                    self.zil_calindi.emit("ogretmen_giris", f"{ders['lesson']}. Ders Öğretmen Giriş", ses_dosyasi, anons_dosyasi)
-                    return
-            
-            # Ders çıkış
-            if "ders_cikis" in ders:
-                zil_anahtari = f"{simdi.date()}_{ders['lesson']}_ders_cikis"
-                if self._zaman_eslesiyor_mu(simdiki_saat, ders["ders_cikis"]) and zil_anahtari not in self._bugun_calan_ziller:
-                    self._bugun_calan_ziller.add(zil_anahtari)
-                    # Öncelik sırası: Ayarlardan seçilen ses > Ders özel sesi > Ders genel sesi > Varsayılan
-                    settings_sound = self._get_default_sound("cikis")
-                    if settings_sound and settings_sound.strip():
-                        ses_dosyasi = settings_sound
-                    elif ders.get("cikis_sound"):
-                        ses_dosyasi = ders.get("cikis_sound")
-                    elif ders.get("sound"):
-                        ses_dosyasi = ders.get("sound")
-                    else:
-                        ses_dosyasi = "ziller/zil1.mp3"
-                    anons_dosyasi = ders.get("cikis_anons", "")
-                    self.zil_calindi.emit("ders_cikis", f"{ders['lesson']}. Ders Çıkış", ses_dosyasi, anons_dosyasi)
-                    return
+        # Zamanlayıcı planlanandan çok geç uyandıysa (uyku/askıya alma, donma)
+        gecikme = simdi_mono - (self._kurulum_mono + self._planlanan_bekleme_ms / 1000.0)
+        if gecikme > SICRAMA_ESIGI_SN:
+            self.zaman_atlamasi.emit("duraklama", gecikme)
     
-    def _zaman_eslesiyor_mu(self, simdiki_saat: time, hedef_saat_str: str) -> bool:
-        """Şu anki saat hedef saatle eşleşiyor mu? (saniye hassasiyeti yok)"""
-        try:
-            saat, dakika = map(int, hedef_saat_str.split(":"))
-            hedef_saat = time(saat, dakika)
-            
-            # Aynı saat ve dakikada mıyız?
-            return simdiki_saat.hour == hedef_saat.hour and simdiki_saat.minute == hedef_saat.minute
-        except:
-            return False
+    def _handle_missed(self, bas: datetime, simdi: datetime) -> List[Tuple[datetime, ZilOlayi]]:
+        """[bas, şu anki dakika) aralığında çalınmamış zillere politikayı uygula
+        
+        Returns:
+            Geç de olsa çalınacak ziller (en fazla bir tane)
+        """
+        bit = simdi.replace(second=0, microsecond=0)
+        if bit <= bas:
+            return []  # Saat geri alındıysa ziller zaten yeniden gelecek
+        bas = max(bas, bit - MAKS_GERI_BAKIS)
+        
+        kacirilanlar = [
+            (zaman, olay) for zaman, olay in self.cizelge.aradaki_olaylar(bas, bit)
+            if (zaman.date(), olay.kimlik) not in self._calinan_olaylar
+        ]
+        if not kacirilanlar:
+            return []
+        
+        # Tolerans içindeki en son zil çalınır; eski zilleri art arda çalmanın anlamı yok
+        calinacak = None
+        if self.kacirilan_politikasi == KACIRILAN_CAL:
+            zaman, olay = kacirilanlar[-1]
+            if simdi - zaman <= self.kacirilan_toleransi:
+                calinacak = (zaman, olay)
+        
+        for zaman, olay in kacirilanlar:
+            if (zaman, olay) == calinacak:
+                self.zil_kacirildi.emit(olay.saat_str, olay.aciklama, "gec_calindi")
+                continue
+            self._calinan_olaylar.add((zaman.date(), olay.kimlik))
+            self.gunluk.ekle(zaman.date(), olay, SONUC_KACIRILDI)
+            self.olay_kacirildi.emit(zaman, olay)
+            if self.kacirilan_politikasi != KACIRILAN_ATLA:
+                self.zil_kacirildi.emit(olay.saat_str, olay.aciklama, "kacirildi")
+        
+        return [calinacak] if calinacak is not None else []
     
     def _get_day_name(self, weekday: int) -> str:
         """Haftanın günü adını döndür (0=Pazartesi)"""
-        gunler = ["Pazartesi", "Salı", "Çarşamba", "Perşembe", "Cuma", "Cumartesi", "Pazar"]
-        return gunler[weekday]
-    
-    def _get_default_sound(self, tip: str) -> str:
-        """Settings'ten varsayılan zil sesini al (boş string döndürebilir)"""
-        try:
-            base_dir = Path(__file__).parent.parent
-            settings_file = base_dir / "data" / "settings.json"
-            if settings_file.exists():
-                import json
-                with open(settings_file, 'r', encoding='utf-8') as f:
-                    settings = json.load(f)
-                    sounds = settings.get("sounds", {})
-                    sound = sounds.get(tip, "")
-                    # Eğer ses varsa ve boş değilse döndür
-                    if sound and sound.strip():
-                        return sound
-        except:
-            pass
-        return ""  # Boş string döndür, böylece ders seslerine bakılabilir
+        return GUN_ADLARI[weekday]
     
     def get_next_zil(self) -> Optional[Dict]:
         """Bir sonraki zil saatini döndür"""
-        simdi = datetime.now()
-        gun_adi = self._get_day_name(simdi.weekday())
-        
-        if gun_adi not in self.schedule_data.get("days", {}):
-            return None
-        
-        gun_ayarlari = self.schedule_data["days"][gun_adi]
-        
-        if not gun_ayarlari.get("active", False):
+        sonraki = self.cizelge.sonraki_olay(datetime.now())
+        if sonraki is None:
             return None
         
-        # Sabahçı-öğlenci sistemi kontrolü
-        lessons_to_check = []
-        
-        # Eğer sabahci ve oglenci alanları varsa, shift sistemi aktif
-        if "sabahci" in gun_ayarlari and "oglenci" in gun_ayarlari:
-            # Saate göre aktif shift'i belirle
-            shift_ayirma_saati = gun_ayarlari.get("shift_ayirma_saati", "12:00")
-            try:
-                ayirma_saat, ayirma_dakika = map(int, shift_ayirma_saati.split(":"))
-                ayirma_zamani = time(ayirma_saat, ayirma_dakika)
-                
-                if simdi.time() < ayirma_zamani:
-                    # Sabahçı shift'i aktif
-                    if gun_ayarlari["sabahci"].get("active", False):
-                        lessons_to_check = gun_ayarlari["sabahci"].get("lessons", [])
-                else:
-                    # Öğlenci shift'i aktif
-                    if gun_ayarlari["oglenci"].get("active", False):
-                        lessons_to_check = gun_ayarlari["oglenci"].get("lessons", [])
-                
-                # Gelecek ziller için her iki shift'i de kontrol et
-                sabahci_lessons = gun_ayarlari["sabahci"].get("lessons", []) if gun_ayarlari["sabahci"].get("active", False) else []
-                oglenci_lessons = gun_ayarlari["oglenci"].get("lessons", []) if gun_ayarlari["oglenci"].get("active", False) else []
-                all_lessons = sabahci_lessons + oglenci_lessons
-            except:
-                all_lessons = gun_ayarlari.get("lessons", [])
-        else:
-            # Normal mod
-            all_lessons = gun_ayarlari.get("lessons", [])
-        
-        en_yakin_zil = None
-        en_yakin_fark = None
-        
-        for ders in all_lessons:
-            for zil_tipi in ["ogrenci_giris", "ogretmen_giris", "ders_cikis"]:
-                if zil_tipi in ders:
-                    saat_str = ders[zil_tipi]
-                    saat, dakika = map(int, saat_str.split(":"))
-                    zil_zamani = datetime.combine(simdi.date(), time(saat, dakika))
-                    
-                    # Geçmiş zamansa yarın olarak hesapla
-                    if zil_zamani < simdi:
-                        zil_zamani = datetime.combine(
-                            (simdi.date() + timedelta(days=1)),
-                            time(saat, dakika)
-                        )
-                    
-                    fark = (zil_zamani - simdi).total_seconds()
-                    
-                    if en_yakin_fark is None or fark < en_yakin_fark:
-                        en_yakin_fark = fark
-                        en_yakin_zil = {
-                            "time": zil_zamani,
-                            "type": zil_tipi,
-                            "lesson": ders.get("lesson", 0),
-                            "sound": ders.get("sound", "ziller/zil1.mp3")
-                        }
-        
-        return en_yakin_zil
-
+        zil_zamani, olay = sonraki
+        return {
+            "time": zil_zamani,
+            "type": olay.tip,
+            "lesson": olay.ders,
+            "sound": olay.ses
+        }
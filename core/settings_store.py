@@ -0,0 +1,146 @@
+"""
+Ayar deposu - settings.json'u bir kez okuyup bellekte tutar, değişiklikleri bildirir
+"""
+import copy
+from pathlib import Path
+from typing import Any, Dict, Optional
+from PySide6.QtCore import QObject, Signal, QFileSystemWatcher
+
+from core.persistence import read_json, writer_for
+
+
+class SettingsStore(QObject):
+    """Tüm modüllerin paylaştığı bellek içi ayar deposu"""
+    
+    degisti = Signal()  # Ayarlar (dosyadan veya kaydetme ile) değiştiğinde
+    
+    _ornekler: Dict[Path, "SettingsStore"] = {}
+    
+    @classmethod
+    def instance(cls, settings_file: str = "data/settings.json") -> "SettingsStore":
+        """Dosya başına tek depo döndür"""
+        base_dir = Path(__file__).parent.parent
+        yol = (base_dir / settings_file).resolve()
+        if yol not in cls._ornekler:
+            cls._ornekler[yol] = cls(yol)
+        return cls._ornekler[yol]
+    
+    def __init__(self, settings_file: Path):
+        super().__init__()
+        self.settings_file = Path(settings_file)
+        self._data: Dict = {}
+        self._mtime_ns: Optional[int] = None
+        
+        # Kayıtlar toplanıp arka planda atomik olarak yazılır
+        self._writer = writer_for(self.settings_file)
+        self._writer.yazildi.connect(self._on_written)
+        
+        # Dosya dışarıdan değişirse (elle düzenleme, başka kopya) önbelleği geçersiz kıl
+        self._watcher = QFileSystemWatcher()
+        self._watcher.fileChanged.connect(self._on_file_changed)
+        self._watcher.directoryChanged.connect(self._on_file_changed)
+        
+        self.load()
+    
+    def load(self):
+        """Ayarları diskten oku"""
+        try:
+            self._mtime_ns = self.settings_file.stat().st_mtime_ns if self.settings_file.exists() else None
+        except OSError:
+            self._mtime_ns = None
+        data = read_json(self.settings_file)
+        self._data = data if isinstance(data, dict) else {}
+        self._watch()
+    
+    def _watch(self):
+        """Dosyayı ve klasörünü izle (dosya silinip yeniden yazılınca izleme düşer)"""
+        for yol in (self.settings_file, self.settings_file.parent):
+            if yol.exists() and str(yol) not in self._watcher.files() + self._watcher.directories():
+                self._watcher.addPath(str(yol))
+    
+    def _on_file_changed(self, _path: str = ""):
+        """Dosya değiştiyse (mtime farklıysa) yeniden yükle"""
+        try:
+            mtime_ns = self.settings_file.stat().st_mtime_ns if self.settings_file.exists() else None
+        except OSError:
+            mtime_ns = None
+        # Kendi kaydımız henüz diske inmediyse dosyadaki eski içerik belleği ezmesin
+        if mtime_ns == self._mtime_ns or self._writer.bekliyor():
+            self._watch()
+            return
+        onceki = self._data
+        self.load()
+        if self._data != onceki:
+            self.degisti.emit()
+    
+    def _on_written(self, _path: str):
+        """Arka plan yazması bitti; kendi yazdığımız dosyayı dış değişiklik sanma"""
+        try:
+            self._mtime_ns = self.settings_file.stat().st_mtime_ns
+        except OSError:
+            pass
+        self._watch()
+    
+    def save(self, data: Dict):
+        """Ayarların tamamını kaydet ve değişikliği bildir
+        
+        Bellek hemen güncellenir; dosya kısa süre sonra arka planda atomik olarak yazılır.
+        """
+        self._data = copy.deepcopy(data)
+        if self._mtime_ns is None:
+            self._mtime_ns = 0  # Dosya yazılmak üzere, exists() True dönsün
+        self._writer.save(self._data)
+        self.degisti.emit()
+    
+    def flush(self):
+        """Bekleyen kaydı hemen diske yaz"""
+        self._writer.flush()
+    
+    def set_section(self, anahtar: str, deger: Any):
+        """Tek bir bölümü güncelleyip kaydet"""
+        data = self.to_dict()
+        data[anahtar] = deger
+        self.save(data)
+    
+    def exists(self) -> bool:
+        """Ayar dosyası var mı?"""
+        return self._mtime_ns is not None
+    
+    def to_dict(self) -> Dict:
+        """Düzenlenebilir kopya (dialoglar için)"""
+        return copy.deepcopy(self._data)
+    
+    def get(self, anahtar: str, varsayilan: Any = None) -> Any:
+        """Üst düzey bir ayarı döndür (kopyalanmaz, değiştirmeyin)"""
+        return self._data.get(anahtar, varsayilan)
+    
+    def _section(self, anahtar: str) -> Dict:
+        bolum = self._data.get(anahtar, {})
+        return bolum if isinstance(bolum, dict) else {}
+    
+    def sounds(self) -> Dict[str, str]:
+        """Zil tipi -> ses dosyası"""
+        return self._section("sounds")
+    
+    def sound(self, tip: str, varsayilan: str = "") -> str:
+        """Zil tipi için ayarlanmış ses dosyası"""
+        return self._section("sounds").get(tip, varsayilan)
+    
+    def volume(self, tip: str, varsayilan: int = 100) -> int:
+        """Zil tipi için ses seviyesi (0-100)"""
+        try:
+            return int(self._section("volumes").get(tip, varsayilan))
+        except (TypeError, ValueError):
+            return varsayilan
+    
+    def system(self, anahtar: str, varsayilan: Any = None) -> Any:
+        """Sistem ayarı (startup, tray)"""
+        return self._section("system").get(anahtar, varsayilan)
+    
+    def scheduler(self, anahtar: str, varsayilan: Any = None) -> Any:
+        """Zamanlayıcı ayarı"""
+        return self._section("scheduler").get(anahtar, varsayilan)
+    
+    def mode(self) -> str:
+        """Zil modu (normal / tatil / sinav)"""
+        return self._data.get("mode", "normal")
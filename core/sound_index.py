@@ -0,0 +1,125 @@
+"""
+Ses dosyası indeksi - Ayarlarda yazılabilen tüm yol biçimlerini diskteki dosyaya eşler
+"""
+import os
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+from PySide6.QtCore import QObject, QTimer, Signal, QFileSystemWatcher
+
+
+# Klasör değişikliklerinden sonra bu kadar sessizlik beklenip indeks yenilenir
+YENILEME_MS = 500
+
+_tarayici = ThreadPoolExecutor(max_workers=1, thread_name_prefix="ses-indeksi")
+
+
+def _anahtar(yol: str) -> str:
+    """Yol yazımını karşılaştırılabilir hale getir (ters bölü, ./, Windows'ta büyük-küçük harf)"""
+    yol = yol.strip().replace("\\", "/")
+    while yol.startswith("./"):
+        yol = yol[2:]
+    return yol.casefold() if os.name == "nt" else yol
+
+
+def _tara(sounds_dir: Path, base_dir: Path, ek_klasorler: List[Path]) -> Dict[str, Path]:
+    """Klasörleri tarayıp yazım -> gerçek dosya tablosunu oluştur (arka planda çalışabilir)"""
+    indeks: Dict[str, Path] = {}
+    # Önce gelen kök kazanır: sounds/, sonra ek klasörler (eski arama sırasıyla aynı)
+    for kok in [sounds_dir] + ek_klasorler:
+        if not kok.is_dir():
+            continue
+        for klasor, _, dosyalar in os.walk(kok):
+            for dosya in dosyalar:
+                yol = (Path(klasor) / dosya).resolve()
+                goreli = yol.relative_to(kok.resolve()).as_posix()
+                yazimlar = [goreli, yol.as_posix()]
+                if kok == sounds_dir:
+                    yazimlar.append("sounds/" + goreli)
+                try:
+                    yazimlar.append(yol.relative_to(base_dir.resolve()).as_posix())  # "sounds/ziller/zil1.mp3"
+                except ValueError:
+                    pass
+                for yazim in yazimlar:
+                    indeks.setdefault(_anahtar(yazim), yol)
+    return indeks
+
+
+class SesIndeksi(QObject):
+    """sounds/ klasörünün bellek içi indeksi
+    
+    Tüm kabul edilen yazımlar ("ziller/zil1.mp3", "sounds/ziller/zil1.mp3", ters bölülü,
+    mutlak) tek sözlük aramasıyla çözülür. Klasörler izlenir; dosya eklenip silindiğinde
+    indeks arka planda yeniden oluşturulur ve degisti sinyali gönderilir.
+    """
+    
+    degisti = Signal()  # İndeks yenilendiğinde (eksik dosya denetimi için)
+    _tarandi = Signal(object)  # Arka planda oluşturulan indeks (GUI thread'ine taşır)
+    
+    def __init__(self, sounds_dir: Path, base_dir: Path):
+        super().__init__()
+        self.sounds_dir = Path(sounds_dir)
+        self.base_dir = Path(base_dir)
+        self.ek_klasorler: List[Path] = []
+        # İlk zil çalmadan önce hazır olsun diye ilk tarama senkron yapılır
+        self._indeks: Dict[str, Path] = _tara(self.sounds_dir, self.base_dir, self.ek_klasorler)
+        
+        self._watcher = QFileSystemWatcher()
+        self._watcher.directoryChanged.connect(self._on_directory_changed)
+        self._timer = QTimer()
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(YENILEME_MS)
+        self._timer.timeout.connect(self.yenile)
+        self._tarandi.connect(self._on_tarandi)
+        self._watch()
+    
+    def coz(self, dosya_adi: str) -> Optional[Path]:
+        """Yazımı gerçek dosya yoluna çevir (bulunamazsa None)"""
+        if not dosya_adi:
+            return None
+        yol = self._indeks.get(_anahtar(dosya_adi))
+        if yol is not None:
+            return yol
+        # İndekslenen klasörlerin dışındaki dosyalar (elle seçilmiş mutlak yol veya uygulama klasörü)
+        yol = Path(dosya_adi.replace("\\", "/"))
+        if not yol.is_absolute():
+            yol = self.base_dir / yol
+        return yol.resolve() if yol.is_file() else None
+    
+    def eksikler(self, dosya_adlari: Iterable[str]) -> List[str]:
+        """Diskte bulunamayan ses dosyaları (boş olanlar atlanır)"""
+        return [ad for ad in dict.fromkeys(dosya_adlari) if ad and self.coz(ad) is None]
+    
+    def klasorleri_ayarla(self, klasorler: Iterable[str]):
+        """sounds/ dışında taranacak ek klasörleri ayarla"""
+        yeni = [Path(k) if Path(k).is_absolute() else self.base_dir / k for k in klasorler if k]
+        if yeni != self.ek_klasorler:
+            self.ek_klasorler = yeni
+            self.yenile()
+    
+    def yenile(self):
+        """İndeksi arka planda yeniden oluştur"""
+        gelecek: Future = _tarayici.submit(_tara, self.sounds_dir, self.base_dir, list(self.ek_klasorler))
+        gelecek.add_done_callback(
+            lambda g: self._tarandi.emit(None if g.exception() else g.result())
+        )
+    
+    def _on_tarandi(self, indeks):
+        if indeks is None:
+            return
+        self._indeks = indeks
+        self._watch()
+        self.degisti.emit()
+    
+    def _on_directory_changed(self, _path: str):
+        self._timer.start()
+    
+    def _watch(self):
+        """Tüm alt klasörleri izle (QFileSystemWatcher alt klasörlere inmez)"""
+        izlenenler = set(self._watcher.directories())
+        for kok in [self.sounds_dir] + self.ek_klasorler:
+            if not kok.is_dir():
+                continue
+            for klasor, _, _ in os.walk(kok):
+                if klasor not in izlenenler:
+                    self._watcher.addPath(klasor)
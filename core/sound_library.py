@@ -0,0 +1,384 @@
+"""
+Ses kütüphanesi - sounds/ altındaki dosyaların süre, biçim ve seviye bilgilerini arka planda çıkarır
+"""
+import hashlib
+import json
+import math
+import os
+import shutil
+import struct
+import subprocess
+import sys
+import wave
+from array import array
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Tuple
+from PySide6.QtCore import QObject, Signal
+
+from core.persistence import atomic_write_text
+
+try:
+    import numpy as np
+except ImportError:  # Seviye hesabı saf Python ile yapılır
+    np = None
+
+
+INDEKS_SURUMU = 1
+SES_UZANTILARI = {".mp3", ".wav", ".ogg", ".m4a", ".aac", ".flac", ".wma"}
+# Seviye ölçümü için çözülen sesin örnekleme hızı (tepe/RMS için yeterli)
+OLCUM_HIZI = 16000
+
+_ffprobe = shutil.which("ffprobe")
+_ffmpeg = shutil.which("ffmpeg")
+# Windows'ta ffprobe/ffmpeg için konsol penceresi açılmasın
+_SUBPROCESS_BAYRAKLARI = getattr(subprocess, "CREATE_NO_WINDOW", 0)
+
+# Tarama koordinatörü (tek iş parçacığı) ve dosya başına işçiler
+_koordinator = ThreadPoolExecutor(max_workers=1, thread_name_prefix="ses-kutuphanesi")
+_isci_sayisi = min(4, os.cpu_count() or 1)
+
+
+class SesBilgisi(NamedTuple):
+    """Bir ses dosyasının indekslenmiş bilgileri"""
+    yol: str  # sounds/ klasörüne göre (örn: "ziller/zil1.mp3")
+    boyut: int
+    mtime_ns: int
+    ozet: str  # İçerik özeti (aynı dosyanın kopyalarını bulmak için)
+    sure_sn: Optional[float] = None
+    bicim: str = ""  # mp3, wav, ...
+    codec: str = ""
+    ornekleme_hizi: Optional[int] = None
+    kanal: Optional[int] = None
+    tepe_db: Optional[float] = None
+    rms_db: Optional[float] = None
+    hata: str = ""  # Çözülemiyorsa nedeni
+    
+    @property
+    def cozulebilir(self) -> bool:
+        return not self.hata
+    
+    def aciklama(self) -> str:
+        """Tek satırlık özet (ipucu metinleri için)"""
+        if self.hata:
+            return f"Çözülemiyor: {self.hata}"
+        parcalar = []
+        if self.sure_sn is not None:
+            parcalar.append(f"{int(self.sure_sn // 60)}:{int(self.sure_sn % 60):02d}")
+        parcalar.append((self.codec or self.bicim).upper())
+        if self.ornekleme_hizi:
+            parcalar.append(f"{self.ornekleme_hizi} Hz")
+        if self.kanal:
+            parcalar.append("mono" if self.kanal == 1 else f"{self.kanal} kanal")
+        if self.tepe_db is not None:
+            parcalar.append(f"tepe {self.tepe_db:.1f} dB")
+        if self.rms_db is not None:
+            parcalar.append(f"RMS {self.rms_db:.1f} dB")
+        return " · ".join(parcalar)
+
+
+def icerik_ozeti(path: Path) -> str:
+    """Dosya içeriğinin kısa özeti (blake2b, 128 bit)"""
+    h = hashlib.blake2b(digest_size=16)
+    with open(path, 'rb') as f:
+        for parca in iter(lambda: f.read(1 << 20), b""):
+            h.update(parca)
+    return h.hexdigest()
+
+
+def _db(deger: float) -> Optional[float]:
+    return round(20 * math.log10(deger), 2) if deger > 0 else None
+
+
+def _seviyeler(pcm: bytes) -> Tuple[Optional[float], Optional[float]]:
+    """16 bit PCM'in tepe ve RMS seviyesi (dBFS)"""
+    if len(pcm) < 2:
+        return None, None
+    pcm = pcm[:len(pcm) - len(pcm) % 2]
+    if np is not None:
+        ornekler = np.frombuffer(pcm, dtype="<i2").astype(np.float64) / 32768.0
+        return _db(float(np.max(np.abs(ornekler)))), _db(float(np.sqrt(np.mean(ornekler * ornekler))))
+    ornekler = array("h")
+    ornekler.frombytes(pcm)
+    if sys.byteorder != "little":
+        ornekler.byteswap()
+    tepe = max(abs(o) for o in ornekler) / 32768.0
+    rms = math.sqrt(sum(o * o for o in ornekler) / len(ornekler)) / 32768.0
+    return _db(tepe), _db(rms)
+
+
+def _ffprobe_bilgisi(path: Path) -> Dict:
+    sonuc = subprocess.run(
+        [_ffprobe, "-v", "error", "-select_streams", "a:0",
+         "-show_entries", "format=duration,format_name:stream=codec_name,sample_rate,channels",
+         "-of", "json", str(path)],
+        capture_output=True, timeout=30, creationflags=_SUBPROCESS_BAYRAKLARI
+    )
+    if sonuc.returncode != 0:
+        raise ValueError(sonuc.stderr.decode("utf-8", "replace").strip() or "ffprobe hatası")
+    veri = json.loads(sonuc.stdout or b"{}")
+    akislar = veri.get("streams") or []
+    if not akislar:
+        raise ValueError("Ses akışı yok")
+    akis, bicim = akislar[0], veri.get("format", {})
+    return {
+        "sure_sn": float(bicim["duration"]) if bicim.get("duration") else None,
+        "codec": akis.get("codec_name", ""),
+        "ornekleme_hizi": int(akis["sample_rate"]) if akis.get("sample_rate") else None,
+        "kanal": akis.get("channels"),
+    }
+
+
+def _ffmpeg_pcm(path: Path) -> bytes:
+    """Dosyayı ölçüm için mono 16 bit PCM'e çöz"""
+    sonuc = subprocess.run(
+        [_ffmpeg, "-v", "error", "-i", str(path), "-ac", "1", "-ar", str(OLCUM_HIZI),
+         "-f", "s16le", "-"],
+        capture_output=True, timeout=120, creationflags=_SUBPROCESS_BAYRAKLARI
+    )
+    if sonuc.returncode != 0:
+        raise ValueError(sonuc.stderr.decode("utf-8", "replace").strip() or "ffmpeg hatası")
+    return sonuc.stdout
+
+
+def _wav_bilgisi(path: Path) -> Tuple[Dict, Optional[bytes]]:
+    with wave.open(str(path), 'rb') as w:
+        hiz, kanal, genislik, kare = w.getframerate(), w.getnchannels(), w.getsampwidth(), w.getnframes()
+        # Çok kanallı dosyalarda tepe/RMS tüm kanalların örnekleri üzerinden hesaplanır
+        pcm = w.readframes(kare) if genislik == 2 else None
+    return {
+        "sure_sn": kare / hiz if hiz else None,
+        "codec": f"pcm_s{genislik * 8}le",
+        "ornekleme_hizi": hiz,
+        "kanal": kanal,
+    }, pcm
+
+
+_MP3_BIT_HIZLARI = {
+    1: [0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320],
+    2: [0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160],
+}
+_MP3_ORNEKLEME = {3: [44100, 48000, 32000], 2: [22050, 24000, 16000], 0: [11025, 12000, 8000]}
+
+
+def _mp3_bilgisi(path: Path) -> Dict:
+    """MPEG Layer III çerçeve başlığından süre/örnekleme hızı (ffprobe yoksa)"""
+    boyut = path.stat().st_size
+    with open(path, 'rb') as f:
+        bas = f.read(10)
+        baslangic = 0
+        if bas[:3] == b"ID3" and len(bas) == 10:
+            # ID3v2 etiketi (syncsafe boyut)
+            baslangic = 10 + ((bas[6] & 0x7F) << 21 | (bas[7] & 0x7F) << 14 | (bas[8] & 0x7F) << 7 | (bas[9] & 0x7F))
+        f.seek(baslangic)
+        veri = f.read(64 * 1024)
+    
+    for i in range(len(veri) - 4):
+        if veri[i] != 0xFF or (veri[i + 1] & 0xE0) != 0xE0:
+            continue
+        surum = (veri[i + 1] >> 3) & 0x03  # 3: MPEG1, 2: MPEG2, 0: MPEG2.5
+        katman = (veri[i + 1] >> 1) & 0x03  # 1: Layer III
+        bit_indeksi = veri[i + 2] >> 4
+        hiz_indeksi = (veri[i + 2] >> 2) & 0x03
+        if surum == 1 or katman != 1 or bit_indeksi in (0, 15) or hiz_indeksi == 3:
+            continue
+        bit_hizi = _MP3_BIT_HIZLARI[1 if surum == 3 else 2][bit_indeksi] * 1000
+        ornekleme = _MP3_ORNEKLEME[surum][hiz_indeksi]
+        kanal = 1 if (veri[i + 3] >> 6) == 3 else 2
+        kare_ornek = 1152 if surum == 3 else 576
+        
+        # VBR dosyalarda Xing/Info başlığı toplam çerçeve sayısını verir
+        xing = i + 4 + ((32 if kanal == 2 else 17) if surum == 3 else (17 if kanal == 2 else 9))
+        if veri[xing:xing + 4] in (b"Xing", b"Info") and len(veri) >= xing + 12:
+            bayraklar = struct.unpack(">I", veri[xing + 4:xing + 8])[0]
+            if bayraklar & 1:
+                kareler = struct.unpack(">I", veri[xing + 8:xing + 12])[0]
+                sure = kareler * kare_ornek / ornekleme
+                break
+        sure = (boyut - baslangic - i) * 8 / bit_hizi
+        break
+    else:
+        raise ValueError("MP3 çerçevesi bulunamadı")
+    return {"sure_sn": sure, "codec": "mp3", "ornekleme_hizi": ornekleme, "kanal": kanal}
+
+
+def dosya_bilgisi(path: Path, yol: str, boyut: int, mtime_ns: int) -> SesBilgisi:
+    """Tek bir dosyanın bilgilerini çıkar (işçi iş parçacığında çalışır)"""
+    bicim = path.suffix.lower().lstrip(".")
+    try:
+        ozet = icerik_ozeti(path)
+    except OSError as e:
+        return SesBilgisi(yol, boyut, mtime_ns, "", bicim=bicim, hata=str(e))
+    try:
+        pcm = None
+        if _ffprobe:
+            bilgi = _ffprobe_bilgisi(path)
+        elif bicim == "wav":
+            bilgi, pcm = _wav_bilgisi(path)
+        elif bicim == "mp3":
+            bilgi = _mp3_bilgisi(path)
+        else:
+            bilgi = {}  # ffprobe olmadan yalnızca uzantı bilinir
+        if pcm is None and _ffmpeg:
+            pcm = _ffmpeg_pcm(path)
+        tepe, rms = _seviyeler(pcm) if pcm else (None, None)
+        return SesBilgisi(yol, boyut, mtime_ns, ozet, bicim=bicim, tepe_db=tepe, rms_db=rms, **bilgi)
+    except Exception as e:
+        return SesBilgisi(yol, boyut, mtime_ns, ozet, bicim=bicim, hata=str(e) or type(e).__name__)
+
+
+class SesKutuphanesi(QObject):
+    """sounds/ klasörünün kalıcı bilgi indeksi
+    
+    Tarama arka planda yapılır; yalnızca yolu, boyutu veya değişiklik zamanı değişen
+    dosyalar yeniden incelenir. Sonuçlar data/ses_kutuphanesi.json'da saklanır.
+    """
+    
+    ilerleme = Signal(int, int)  # (incelenen, toplam)
+    guncellendi = Signal()  # İndeks (yüklendi veya tarandı) değiştiğinde
+    _hazir = Signal(object)  # Arka planda oluşan indeks (GUI thread'ine taşır)
+    
+    _ornekler: Dict[Path, "SesKutuphanesi"] = {}
+    
+    @classmethod
+    def instance(cls, sounds_dir: str = "sounds") -> "SesKutuphanesi":
+        """Klasör başına tek kütüphane döndür"""
+        base_dir = Path(__file__).parent.parent
+        yol = (base_dir / sounds_dir).resolve()
+        if yol not in cls._ornekler:
+            cls._ornekler[yol] = cls(yol, base_dir / "data" / "ses_kutuphanesi.json")
+        return cls._ornekler[yol]
+    
+    def __init__(self, sounds_dir: Path, indeks_dosyasi: Path):
+        super().__init__()
+        self.sounds_dir = Path(sounds_dir)
+        self.indeks_dosyasi = Path(indeks_dosyasi)
+        self._bilgiler: Dict[str, SesBilgisi] = {}
+        self._taraniyor = False
+        self._yeniden_tara = False
+        self._hazir.connect(self._on_hazir)
+    
+    def tara(self):
+        """Klasörü arka planda (yeniden) tara; açılışı bekletmez"""
+        if self._taraniyor:
+            self._yeniden_tara = True
+            return
+        self._taraniyor = True
+        eski = dict(self._bilgiler)
+        _koordinator.submit(self._tara, eski).add_done_callback(
+            lambda g: self._hazir.emit(None if g.exception() else g.result())
+        )
+    
+    def _tara(self, eski: Dict[str, SesBilgisi]) -> Dict[str, SesBilgisi]:
+        """Arka planda: kayıtlı indeksi yükle, değişen dosyaları incele, kaydet"""
+        if not eski:
+            eski = self._indeksi_oku()
+        
+        dosyalar = []
+        for klasor, _, adlar in os.walk(self.sounds_dir):
+            for ad in adlar:
+                path = Path(klasor) / ad
+                if path.suffix.lower() not in SES_UZANTILARI:
+                    continue
+                try:
+                    st = path.stat()
+                except OSError:
+                    continue
+                dosyalar.append((path, path.relative_to(self.sounds_dir).as_posix(), st.st_size, st.st_mtime_ns))
+        
+        yeni: Dict[str, SesBilgisi] = {}
+        incelenecek = []
+        for path, yol, boyut, mtime_ns in dosyalar:
+            onceki = eski.get(yol)
+            if onceki is not None and onceki.boyut == boyut and onceki.mtime_ns == mtime_ns:
+                yeni[yol] = onceki
+            else:
+                incelenecek.append((path, yol, boyut, mtime_ns))
+        
+        if incelenecek:
+            with ThreadPoolExecutor(max_workers=_isci_sayisi, thread_name_prefix="ses-inceleme") as havuz:
+                for no, bilgi in enumerate(havuz.map(lambda d: dosya_bilgisi(*d), incelenecek), 1):
+                    yeni[bilgi.yol] = bilgi
+                    self.ilerleme.emit(no, len(incelenecek))
+        
+        if incelenecek or set(yeni) != set(eski):
+            self._indeksi_yaz(yeni)
+        return yeni
+    
+    def _indeksi_oku(self) -> Dict[str, SesBilgisi]:
+        try:
+            with open(self.indeks_dosyasi, 'r', encoding='utf-8') as f:
+                veri = json.load(f)
+            if veri.get("surum") != INDEKS_SURUMU:
+                return {}
+            return {satir[0]: SesBilgisi(*satir) for satir in veri.get("dosyalar", [])}
+        except (OSError, ValueError, TypeError, AttributeError):
+            return {}
+    
+    def _indeksi_yaz(self, bilgiler: Dict[str, SesBilgisi]):
+        veri = {"surum": INDEKS_SURUMU, "dosyalar": [list(b) for b in bilgiler.values()]}
+        try:
+            atomic_write_text(self.indeks_dosyasi, json.dumps(veri, ensure_ascii=False, separators=(",", ":")),
+                              yedek_sayisi=0)
+        except OSError as e:
+            print(f"Ses kütüphanesi indeksi kaydedilemedi: {e}")
+    
+    def _on_hazir(self, bilgiler):
+        self._taraniyor = False
+        if bilgiler is not None:
+            self._bilgiler = bilgiler
+            self.guncellendi.emit()
+        if self._yeniden_tara:
+            self._yeniden_tara = False
+            self.tara()
+    
+    def _goreli(self, dosya_adi: str) -> str:
+        """Ayarlardaki yazımı indeks anahtarına çevir"""
+        yol = dosya_adi.strip().replace("\\", "/")
+        if Path(yol).is_absolute():
+            try:
+                return Path(yol).resolve().relative_to(self.sounds_dir).as_posix()
+            except ValueError:
+                return yol
+        while yol.startswith("./"):
+            yol = yol[2:]
+        return yol[7:] if yol.startswith("sounds/") else yol
+    
+    def bilgi(self, dosya_adi: str) -> Optional[SesBilgisi]:
+        """Dosyanın bilgileri (henüz taranmadıysa veya sounds/ dışındaysa None)"""
+        if not dosya_adi:
+            return None
+        return self._bilgiler.get(self._goreli(dosya_adi))
+    
+    def sorgula(self, klasor: str = "", metin: str = "", en_uzun_sn: Optional[float] = None,
+                sadece_cozulebilir: bool = True) -> List[SesBilgisi]:
+        """Koşullara uyan dosyalar (yola göre sıralı)
+        
+        Args:
+            klasor: sounds/ altındaki klasör (örn: "ziller"), boşsa tümü
+            metin: Dosya yolunda geçmesi gereken metin (büyük-küçük harf duyarsız)
+            en_uzun_sn: Bu süreden uzun dosyaları çıkar
+            sadece_cozulebilir: Çözülemeyen dosyaları çıkar
+        """
+        onek = klasor.strip("/") + "/" if klasor else ""
+        metin = metin.casefold()
+        sonuc = []
+        for bilgi in self._bilgiler.values():
+            if onek and not bilgi.yol.startswith(onek):
+                continue
+            if metin and metin not in bilgi.yol.casefold():
+                continue
+            if sadece_cozulebilir and not bilgi.cozulebilir:
+                continue
+            if en_uzun_sn is not None and (bilgi.sure_sn is None or bilgi.sure_sn > en_uzun_sn):
+                continue
+            sonuc.append(bilgi)
+        return sorted(sonuc, key=lambda b: b.yol)
+    
+    def kopyalar(self, dosya_adi: str) -> List[SesBilgisi]:
+        """Aynı içeriğe sahip diğer dosyalar"""
+        bilgi = self.bilgi(dosya_adi)
+        if bilgi is None or not bilgi.ozet:
+            return []
+        return sorted((b for b in self._bilgiler.values() if b.ozet == bilgi.ozet and b.yol != bilgi.yol),
+                      key=lambda b: b.yol)
@@ -2,16 +2,120 @@
 Ses oynatıcı - Thread-safe ses çalma/durdurma
 """
 import os
+import time
+from datetime import datetime
 from pathlib import Path
 from threading import Lock
-from PySide6.QtMultimedia import QMediaPlayer, QAudioOutput
-from PySide6.QtCore import QUrl, QObject, Signal
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+from PySide6.QtMultimedia import QMediaPlayer, QAudioOutput, QAudioSink, QMediaDevices, QAudio
+from PySide6.QtCore import QUrl, QObject, Signal, QBuffer, QByteArray, QIODevice, QTimer
+
+from core.audio_cache import SesOnbellegi
+from core.sound_index import SesIndeksi
+from core.loudness import VARSAYILAN_HEDEF_LUFS, YukseklikOnbellegi
+from core.metrics import ASAMA_CALMA, ASAMA_COZUM, ASAMA_KAYNAK, ZilOlcumleri
+from core.mixer import KarisimMotoru, ONCELIK_ACIL, ONCELIK_MUZIK, ONCELIK_ZIL
+from core.sound_library import SesKutuphanesi
+from core.transcode import DonusumOnbellegi
+
+
+# Elle çalma düğmelerinin sesleri için önceden açık tutulan en fazla oynatıcı
+HAVUZ_BOYUTU = 8
+
+
+class CalmaOgesi(NamedTuple):
+    """Sıralı çalınacak seslerden biri"""
+    dosya: str
+    ses_seviyesi: int = 100
+    bosluk_ms: int = 0  # Önceki ses bittikten sonra bu ses başlamadan beklenecek süre
+    aciklama: str = ""  # Ses başladığında kaydedilecek metin
+    oncelik: int = ONCELIK_ZIL  # Karıştırıcıda hangi seslerin kısılacağı
+
+
+# Oturum durumları
+OTURUM_CALIYOR = "caliyor"
+OTURUM_TAMAMLANDI = "tamamlandi"  # Son ses bitti (veya hiçbir ses bulunamadı)
+OTURUM_DURDURULDU = "durduruldu"  # stop() çağrıldı
+OTURUM_KESILDI = "kesildi"  # Yeni bir çalma başladı
+
+
+class CalmaOturumu:
+    """Bir cal_sirayla() çağrısı: hangi seslerin çaldığı ve nasıl bittiği
+    
+    Geri çağırmalar oturuma aittir ve SoundPlayer'ın sinyallerine bağlanmaz. Oturum
+    tamamlanınca, durdurulunca veya yeni bir sesle kesilince bitince geri çağırmaları
+    bir kez çağrılır ve tüm geri çağırmalar bırakılır.
+    """
+    
+    def __init__(self, ogeler: Iterable[CalmaOgesi],
+                 her_ogede: Optional[Callable[[CalmaOgesi], None]] = None,
+                 bitince: Optional[Callable[["CalmaOturumu"], None]] = None):
+        self.ogeler = tuple(ogeler)
+        self.calinanlar: List[CalmaOgesi] = []
+        self.atlananlar: List[str] = []  # Dosyası bulunamayanlar
+        self.durum = OTURUM_CALIYOR
+        self.baslangic = datetime.now()
+        self.bitis: Optional[datetime] = None
+        self._her_ogede = [her_ogede] if her_ogede else []
+        self._bitince = [bitince] if bitince else []
+    
+    @property
+    def bitti_mi(self) -> bool:
+        return self.durum != OTURUM_CALIYOR
+    
+    @property
+    def calindi(self) -> bool:
+        """En az bir ses çalmaya başladı mı?"""
+        return bool(self.calinanlar)
+    
+    @property
+    def calan(self) -> Optional[CalmaOgesi]:
+        """Şu anda çalan (veya arasında beklenen) ses"""
+        return self.calinanlar[-1] if self.calinanlar and not self.bitti_mi else None
+    
+    def her_ogede(self, geri_cagirma: Callable[[CalmaOgesi], None]):
+        """Her ses başladığında çağrılacak fonksiyonu ekle"""
+        if not self.bitti_mi:
+            self._her_ogede.append(geri_cagirma)
+    
+    def bitince(self, geri_cagirma: Callable[["CalmaOturumu"], None]):
+        """Oturum bitince çağrılacak fonksiyonu ekle (bittiyse hemen çağrılır)"""
+        if self.bitti_mi:
+            geri_cagirma(self)
+        else:
+            self._bitince.append(geri_cagirma)
+    
+    def geri_cagirma_sayisi(self) -> int:
+        """Bekleyen geri çağırma sayısı (bitmiş oturumda 0)"""
+        return len(self._her_ogede) + len(self._bitince)
+    
+    def _oge_basladi(self, oge: CalmaOgesi):
+        self.calinanlar.append(oge)
+        for geri_cagirma in list(self._her_ogede):
+            geri_cagirma(oge)
+    
+    def _bitir(self, durum: str):
+        if self.bitti_mi:
+            return
+        self.durum = durum
+        self.bitis = datetime.now()
+        bitince, self._bitince, self._her_ogede = self._bitince, [], []
+        for geri_cagirma in bitince:
+            geri_cagirma(self)
+    
+    def __repr__(self):
+        return (f"CalmaOturumu({self.durum}, {len(self.calinanlar)}/{len(self.ogeler)} çalındı, "
+                f"{len(self.atlananlar)} atlandı)")
 
 
 class SoundPlayer(QObject):
     """Thread-safe ses oynatıcı"""
     
-    finished = Signal()  # Ses çalma bittiğinde
+    finished = Signal()  # Ses (sıralı çalmada son ses) bittiğinde
+    basladi = Signal(float, bool)  # (play() çağrısından sesin başlamasına kadar geçen ms, önceden hazırlanmış mı)
+    oge_basladi = Signal(object)  # Sıradaki ses çalmaya başladı (CalmaOgesi)
+    oge_bulunamadi = Signal(str)  # Dosyası bulunamadığı için atlanan ses
+    karisim_bitti = Signal(int)  # karistir() ile başlatılan arka plan sesi bitti (kimlik)
     
     def __init__(self, sounds_dir: str = "sounds"):
         super().__init__()
@@ -19,22 +123,282 @@ class SoundPlayer(QObject):
         base_dir = Path(__file__).parent.parent
         self.sounds_dir = base_dir / sounds_dir
         self.lock = Lock()
-        self.player = QMediaPlayer()
-        self.audio_output = QAudioOutput()
-        self.player.setAudioOutput(self.audio_output)
-        # PySide6'da finished signal yok, playbackStateChanged kullanıyoruz
-        self.player.playbackStateChanged.connect(self._on_playback_state_changed)
+        # Yol yazımları her çalışta diske sorulmak yerine indeksten çözülür
+        self.indeks = SesIndeksi(self.sounds_dir, base_dir)
+        self.player, self.audio_output = self._yeni_oynatici()
+        # Zilden önce dosyası yüklenip ses cihazı açılmış yedek oynatıcı
+        self._hazir_player, self._hazir_output = self._yeni_oynatici()
+        self._hazir_yol: Optional[Path] = None
+        # Ayarlardaki sesler (manuel düğmeler) kendi oynatıcılarında yüklü bekler
+        self._havuz: Dict[Path, Tuple[QMediaPlayer, QAudioOutput]] = {}
+        self._havuz_adlari: List[str] = []
+        # Acil durum sesleri önbellekten hiç atılmaz
+        self._sabit_adlar: List[str] = []
         self._is_playing = False
+        self._baslatma_mono: Optional[float] = None
+        self._hazirdan = False
+        # Otomatik zillerde çözüm, kaynak yükleme ve çalma anları işaretlenir
+        self.olcumler = ZilOlcumleri.instance()
+        
+        # Önbellekte çözülmüş hali olan sesler doğrudan bellekten ses cihazına yazılır
+        self.onbellek = SesOnbellegi()
+        # WMA/M4A gibi yavaş açılan biçimler arka planda WAV'a çevrilip onun yerine çalınır
+        self.donusum = DonusumOnbellegi(base_dir / "data" / "cache" / "ses")
+        self.donusum.hazir.connect(self._on_donusturuldu)
+        
+        # Farklı kaynaklardan gelen seslerin yüksekliği eşitlenir (ayarlardan açılır)
+        self.yukseklik = YukseklikOnbellegi(SesKutuphanesi.instance(sounds_dir),
+                                            base_dir / "data" / "cache" / "yukseklik.json")
+        self.normalizasyon = False
+        self.hedef_lufs = VARSAYILAN_HEDEF_LUFS
+        self._carpan = 1.0
+        self._sink: Optional[QAudioSink] = None
+        self._sink_buffer: Optional[QBuffer] = None
+        
+        # numpy varsa bellekteki sesler tek karıştırıcıdan çalınır; zil arka plandaki sesleri kısar
+        self.mikser = KarisimMotoru(self.onbellek.bicim) if KarisimMotoru.kullanilabilir() else None
+        self._mikser_kimlik: Optional[int] = None
+        self._arka_plan: Set[int] = set()
+        if self.mikser is not None:
+            self.mikser.basladi.connect(self._on_mikser_basladi)
+            self.mikser.bitti.connect(self._on_mikser_bitti)
+        
+        # Sıralı çalma: çalan sesten sonra gelecekler
+        self._kuyruk: List[CalmaOgesi] = []
+        self._oturum: Optional[CalmaOturumu] = None
+        self._bosluk_timer = QTimer()
+        self._bosluk_timer.setSingleShot(True)
+        self._bosluk_timer.timeout.connect(self._sonrakini_cal)
     
-    def _on_playback_state_changed(self, state):
+    def _yeni_oynatici(self):
+        player = QMediaPlayer()
+        output = QAudioOutput()
+        player.setAudioOutput(output)
+        # PySide6'da finished signal yok, playbackStateChanged kullanıyoruz
+        player.playbackStateChanged.connect(lambda state, p=player: self._on_playback_state_changed(p, state))
+        return player, output
+    
+    def _on_playback_state_changed(self, player: QMediaPlayer, state):
         """Oynatma durumu değiştiğinde çağrılır"""
+        if player is self._hazir_player or self._havuzda(player):
+            # Isınma için sessiz başlatılan yedek oynatıcı cihaz açılınca başa sarılıp bekletilir
+            if state == QMediaPlayer.PlaybackState.PlayingState:
+                player.pause()
+                player.setPosition(0)
+            return
+        if player is not self.player:
+            return
+        if state == QMediaPlayer.PlaybackState.PlayingState and self._baslatma_mono is not None:
+            # Sesin gerçekten başladığı an (zil gecikmesi ölçümü)
+            gecikme_ms = (time.monotonic() - self._baslatma_mono) * 1000
+            self._baslatma_mono = None
+            self.olcumler.isaretle(ASAMA_CALMA)
+            self.basladi.emit(gecikme_ms, self._hazirdan)
         # QMediaPlayer.PlaybackState.StoppedState = 0
         if state == QMediaPlayer.PlaybackState.StoppedState:
-            if self._is_playing:
-                self._is_playing = False
-                # Kısa bir gecikme sonra finished sinyalini gönder (anons için)
-                from PySide6.QtCore import QTimer
-                QTimer.singleShot(100, self.finished.emit)
+            self._bitti()
+    
+    def _on_sink_state_changed(self, sink: QAudioSink, state):
+        """Bellekten çalma durumu değiştiğinde çağrılır"""
+        if sink is not self._sink:
+            return
+        if state == QAudio.State.ActiveState and self._baslatma_mono is not None:
+            gecikme_ms = (time.monotonic() - self._baslatma_mono) * 1000
+            self._baslatma_mono = None
+            self.olcumler.isaretle(ASAMA_CALMA)
+            self.basladi.emit(gecikme_ms, True)
+        elif state == QAudio.State.IdleState:
+            # Tampondaki veri bitti
+            sink.stop()
+        elif state == QAudio.State.StoppedState:
+            self._bitti()
+    
+    def _on_mikser_basladi(self, kimlik: int):
+        if kimlik == self._mikser_kimlik and self._baslatma_mono is not None:
+            gecikme_ms = (time.monotonic() - self._baslatma_mono) * 1000
+            self._baslatma_mono = None
+            self.olcumler.isaretle(ASAMA_CALMA)
+            self.basladi.emit(gecikme_ms, True)
+    
+    def _on_mikser_bitti(self, kimlik: int):
+        if kimlik in self._arka_plan:
+            self._arka_plan.discard(kimlik)
+            self.karisim_bitti.emit(kimlik)
+        elif kimlik == self._mikser_kimlik:
+            self._mikser_kimlik = None
+            self._bitti()
+    
+    def _bitti(self):
+        if not self._is_playing:
+            return
+        if self._kuyruk:
+            # Sıradaki ses önceden yüklendi; ara yoksa hemen başlar
+            bosluk_ms = self._kuyruk[0].bosluk_ms
+            if bosluk_ms > 0:
+                self._bosluk_timer.start(bosluk_ms)
+            else:
+                self._sonrakini_cal()
+            return
+        self._is_playing = False
+        if self.mikser is not None:
+            self.mikser.harici_oncelik(-1)
+        # Olay döngüsünden gönderilir; bağlı slot play() çağırabilir (durdururken kilit alınmış olabilir)
+        QTimer.singleShot(0, self.finished.emit)
+        # Durdurma/kesilmede oturum önceden ayrılır; burada yalnızca kendiliğinden biten oturum kalır
+        oturum, self._oturum = self._oturum, None
+        if oturum is not None:
+            oturum._bitir(OTURUM_TAMAMLANDI)
+    
+    def _sonrakini_cal(self):
+        with self.lock:
+            if not self._kuyruk:
+                return  # Arada durduruldu
+            self._is_playing = False
+            bildirimler = self._siradakini_baslat()
+            if not self._is_playing:
+                QTimer.singleShot(0, self.finished.emit)
+                bildirimler.append((self._oturum._bitir, OTURUM_TAMAMLANDI))
+                self._oturum = None
+        self._bildir(bildirimler)
+    
+    def _siradakini_baslat(self) -> list:
+        """Kuyruktaki ilk bulunan sesi başlat, arkasındakini önceden yükle (kilit alınmış olmalı)
+        
+        Returns:
+            Kilit bırakıldıktan sonra çağrılacak (fonksiyon, argüman) çiftleri
+        """
+        bildirimler = []
+        while self._kuyruk:
+            oge = self._kuyruk.pop(0)
+            if self._baslat(oge.dosya, oge.ses_seviyesi, oge.oncelik):
+                bildirimler += [(self._oturum._oge_basladi, oge), (self.oge_basladi.emit, oge)]
+                if self._kuyruk:
+                    self._hazirla(self._kuyruk[0].dosya)
+                break
+            self._oturum.atlananlar.append(oge.dosya)
+            bildirimler.append((self.oge_bulunamadi.emit, oge.dosya))
+        return bildirimler
+    
+    @staticmethod
+    def _bildir(bildirimler: list):
+        for fonksiyon, arguman in bildirimler:
+            fonksiyon(arguman)
+    
+    def _resolve(self, dosya_adi: str) -> Optional[Path]:
+        """Ses dosyasının diskteki yolunu bul (bulunamazsa None)"""
+        return self.indeks.coz(dosya_adi)
+    
+    def _calinacak_yol(self, dosya_adi: str) -> Optional[Path]:
+        """Çalınacak gerçek dosya (dönüştürülmüş WAV hazırsa o)"""
+        dosya_yolu = self._resolve(dosya_adi)
+        return self.donusum.karsilik(dosya_yolu) if dosya_yolu is not None else None
+    
+    def _seviye(self, ses_seviyesi: int) -> float:
+        """Ayarlanan seviye (0-100) ile yükseklik çarpanından çıkış seviyesi (0.0 - 1.0)"""
+        return max(0.0, min(1.0, ses_seviyesi / 100.0 * self._carpan))
+    
+    def _on_donusturuldu(self, _kaynak: str, hedef: str):
+        """Dönüştürülen WAV'ı belleğe de al"""
+        self.onbellek.iste(Path(hedef))
+        with self.lock:
+            if self._sabit_adlar:
+                self._sabitleri_yenile()
+            if self._havuz_adlari:
+                # Havuzdaki oynatıcı artık WAV karşılığını yüklemeli
+                self._havuzu_yenile()
+    
+    def havuzu_kur(self, dosya_adlari: Iterable[str]):
+        """Verilen sesler için dosyası yüklenmiş, ses cihazı açılmış oynatıcılar hazırla
+        
+        Listede kalan seslerin oynatıcıları yeniden kullanılır; yalnızca yeni sesler yüklenir.
+        """
+        with self.lock:
+            self._havuz_adlari = [ad for ad in dict.fromkeys(dosya_adlari) if ad]
+            self._havuzu_yenile()
+    
+    def _havuzu_yenile(self):
+        """Havuzu _havuz_adlari'na göre yeniden kur (kilit alınmış olmalı)"""
+        yollar: List[Path] = []
+        for ad in self._havuz_adlari:
+            yol = self._calinacak_yol(ad)
+            if yol is not None and yol not in yollar:
+                yollar.append(yol)
+        yollar = yollar[:HAVUZ_BOYUTU]
+        
+        eski, self._havuz = self._havuz, {}
+        bosta = [cift for yol, cift in eski.items() if yol not in yollar]
+        for yol in yollar:
+            cift = eski.get(yol)
+            if cift is None:
+                cift = bosta.pop() if bosta else self._yeni_oynatici()
+                # Önce havuza konur; durum sinyali gelince yedek oynatıcı olarak bekletilir
+                self._havuz[yol] = cift
+                self._isit(cift, yol)
+            else:
+                self._havuz[yol] = cift
+        for player, _ in bosta:
+            player.stop()
+            player.setSource(QUrl())
+    
+    def _isit(self, cift: Tuple[QMediaPlayer, QAudioOutput], yol: Path):
+        """Oynatıcıyı sessizce başlat; cihaz açılınca başa sarılıp bekletilir"""
+        player, output = cift
+        output.setMuted(True)
+        player.setSource(QUrl.fromLocalFile(str(yol.absolute())))
+        player.play()
+    
+    def _havuzda(self, player: QMediaPlayer) -> bool:
+        return any(p is player for p, _ in self._havuz.values())
+    
+    def sabitle(self, dosya_adlari: Iterable[str]):
+        """Verilen sesleri çözüp önbellek bütçesinden bağımsız olarak bellekte tut (acil durum)"""
+        with self.lock:
+            self._sabit_adlar = [ad for ad in dict.fromkeys(dosya_adlari) if ad]
+            self._sabitleri_yenile()
+    
+    def cihazi_acik_tut(self, sure_sn: float):
+        """Karıştırıcının ses cihazını şimdiden açıp boştayken de sure_sn saniye açık tut"""
+        if self.mikser is not None:
+            self.mikser.acik_tut(sure_sn)
+    
+    def _sabitleri_yenile(self):
+        """Sabit sesleri güncel çalınacak yollarıyla sabitle (kilit alınmış olmalı)"""
+        yollar = (self._calinacak_yol(ad) for ad in self._sabit_adlar)
+        self.onbellek.sabitle(yol for yol in yollar if yol is not None)
+    
+    def hazirla(self, dosya_adi: str) -> bool:
+        """Zil çalmadan önce dosyayı yükle ve ses cihazını aç
+        
+        Yedek oynatıcı sessizce başlatılıp başa sarılır; aynı dosya için play()
+        çağrıldığında yükleme ve cihaz açılışı beklenmeden çalmaya başlar.
+        
+        Returns:
+            Dosya bulunduysa True
+        """
+        with self.lock:
+            return self._hazirla(dosya_adi)
+    
+    def _hazirla(self, dosya_adi: str) -> bool:
+        dosya_yolu = self._calinacak_yol(dosya_adi)
+        if dosya_yolu is None:
+            return False
+        if dosya_yolu == self._hazir_yol or dosya_yolu in self._havuz or self.onbellek.get(dosya_yolu) is not None:
+            return True
+        self._hazir_yol = dosya_yolu
+        self._hazir_output.setMuted(True)
+        self._hazir_player.setSource(QUrl.fromLocalFile(str(dosya_yolu.absolute())))
+        self._hazir_player.play()
+        return True
+    
+    def onbellege_al(self, dosya_adlari):
+        """Verilen sesleri çalınmadan önce arka planda çözüp belleğe al"""
+        with self.lock:
+            kaynaklar = [yol for yol in (self._resolve(ad) for ad in dosya_adlari if ad) if yol is not None]
+            self.donusum.donustur(kaynaklar)
+            for kaynak in kaynaklar:
+                # Dönüştürülmekte olanlar WAV hazır olunca belleğe alınır
+                if not self.donusum.bekliyor(kaynak):
+                    self.onbellek.iste(self.donusum.karsilik(kaynak))
     
     def play(self, dosya_adi: str, ses_seviyesi: int = 100) -> bool:
         """
@@ -47,62 +411,193 @@ class SoundPlayer(QObject):
         Returns:
             Başarılı ise True
         """
+        return self.cal_sirayla([CalmaOgesi(dosya_adi, ses_seviyesi)]).calindi
+    
+    def cal_sirayla(self, ogeler: Iterable[CalmaOgesi],
+                    her_ogede: Optional[Callable[[CalmaOgesi], None]] = None,
+                    bitince: Optional[Callable[[CalmaOturumu], None]] = None) -> CalmaOturumu:
+        """Sesleri arka arkaya çal (saygı duruşu → marş, zil → anons)
+        
+        Çalan ses durdurulur ve oturumu kesilmiş olarak biter. Her ses çalarken sıradaki
+        önceden yüklenir; bosluk_ms 0 ise önceki ses biter bitmez başlar. Dosyası
+        bulunamayan sesler atlanır.
+        
+        Args:
+            her_ogede: Her ses başladığında çağrılır
+            bitince: Oturum herhangi bir nedenle bitince bir kez çağrılır
+        
+        Returns:
+            Oturum (hiçbir ses bulunamadıysa tamamlanmış olarak döner)
+        """
+        oturum = CalmaOturumu(ogeler, her_ogede, bitince)
         with self.lock:
-            if self._is_playing:
-                self.stop()
-            
-            # Dosya yolunu normalize et
-            dosya_adi = dosya_adi.replace("\\", "/")
-            
-            # Mutlak yol mu kontrol et
-            dosya_path_obj = Path(dosya_adi)
-            if dosya_path_obj.is_absolute():
-                # Mutlak yol ise direkt kullan
-                dosya_yolu = dosya_path_obj
-                if not dosya_yolu.exists():
-                    return False
-            else:
-                # Relative yol - önce "sounds/" ile başlıyorsa kaldır
-                if dosya_adi.startswith("sounds/"):
-                    dosya_adi = dosya_adi[7:]  # "sounds/" kısmını kaldır
-                
-                # Önce sounds_dir ile birleştir
-                dosya_yolu = self.sounds_dir / dosya_adi
-                
-                # Dosya yoksa alternatif yolları dene
-                if not dosya_yolu.exists():
-                    # Base directory'de dene
-                    base_dir = Path(__file__).parent.parent
-                    base_yol = base_dir / dosya_adi
-                    if base_yol.exists():
-                        dosya_yolu = base_yol
-                    else:
-                        # Son olarak "sounds/" ile başlayan yol olarak dene
-                        sounds_yol = base_dir / "sounds" / dosya_adi
-                        if sounds_yol.exists():
-                            dosya_yolu = sounds_yol
-                        else:
-                            # Hala bulunamadıysa hata
-                            return False
-            
-            # Ses seviyesini ayarla (0.0 - 1.0 arası)
-            volume = max(0.0, min(1.0, ses_seviyesi / 100.0))
-            self.audio_output.setVolume(volume)
-            
-            # Dosyayı çal
-            url = QUrl.fromLocalFile(str(dosya_yolu.absolute()))
-            self.player.setSource(url)
-            self.player.play()
-            self._is_playing = True
+            # stop() aynı kilidi aldığı için burada doğrudan durdurulur
+            bildirimler = self._kes(OTURUM_KESILDI)
             
+            self._oturum = oturum
+            self._kuyruk = list(oturum.ogeler)
+            bildirimler += self._siradakini_baslat()
+            if not self._is_playing:
+                bildirimler.append((oturum._bitir, OTURUM_TAMAMLANDI))
+                self._oturum = None
+        self._bildir(bildirimler)
+        return oturum
+    
+    def acil_cal(self, ogeler: Iterable[CalmaOgesi],
+                 her_ogede: Optional[Callable[[CalmaOgesi], None]] = None,
+                 bitince: Optional[Callable[[CalmaOturumu], None]] = None) -> CalmaOturumu:
+        """Çalan her şeyi (arka plan sesleri dahil) kesip sesleri en yüksek öncelikle çal
+        
+        Sabitlenmiş sesler karıştırıcıya doğrudan bellekten eklenir; ses cihazı açıksa
+        ses bir karıştırma bloğu içinde başlar.
+        """
+        if self.mikser is not None:
+            with self.lock:
+                arka_plan, self._arka_plan = self._arka_plan, set()
+            for kimlik in arka_plan:
+                self.mikser.durdur(kimlik, 15)
+                self.karisim_bitti.emit(kimlik)
+        return self.cal_sirayla([oge._replace(oncelik=ONCELIK_ACIL) for oge in ogeler], her_ogede, bitince)
+    
+    def _kes(self, durum: str) -> list:
+        """Çalan oturumu ve sırasını bitir (kilit alınmış olmalı)"""
+        oturum, self._oturum = self._oturum, None
+        self._kuyruk = []
+        self._bosluk_timer.stop()
+        if self._is_playing:
+            self._durdur()
+        return [(oturum._bitir, durum)] if oturum is not None else []
+    
+    def _baslat(self, dosya_adi: str, ses_seviyesi: int, oncelik: int = ONCELIK_ZIL) -> bool:
+        """Tek bir sesi çalmaya başla (kilit alınmış olmalı)"""
+        kaynak = self._resolve(dosya_adi)
+        if kaynak is None:
+            return False
+        dosya_yolu = self.donusum.karsilik(kaynak)
+        # Yükseklik özgün dosya için ölçülür (WAV karşılığı aynı içerik)
+        self._carpan = self.yukseklik.carpan(kaynak, self.hedef_lufs) if self.normalizasyon else 1.0
+        self.olcumler.isaretle(ASAMA_COZUM)
+        
+        self._baslatma_mono = time.monotonic()
+        ses = self.onbellek.get(dosya_yolu)
+        if ses is not None:
+            self.olcumler.isaretle(ASAMA_KAYNAK)
+            self._bellekten_cal(ses, ses_seviyesi, oncelik)
             return True
+        # Bir sonraki çalışta bellekten çalınabilsin
+        self.onbellek.iste(dosya_yolu)
+        
+        havuzdaki = self._havuz.get(dosya_yolu)
+        self._hazirdan = havuzdaki is not None or dosya_yolu == self._hazir_yol
+        if havuzdaki is not None:
+            # Havuzdaki oynatıcı öne alınır; eskisi aynı sesle ısıtılıp havuza döner
+            self._havuz[dosya_yolu] = (self.player, self.audio_output)
+            self.player, self.audio_output = havuzdaki
+            self.audio_output.setMuted(False)
+            self.player.setPosition(0)
+            self._isit(self._havuz[dosya_yolu], dosya_yolu)
+        elif self._hazirdan:
+            # Hazırlanmış oynatıcıyı öne al, eskisi bir sonraki hazırlık için yedek olur
+            self.player, self._hazir_player = self._hazir_player, self.player
+            self.audio_output, self._hazir_output = self._hazir_output, self.audio_output
+            self._hazir_yol = None
+            self.audio_output.setMuted(False)
+            self.player.setPosition(0)
+        else:
+            self.player.setSource(QUrl.fromLocalFile(str(dosya_yolu.absolute())))
+        
+        # Ses seviyesini ayarla (0.0 - 1.0 arası)
+        self.audio_output.setVolume(self._seviye(ses_seviyesi))
+        
+        if self.mikser is not None:
+            # Karıştırıcı dışında çalsa da arka plandaki sesler kısılır
+            self.mikser.harici_oncelik(oncelik)
+        self.olcumler.isaretle(ASAMA_KAYNAK)
+        self.player.play()
+        self._is_playing = True
+        if self.player.playbackState() == QMediaPlayer.PlaybackState.PlayingState:
+            # Isınırken yakalanan oynatıcı zaten çalıyordu; durum değişikliği gelmez
+            self._on_playback_state_changed(self.player, QMediaPlayer.PlaybackState.PlayingState)
+        
+        return True
+    
+    def _bellekten_cal(self, ses, ses_seviyesi: int, oncelik: int = ONCELIK_ZIL):
+        """Çözülmüş PCM'i doğrudan ses cihazına yaz (çözme ve dosya açma gecikmesi yok)"""
+        if self.mikser is not None:
+            kimlik = self.mikser.ekle(ses, self._seviye(ses_seviyesi), oncelik)
+            if kimlik is not None:
+                self.mikser.harici_oncelik(-1)
+                self._mikser_kimlik = kimlik
+                self._is_playing = True
+                return
+        sink = QAudioSink(QMediaDevices.defaultAudioOutput(), ses.bicim)
+        sink.setVolume(self._seviye(ses_seviyesi))
+        sink.stateChanged.connect(lambda state, s=sink: self._on_sink_state_changed(s, state))
+        buffer = QBuffer()
+        buffer.setData(QByteArray(ses.veri))
+        buffer.open(QIODevice.OpenModeFlag.ReadOnly)
+        self._sink, self._sink_buffer = sink, buffer
+        self._is_playing = True
+        sink.start(buffer)
+    
+    def _durdur(self):
+        """Çalan sesi durdur (kilit alınmış olmalı)"""
+        self.player.stop()
+        if self._sink is not None:
+            self._sink.stop()
+            self._sink = None
+            self._sink_buffer = None
+        if self.mikser is not None:
+            if self._mikser_kimlik is not None:
+                # Tık sesi olmasın diye çok kısa kısılarak kesilir
+                self.mikser.durdur(self._mikser_kimlik, 15)
+                self._mikser_kimlik = None
+            self.mikser.harici_oncelik(-1)
+        self._is_playing = False
+    
+    def karistir(self, dosya_adi: str, ses_seviyesi: int = 100, oncelik: int = ONCELIK_MUZIK,
+                 giris_ms: int = 0) -> Optional[int]:
+        """Sesi çalanı durdurmadan arka planda çal (teneffüs müziği gibi)
+        
+        Yalnızca belleğe alınmış sesler karıştırılabilir; değilse çözülmek üzere sıraya
+        alınır ve None döner. Zil ve anonslar çalarken arka plan sesleri kısılır.
+        
+        Returns:
+            Kaynak kimliği (karisim_bitti sinyalinde gelir) veya None
+        """
+        if self.mikser is None:
+            return None
+        with self.lock:
+            kaynak = self._resolve(dosya_adi)
+            if kaynak is None:
+                return None
+            dosya_yolu = self.donusum.karsilik(kaynak)
+            ses = self.onbellek.get(dosya_yolu)
+            if ses is None:
+                self.onbellek.iste(dosya_yolu)
+                return None
+            carpan = self.yukseklik.carpan(kaynak, self.hedef_lufs) if self.normalizasyon else 1.0
+            seviye = max(0.0, min(1.0, ses_seviyesi / 100.0 * carpan))
+            kimlik = self.mikser.ekle(ses, seviye, oncelik, giris_ms)
+            if kimlik is not None:
+                self._arka_plan.add(kimlik)
+            return kimlik
+    
+    def karisimi_durdur(self, kimlik: int, cikis_ms: int = 0):
+        """karistir() ile başlatılan sesi (isteğe bağlı olarak yavaşça kısarak) durdur"""
+        if self.mikser is not None:
+            self.mikser.durdur(kimlik, cikis_ms)
     
     def stop(self):
         """Sesi durdur"""
         with self.lock:
-            if self._is_playing:
-                self.player.stop()
-                self._is_playing = False
+            bildirimler = self._kes(OTURUM_DURDURULDU)
+        self._bildir(bildirimler)
+    
+    @property
+    def oturum(self) -> Optional[CalmaOturumu]:
+        """Şu anda çalan oturum"""
+        return self._oturum
     
     def is_playing(self) -> bool:
         """Şu anda ses çalıyor mu?"""
@@ -111,6 +606,10 @@ class SoundPlayer(QObject):
     
     def set_volume(self, ses_seviyesi: int):
         """Ses seviyesini ayarla (0-100)"""
-        volume = max(0.0, min(1.0, ses_seviyesi / 100.0))
+        volume = self._seviye(ses_seviyesi)
         self.audio_output.setVolume(volume)
+        if self._sink is not None:
+            self._sink.setVolume(volume)
+        if self._mikser_kimlik is not None:
+            self.mikser.seviye_ayarla(self._mikser_kimlik, volume)
 
@@ -0,0 +1,270 @@
+"""
+Derlenmiş zil zaman çizelgesi - schedule.json'u bir kez işleyip sıralı olay listesine çevirir
+"""
+from bisect import bisect_left, bisect_right
+from datetime import date, datetime, timedelta
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+
+GUN_ADLARI = ["Pazartesi", "Salı", "Çarşamba", "Perşembe", "Cuma", "Cumartesi", "Pazar"]
+
+VARSAYILAN_SES = "ziller/zil1.mp3"
+
+# Zil tipi -> (ayarlardaki ses anahtarı, ders özel ses alanı, anons alanı, açıklama)
+ZIL_TIPLERI = {
+    "ogrenci_giris": ("ogrenci", "ogrenci_sound", "ogrenci_anons", "Öğrenci Giriş"),
+    "ogretmen_giris": ("ogretmen", "ogretmen_sound", "ogretmen_anons", "Öğretmen Giriş"),
+    "ders_cikis": ("cikis", "cikis_sound", "cikis_anons", "Çıkış"),
+}
+
+
+# Aynı anda çalması gereken zillerde öncelik (büyük olan öne geçer)
+ZIL_ONCELIGI = {
+    "ogrenci_giris": 3,
+    "ders_cikis": 2,
+    "ogretmen_giris": 1,
+}
+
+
+class ZilOlayi(NamedTuple):
+    """Derlenmiş tek bir zil olayı (değiştirilemez)"""
+    dakika: int  # Gün içindeki dakika (0-1439)
+    tip: str  # ogrenci_giris / ogretmen_giris / ders_cikis
+    ders: int
+    ses: str  # Çözümlenmiş ses dosyası
+    anons: str
+    aciklama: str
+    gun: str
+    vardiya: str = ""  # "", "sabahci" veya "oglenci"
+    
+    @property
+    def kimlik(self) -> Tuple[str, str, int, str]:
+        """Yeniden derlemede değişmeyen olay kimliği (ses/anons değişse bile aynı kalır)"""
+        return (self.gun, self.vardiya, self.ders, self.tip)
+    
+    @property
+    def oncelik(self) -> int:
+        """Aynı dakikadaki zillerin sıralama önceliği"""
+        return ZIL_ONCELIGI.get(self.tip, 0)
+    
+    @property
+    def saat_str(self) -> str:
+        """HH:MM biçiminde saat"""
+        return f"{self.dakika // 60:02d}:{self.dakika % 60:02d}"
+
+
+def saat_to_dakika(saat_str: str) -> Optional[int]:
+    """'HH:MM' metnini gün içindeki dakikaya çevir (geçersizse None)"""
+    try:
+        saat, dakika = map(int, saat_str.split(":"))
+        if 0 <= saat < 24 and 0 <= dakika < 60:
+            return saat * 60 + dakika
+    except (AttributeError, ValueError):
+        pass
+    return None
+
+
+class GunProgrami:
+    """Bir günün dakikaya göre sıralanmış, değiştirilemez zil listesi"""
+    
+    __slots__ = ("gun", "olaylar", "_dakikalar")
+    
+    def __init__(self, gun: str, olaylar: List[ZilOlayi]):
+        self.gun = gun
+        self.olaylar: Tuple[ZilOlayi, ...] = tuple(sorted(olaylar, key=lambda o: o.dakika))
+        self._dakikalar: Tuple[int, ...] = tuple(o.dakika for o in self.olaylar)
+    
+    def __len__(self) -> int:
+        return len(self.olaylar)
+    
+    def dakikadaki_olaylar(self, dakika: int) -> Tuple[ZilOlayi, ...]:
+        """Verilen dakikada çalması gereken olaylar"""
+        bas = bisect_left(self._dakikalar, dakika)
+        bit = bisect_right(self._dakikalar, dakika, lo=bas)
+        return self.olaylar[bas:bit]
+    
+    def aralik(self, bas: int, bit: int) -> Tuple[ZilOlayi, ...]:
+        """[bas, bit) dakika aralığındaki olaylar"""
+        return self.olaylar[bisect_left(self._dakikalar, bas):bisect_left(self._dakikalar, bit)]
+    
+    def teneffusler(self) -> List[Tuple[int, int]]:
+        """Ders çıkışından sonraki ilk öğrenci girişine kadar olan aralıklar [bas, bit) (dakika)"""
+        araliklar = []
+        cikis: Optional[int] = None
+        for olay in self.olaylar:
+            if olay.tip == "ders_cikis":
+                if cikis is None:
+                    cikis = olay.dakika
+            elif olay.tip == "ogrenci_giris" and cikis is not None:
+                if olay.dakika > cikis:
+                    araliklar.append((cikis, olay.dakika))
+                cikis = None
+        return araliklar
+    
+    def sonraki_olay(self, saniye: float) -> Optional[ZilOlayi]:
+        """Gün içindeki saniyeden sonra (veya tam o anda) başlayan ilk olay"""
+        # Dakika başı geçtiyse o dakikadaki olay artık "geçmiş" sayılır
+        dakika = int(-(-saniye // 60))
+        i = bisect_left(self._dakikalar, dakika)
+        if i < len(self.olaylar):
+            return self.olaylar[i]
+        return None
+
+
+class ZamanCizelgesi:
+    """Haftanın her günü için derlenmiş GunProgrami koleksiyonu"""
+    
+    def __init__(self, gunler: Dict[str, GunProgrami]):
+        self._gunler = dict(gunler)
+    
+    def gun(self, gun_adi: str) -> GunProgrami:
+        """Gün adına göre program (yoksa boş program)"""
+        program = self._gunler.get(gun_adi)
+        if program is None:
+            program = GunProgrami(gun_adi, [])
+            self._gunler[gun_adi] = program
+        return program
+    
+    def degistir(self, gunler: Dict[str, GunProgrami]) -> "ZamanCizelgesi":
+        """Verilen günleri değiştirilmiş yeni çizelge (diğer günler paylaşılır)"""
+        yeni = dict(self._gunler)
+        yeni.update(gunler)
+        return ZamanCizelgesi(yeni)
+    
+    def tarih(self, tarih: date) -> GunProgrami:
+        """Takvim tarihine göre program"""
+        return self.gun(GUN_ADLARI[tarih.weekday()])
+    
+    def aradaki_olaylar(self, bas: datetime, bit: datetime) -> List[Tuple[datetime, ZilOlayi]]:
+        """[bas, bit) zaman aralığına dakika başı düşen olaylar (gün sınırlarını aşabilir)"""
+        sonuc = []
+        tarih = bas.date()
+        while tarih <= bit.date():
+            gun_basi = datetime.combine(tarih, datetime.min.time())
+            bas_dk = max(0, int(-(-(bas - gun_basi).total_seconds() // 60)))
+            bit_dk = min(24 * 60, int(-(-(bit - gun_basi).total_seconds() // 60)))
+            if bas_dk < bit_dk:
+                for olay in self.tarih(tarih).aralik(bas_dk, bit_dk):
+                    sonuc.append((gun_basi + timedelta(minutes=olay.dakika), olay))
+            tarih += timedelta(days=1)
+        return sonuc
+    
+    def sonraki_olay(self, simdi: datetime) -> Optional[Tuple[datetime, ZilOlayi]]:
+        """Şu andan sonraki ilk zil (gerekirse sonraki günlere bakar)"""
+        saniye = simdi.hour * 3600 + simdi.minute * 60 + simdi.second + simdi.microsecond / 1e6
+        for gun_farki in range(8):
+            tarih = simdi.date() + timedelta(days=gun_farki)
+            olay = self.tarih(tarih).sonraki_olay(saniye if gun_farki == 0 else 0)
+            if olay is not None:
+                return datetime.combine(tarih, datetime.min.time()) + timedelta(minutes=olay.dakika), olay
+        return None
+
+
+def _ses_coz(ders: Dict, tip: str, varsayilan_sesler: Dict[str, str]) -> str:
+    """Öncelik sırası: Ayarlardan seçilen ses > Ders özel sesi > Ders genel sesi > Varsayılan"""
+    ayar_anahtari, ozel_alan, _, _ = ZIL_TIPLERI[tip]
+    settings_sound = varsayilan_sesler.get(ayar_anahtari, "")
+    if settings_sound and settings_sound.strip():
+        return settings_sound
+    if ders.get(ozel_alan):
+        return ders[ozel_alan]
+    if ders.get("sound"):
+        return ders["sound"]
+    return VARSAYILAN_SES
+
+
+def _ders_olaylari(gun_adi: str, lessons: List[Dict], varsayilan_sesler: Dict[str, str],
+                   vardiya: str = "", bas: int = 0, bit: int = 24 * 60) -> List[ZilOlayi]:
+    """Ders listesindeki [bas, bit) aralığına düşen zilleri derle"""
+    olaylar = []
+    for ders in lessons:
+        for tip, (_, _, anons_alani, etiket) in ZIL_TIPLERI.items():
+            if tip not in ders:
+                continue
+            dakika = saat_to_dakika(ders[tip])
+            if dakika is None or not (bas <= dakika < bit):
+                continue
+            ders_no = ders.get("lesson", 0)
+            olaylar.append(ZilOlayi(
+                dakika=dakika,
+                tip=tip,
+                ders=ders_no,
+                ses=_ses_coz(ders, tip, varsayilan_sesler),
+                anons=ders.get(anons_alani, ""),
+                aciklama=f"{ders_no}. Ders {etiket}",
+                gun=gun_adi,
+                vardiya=vardiya,
+            ))
+    return olaylar
+
+
+def derle_gun(gun_adi: str, gun_ayarlari: Dict, varsayilan_sesler: Dict[str, str]) -> GunProgrami:
+    """Tek bir günün ayarlarını derle"""
+    if not gun_ayarlari or not gun_ayarlari.get("active", False):
+        return GunProgrami(gun_adi, [])
+    
+    # Sabahçı-öğlenci sistemi: ayırma saatinden önce sabahçı, sonra öğlenci zilleri geçerli
+    if "sabahci" in gun_ayarlari and "oglenci" in gun_ayarlari:
+        ayirma = saat_to_dakika(gun_ayarlari.get("shift_ayirma_saati", "12:00"))
+        if ayirma is not None:
+            olaylar = []
+            sabahci = gun_ayarlari["sabahci"]
+            oglenci = gun_ayarlari["oglenci"]
+            if sabahci.get("active", False):
+                olaylar += _ders_olaylari(gun_adi, sabahci.get("lessons", []), varsayilan_sesler,
+                                          "sabahci", 0, ayirma)
+            if oglenci.get("active", False):
+                olaylar += _ders_olaylari(gun_adi, oglenci.get("lessons", []), varsayilan_sesler,
+                                          "oglenci", ayirma)
+            return GunProgrami(gun_adi, olaylar)
+        # Ayırma saati hatalıysa normal lessons kullan
+    
+    return GunProgrami(gun_adi, _ders_olaylari(gun_adi, gun_ayarlari.get("lessons", []), varsayilan_sesler))
+
+
+def derle(schedule_data: Dict, varsayilan_sesler: Dict[str, str]) -> ZamanCizelgesi:
+    """schedule.json içeriğini haftalık zaman çizelgesine derle"""
+    gunler = schedule_data.get("days", {}) if isinstance(schedule_data, dict) else {}
+    return ZamanCizelgesi({
+        gun_adi: derle_gun(gun_adi, gunler.get(gun_adi, {}), varsayilan_sesler)
+        for gun_adi in GUN_ADLARI
+    })
+
+
+def yeniden_derle(cizelge: ZamanCizelgesi, eski_data: Dict, yeni_data: Dict,
+                  varsayilan_sesler: Dict[str, str]) -> Tuple[ZamanCizelgesi, List[str]]:
+    """Sadece değişen günleri yeniden derle
+    
+    Returns:
+        (yeni çizelge, değişen gün adları)
+    """
+    eski_gunler = eski_data.get("days", {}) if isinstance(eski_data, dict) else {}
+    yeni_gunler = yeni_data.get("days", {}) if isinstance(yeni_data, dict) else {}
+    degisenler = [gun for gun in GUN_ADLARI if eski_gunler.get(gun) != yeni_gunler.get(gun)]
+    if not degisenler:
+        return cizelge, []
+    return cizelge.degistir({
+        gun: derle_gun(gun, yeni_gunler.get(gun, {}), varsayilan_sesler) for gun in degisenler
+    }), degisenler
+
+
+def ses_dosyalari(schedule_data: Dict) -> List[str]:
+    """Programda geçen tüm zil ve anons dosyaları (tekrarsız, ilk geçiş sırasıyla)"""
+    alanlar = ["sound"] + [alan for _, ozel, anons, _ in ZIL_TIPLERI.values() for alan in (ozel, anons)]
+    dosyalar: Dict[str, None] = {}
+    
+    def ekle(lessons):
+        for ders in lessons or []:
+            for alan in alanlar:
+                if isinstance(ders, dict) and ders.get(alan):
+                    dosyalar.setdefault(ders[alan])
+    
+    gunler = schedule_data.get("days", {}) if isinstance(schedule_data, dict) else {}
+    for gun_ayarlari in gunler.values():
+        if not isinstance(gun_ayarlari, dict):
+            continue
+        ekle(gun_ayarlari.get("lessons"))
+        for vardiya in ("sabahci", "oglenci"):
+            if isinstance(gun_ayarlari.get(vardiya), dict):
+                ekle(gun_ayarlari[vardiya].get("lessons"))
+    return list(dosyalar)
@@ -0,0 +1,149 @@
+"""
+Dönüştürme önbelleği - WMA/M4A/MP3 sesleri hızlı açılan PCM WAV'a çevirip içerik özetiyle saklar
+"""
+import os
+import shutil
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Set, Tuple
+from PySide6.QtCore import QObject, Signal
+
+from core.sound_library import icerik_ozeti
+
+
+# Hedef biçim: 48 kHz, stereo, 16 bit PCM (her Qt arka ucunda codec gerektirmeden açılır)
+HEDEF_HIZ = 48000
+HEDEF_KANAL = 2
+
+_ffmpeg = shutil.which("ffmpeg")
+# Windows'ta ffmpeg için konsol penceresi açılmasın
+_SUBPROCESS_BAYRAKLARI = getattr(subprocess, "CREATE_NO_WINDOW", 0)
+
+# Her iş ayrı bir ffmpeg süreci başlatır; iş parçacıkları yalnızca süreçleri bekler
+_donusturucu = ThreadPoolExecutor(max_workers=min(2, os.cpu_count() or 1), thread_name_prefix="ses-donusum")
+
+
+def _donustur(kaynak: Path, klasor: Path) -> Tuple[int, int, Path]:
+    """Kaynağı önbellekteki WAV'a çevir (zaten varsa yeniden çevirmez)
+    
+    Returns:
+        (kaynağın mtime_ns'i, boyutu, WAV yolu)
+    """
+    st = kaynak.stat()
+    hedef = klasor / f"{icerik_ozeti(kaynak)}.wav"
+    if not hedef.exists():
+        klasor.mkdir(parents=True, exist_ok=True)
+        gecici = hedef.with_name(hedef.name + ".tmp")
+        sonuc = subprocess.run(
+            [_ffmpeg, "-y", "-v", "error", "-i", str(kaynak), "-vn",
+             "-ac", str(HEDEF_KANAL), "-ar", str(HEDEF_HIZ), "-c:a", "pcm_s16le", "-f", "wav", str(gecici)],
+            capture_output=True, timeout=300, creationflags=_SUBPROCESS_BAYRAKLARI
+        )
+        if sonuc.returncode != 0:
+            try:
+                gecici.unlink()
+            except OSError:
+                pass
+            raise ValueError(sonuc.stderr.decode("utf-8", "replace").strip() or "ffmpeg hatası")
+        os.replace(gecici, hedef)
+    return st.st_mtime_ns, st.st_size, hedef
+
+
+class DonusumOnbellegi(QObject):
+    """Ses dosyalarının WAV karşılıkları
+    
+    Aynı içerik tek bir dosyada tutulur (ad içerik özetidir). ffmpeg bulunamazsa
+    hiçbir şey yapmaz ve özgün dosyalar çalınır.
+    """
+    
+    hazir = Signal(str, str)  # (kaynak dosya, WAV karşılığı)
+    _tamamlandi = Signal(object, object, str)  # (kaynak, sonuç veya None, hata) - GUI thread'ine taşır
+    
+    def __init__(self, klasor: Path):
+        super().__init__()
+        self.klasor = Path(klasor)
+        self._karsiliklar: Dict[Path, Tuple[int, int, Path]] = {}
+        self._bekleyenler: Set[Path] = set()
+        self._kullanilanlar: Set[Path] = set()
+        # Dönüştürülemeyen dosyalar değişmedikçe yeniden denenmez
+        self._basarisizlar: Dict[Path, Tuple[int, int]] = {}
+        self._tamamlandi.connect(self._on_tamamlandi)
+    
+    @staticmethod
+    def kullanilabilir() -> bool:
+        """ffmpeg kurulu mu?"""
+        return _ffmpeg is not None
+    
+    def karsilik(self, kaynak: Path) -> Path:
+        """Çalınacak dosya: hazırsa WAV karşılığı, değilse kaynağın kendisi"""
+        kayit = self._karsiliklar.get(kaynak)
+        if kayit is None:
+            return kaynak
+        mtime_ns, boyut, hedef = kayit
+        try:
+            st = kaynak.stat()
+        except OSError:
+            return kaynak
+        if (st.st_mtime_ns, st.st_size) != (mtime_ns, boyut) or not hedef.exists():
+            # Kaynak değişti; eski karşılık kullanılmaz, yeniden dönüştürülmeli
+            del self._karsiliklar[kaynak]
+            return kaynak
+        return hedef
+    
+    def bekliyor(self, kaynak: Path) -> bool:
+        """Kaynak şu anda dönüştürülüyor mu?"""
+        return kaynak in self._bekleyenler
+    
+    def donustur(self, kaynaklar: Iterable[Path]):
+        """Verilen sesleri arka planda dönüştür
+        
+        Listede olmayan seslerin önbellekteki karşılıkları, bekleyen işler bitince silinir.
+        """
+        if _ffmpeg is None:
+            return
+        self._kullanilanlar = set()
+        for kaynak in kaynaklar:
+            self._kullanilanlar.add(kaynak)
+            if kaynak.suffix.lower() == ".wav" or kaynak in self._bekleyenler or self.karsilik(kaynak) != kaynak:
+                continue
+            if kaynak in self._basarisizlar and self._basarisizlar[kaynak] == self._imza(kaynak):
+                continue
+            self._bekleyenler.add(kaynak)
+            _donusturucu.submit(_donustur, kaynak, self.klasor).add_done_callback(
+                lambda g, k=kaynak: self._tamamlandi.emit(
+                    k, None if g.exception() else g.result(), str(g.exception() or "")
+                )
+            )
+        self._temizle()
+    
+    @staticmethod
+    def _imza(kaynak: Path) -> Optional[Tuple[int, int]]:
+        try:
+            st = kaynak.stat()
+            return st.st_mtime_ns, st.st_size
+        except OSError:
+            return None
+    
+    def _on_tamamlandi(self, kaynak: Path, sonuc: Optional[Tuple[int, int, Path]], hata: str):
+        self._bekleyenler.discard(kaynak)
+        if sonuc is None:
+            self._basarisizlar[kaynak] = self._imza(kaynak)
+            print(f"Ses dönüştürülemedi, özgün dosya çalınacak: {kaynak} ({hata})")
+        else:
+            self._karsiliklar[kaynak] = sonuc
+            self.hazir.emit(str(kaynak), str(sonuc[2]))
+        self._temizle()
+    
+    def _temizle(self):
+        """Artık kullanılmayan sesin WAV'larını sil (tüm işler bittikten sonra)"""
+        if self._bekleyenler or not self.klasor.is_dir():
+            return
+        tutulacaklar = {kayit[2].name for kaynak, kayit in self._karsiliklar.items()
+                        if kaynak in self._kullanilanlar}
+        for dosya in self.klasor.iterdir():
+            if dosya.suffix in (".wav", ".tmp") and dosya.name not in tutulacaklar:
+                try:
+                    dosya.unlink()
+                except OSError:
+                    pass  # Çalınıyor olabilir, bir sonraki temizlikte silinir
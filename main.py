@@ -10,15 +10,81 @@ project_root = Path(__file__).parent
 sys.path.insert(0, str(project_root))
 
 from PySide6.QtWidgets import QApplication, QDialog
-from PySide6.QtCore import Qt
+from PySide6.QtCore import QCoreApplication, Qt
 
-from ui.main_window import MainWindow
-from ui.tray import TrayIcon
+from core.ipc import komut_gonder
 from core.logger import ZilLogger
+from core.persistence import flush_all
+
+
+# Çalışan uygulamaya gönderilen komutlar (örn. masaüstü kısayolu: main.py --acil)
+# Acil durum türleri core.emergency'dekilerle aynıdır
+KOMUT_SECENEKLERI = {
+    "--acil": "siren",
+    "--acil-mars": "siren_mars",
+    "--durdur": "durdur"
+}
+
+
+def komut_calistir(komut: str) -> int:
+    """Komutu çalışan uygulamaya gönder; çıkış kodunu döndür"""
+    QCoreApplication(sys.argv)
+    yanit = komut_gonder(komut)
+    if yanit is None:
+        print("Okul Zili çalışmıyor, komut gönderilemedi.", file=sys.stderr)
+        return 1
+    print(yanit)
+    return 0 if yanit == "tamam" else 1
+
+
+def rapor_yazdir(argumanlar) -> int:
+    """main.py --rapor [BAŞLANGIÇ] [BİTİŞ]: zil mutabakat raporunu yazdır (tarihler YYYY-AA-GG)
+    
+    Tarih verilmezse bu ayın başından bugüne kadar raporlanır. Uygulamanın çalışması gerekmez.
+    """
+    from datetime import date
+    from core.event_log import OlayGunlugu
+    from core.persistence import read_json
+    from core.reconciliation import SINIF_ADLARI, SINIFLAR, mutabakat
+    from core.timeline import derle
+    
+    try:
+        tarihler = [date.fromisoformat(a) for a in argumanlar[:2]]
+    except ValueError:
+        print("Kullanım: main.py --rapor [YYYY-AA-GG] [YYYY-AA-GG]", file=sys.stderr)
+        return 2
+    bugun = date.today()
+    bas = tarihler[0] if tarihler else bugun.replace(day=1)
+    bit = tarihler[1] if len(tarihler) > 1 else (bas if tarihler else bugun)
+    
+    # Scheduler ve ZilLogger ile aynı kökten: çalışma klasörü ne olursa olsun aynı dosyalar
+    cizelge = derle(read_json(project_root / "data" / "schedule.json") or {}, {})
+    olaylar = OlayGunlugu(project_root / "logs" / "olaylar")
+    sayilar = {sinif: 0 for sinif in SINIFLAR}
+    print("Planlanan\tZil\tVardiya\tDurum\tGecikme (ms)\tAyrıntı")
+    for satir in mutabakat(cizelge, olaylar, bas, bit):
+        sayilar[satir.sinif] += 1
+        gecikme = "" if satir.gecikme_ms is None else str(satir.gecikme_ms)
+        print(f"{satir.planlanan:%Y-%m-%d %H:%M}\t{satir.aciklama}\t{satir.vardiya}\t"
+              f"{SINIF_ADLARI[satir.sinif]}\t{gecikme}\t{satir.ayrinti}")
+    print(f"\n{bas} - {bit}: {sum(sayilar.values())} zil; "
+          + ", ".join(f"{SINIF_ADLARI[s]} {sayilar[s]}" for s in SINIFLAR))
+    return 0
 
 
 def main():
     """Ana fonksiyon"""
+    if "--rapor" in sys.argv[1:]:
+        konum = sys.argv.index("--rapor")
+        sys.exit(rapor_yazdir(sys.argv[konum + 1:]))
+    for secenek, komut in KOMUT_SECENEKLERI.items():
+        if secenek in sys.argv[1:]:
+            sys.exit(komut_calistir(komut))
+    
+    # Arayüz modülleri komut gönderirken yüklenmez (acil durum komutu beklemeden gider)
+    from ui.main_window import MainWindow
+    from ui.tray import TrayIcon
+    
     # Yüksek DPI desteği
     QApplication.setHighDpiScaleFactorRoundingPolicy(
         Qt.HighDpiScaleFactorRoundingPolicy.PassThrough
@@ -26,6 +92,8 @@ def main():
     
     app = QApplication(sys.argv)
     app.setQuitOnLastWindowClosed(False)  # Tray icon için
+    # Kapanırken arka planda bekleyen kayıtları diske yaz
+    app.aboutToQuit.connect(flush_all)
     
     # Logger başlat
     logger = ZilLogger()
@@ -51,6 +119,9 @@ def main():
         
         tray.show_window.connect(show_main_window)
         tray.quit_app.connect(app.quit)
+        tray.acil.connect(lambda tur: main_window.acil_tetikle(tur, "tepsi"))
+        # Menü açılınca siren seçilebilir: ses cihazı önceden açılır
+        tray.menu.aboutToShow.connect(main_window.acil.hazir_tut)
         
         # İlk çalıştırmada pencereyi göster
         main_window.show()
@@ -58,7 +129,7 @@ def main():
         logger.log_sistem("Uygulama başarıyla başlatıldı")
         
         sys.exit(app.exec())
-        
+    
     except Exception as e:
         logger.log_hata(f"Kritik hata: {e}")
         import traceback
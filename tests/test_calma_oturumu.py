@@ -0,0 +1,401 @@
+"""
+Çalma oturumu testleri - Haftalarca çalan zillerden sonra bağlantı sayısı ve bellek sabit kalmalı,
+otomatik zil sesi ve anonsu sırayla çalmalı
+
+QtMultimedia yerine sesi hemen bitiren sahte bir oynatıcı kullanılır; ses cihazı gerekmez
+(QT_QPA_PLATFORM=offscreen ile de çalışır).
+"""
+import gc
+import sys
+import tempfile
+import time
+import tracemalloc
+import types
+import unittest
+from datetime import datetime, timedelta
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import PySide6
+from PySide6.QtCore import QCoreApplication, QObject, QTimer, Signal, SIGNAL
+
+# PySide 6.12.0'da sinyal gönderimi True/False/None'un başvuru sayısını azaltıyor ve binlerce
+# gönderimden sonra yorumlayıcı çöküyor (requirements.txt bu sürümü dışlar). Python 3.12'den
+# itibaren bu nesneler ölümsüzdür.
+if PySide6.__version_info__[:3] == (6, 12, 0) and sys.version_info < (3, 12):
+    raise unittest.SkipTest("PySide6 6.12.0 sinyal gönderiminde başvuru sayısı hatası içeriyor")
+
+
+# Bir okul haftası ~40 zil x 5 gün; ısınmadan sonra bir dönem (11 hafta) çalınır
+HAFTA_ZIL_SAYISI = 200
+ISINMA_ZIL_SAYISI = 200
+# Isınmadan sonra izin verilen bellek artışı
+EN_FAZLA_ARTIS_KB = 64
+
+ZIL = "ziller/zil1.mp3"
+ZIL_2 = "ziller/17153032_zilsesi2.mp3"
+ANONS = "ziller/17153010_zilsesi1.mp3"
+
+
+def _sahte_multimedya() -> types.ModuleType:
+    """Çalınan sesi olay döngüsünün bir sonraki turunda bitiren QtMultimedia yerine geçen modül"""
+    modul = types.ModuleType("PySide6.QtMultimedia")
+    
+    class QMediaPlayer(QObject):
+        class PlaybackState:
+            StoppedState = 0
+            PlayingState = 1
+            PausedState = 2
+        
+        class MediaStatus:
+            EndOfMedia = 7
+        
+        playbackStateChanged = Signal(int)
+        mediaStatusChanged = Signal(int)
+        errorOccurred = Signal(int, str)
+        
+        def __init__(self):
+            super().__init__()
+            self._durum = 0
+            self._kaynak = None
+            self._bitis = QTimer(self)
+            self._bitis.setSingleShot(True)
+            self._bitis.timeout.connect(self._bitti)
+        
+        def setAudioOutput(self, output):
+            pass
+        
+        def setSource(self, kaynak):
+            self._kaynak = kaynak
+        
+        def source(self):
+            return self._kaynak
+        
+        def errorString(self):
+            return ""
+        
+        def setPosition(self, konum):
+            pass
+        
+        def playbackState(self):
+            return self._durum
+        
+        def _ayarla(self, durum):
+            if durum != self._durum:
+                self._durum = durum
+                self.playbackStateChanged.emit(durum)
+        
+        def play(self):
+            self._ayarla(1)
+            self._bitis.start(0)
+        
+        def _bitti(self):
+            self._ayarla(0)
+            self.mediaStatusChanged.emit(7)
+        
+        def pause(self):
+            self._bitis.stop()
+            self._ayarla(2)
+        
+        def stop(self):
+            self._bitis.stop()
+            self._ayarla(0)
+    
+    class QAudioOutput:
+        def setVolume(self, seviye):
+            pass
+        
+        def setMuted(self, kapali):
+            pass
+    
+    class QAudioFormat:
+        class SampleFormat:
+            Int16 = 1
+            Float = 2
+        
+        def __init__(self):
+            self._bicim = 1
+        
+        def setSampleFormat(self, bicim):
+            self._bicim = bicim
+        
+        def sampleFormat(self):
+            return self._bicim
+        
+        def sampleRate(self):
+            return 48000
+        
+        def channelCount(self):
+            return 2
+    
+    class _Cihaz:
+        def preferredFormat(self):
+            return QAudioFormat()
+    
+    class QMediaDevices:
+        @staticmethod
+        def defaultAudioOutput():
+            return _Cihaz()
+    
+    class QAudioDecoder(QObject):
+        """Çözüm hiç bitmez: tüm sesler QMediaPlayer yolundan çalar"""
+        bufferReady = Signal()
+        finished = Signal()
+        error = Signal(object)
+        
+        def setAudioFormat(self, bicim):
+            pass
+        
+        def setSource(self, kaynak):
+            pass
+        
+        def start(self):
+            pass
+        
+        def stop(self):
+            pass
+        
+        def errorString(self):
+            return "sahte çözücü"
+    
+    class QAudioSink:
+        pass
+    
+    class QAudio:
+        class State:
+            ActiveState = 0
+            IdleState = 1
+            StoppedState = 2
+    
+    for sinif in (QMediaPlayer, QAudioOutput, QAudioFormat, QMediaDevices, QAudioDecoder, QAudioSink, QAudio):
+        setattr(modul, sinif.__name__, sinif)
+    return modul
+
+
+# Sahte QtMultimedia yalnızca bu modülün testleri sürerken sys.modules'tadır; modül içinde
+# içe aktarılan proje modülleri de sonunda sys.modules'tan çıkar
+_multimedya_yamasi = None
+
+
+def setUpModule():
+    global _multimedya_yamasi, sound_player, CalmaOgesi, SoundPlayer, DonusumOnbellegi, MainWindow
+    global OTURUM_DURDURULDU, OTURUM_KESILDI, OTURUM_TAMAMLANDI, SONUC_CALINDI, SONUC_HATA, ZilOlayi
+    # Gerçek QtMultimedia yüklü olsa da sahtesi kullanılır (çalma süresi dosyaya bağlı olmasın)
+    _multimedya_yamasi = mock.patch.dict(sys.modules, {"PySide6.QtMultimedia": _sahte_multimedya()})
+    _multimedya_yamasi.start()
+    try:
+        from core import sound_player
+        from core.event_log import SONUC_CALINDI, SONUC_HATA
+        from core.sound_player import (
+            OTURUM_DURDURULDU, OTURUM_KESILDI, OTURUM_TAMAMLANDI, CalmaOgesi, SoundPlayer
+        )
+        from core.timeline import ZilOlayi
+        from core.transcode import DonusumOnbellegi
+        from ui.main_window import MainWindow
+    except BaseException:
+        _multimedya_yamasi.stop()
+        raise
+    for ad in _ZilPenceresi.YONTEMLER:
+        setattr(_ZilPenceresi, ad, getattr(MainWindow, ad))
+
+
+def tearDownModule():
+    _multimedya_yamasi.stop()
+
+
+def _oynatici_olustur(klasor: str):
+    """Dönüşüm önbelleği proje klasörü yerine geçici klasöre açılan oynatıcı"""
+    with mock.patch.object(sound_player, "DonusumOnbellegi",
+                           lambda _klasor: DonusumOnbellegi(Path(klasor))):
+        return SoundPlayer()
+
+
+class _ZilPenceresi:
+    """MainWindow'un otomatik zil yolunu pencere kurmadan çalıştıran yardımcı
+    
+    Yöntemler MainWindow'dan alınır; ayarlar, durum, zamanlayıcı ve logger sahtedir.
+    """
+    
+    YONTEMLER = ("_on_zil_calindi", "_zil_seviyesi", "_zilleri_kaydet", "_zil_olayi_kaydet",
+                 "_sirayla_cal", "_sira_boslugu", "_oge_kaydet", "_olay_kaydet")
+    
+    def __init__(self, oynatici):
+        self.sound_player = oynatici
+        self.state_manager = mock.Mock(**{"zil_calabilir_mi.return_value": True})
+        self.settings = mock.Mock(**{"volume.return_value": 80, "system.return_value": 0})
+        self.logger = mock.Mock()
+        self.scheduler = mock.Mock(gonderilen=[])
+
+
+class CalmaOturumuDayanikliligi(unittest.TestCase):
+    """cal_sirayla / stop döngülerinde sinyal bağlantıları ve bellek birikmemeli"""
+    
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QCoreApplication.instance() or QCoreApplication([])
+        cls._gecici = tempfile.TemporaryDirectory()
+        cls.player = _oynatici_olustur(cls._gecici.name)
+    
+    @classmethod
+    def tearDownClass(cls):
+        cls.player.stop()
+        if cls.player.mikser is not None:
+            cls.player.mikser.kapat()
+        cls._gecici.cleanup()
+    
+    def _bekle(self, kosul, sure_sn: float = 5.0):
+        son = time.monotonic() + sure_sn
+        while not kosul():
+            self.assertLess(time.monotonic(), son, "oturum zamanında bitmedi")
+            self.app.processEvents()
+    
+    def _baglantilar(self) -> dict:
+        p = self.player
+        sayilar = {
+            ad: p.receivers(SIGNAL(imza))
+            for ad, imza in (("finished", "finished()"), ("basladi", "basladi(double,bool)"),
+                             ("oge_basladi", "oge_basladi(PyObject)"), ("oge_bulunamadi", "oge_bulunamadi(QString)"))
+        }
+        for no, oynatici in enumerate((p.player, p._hazir_player)):
+            sayilar[f"oynatici{no}"] = oynatici.receivers(SIGNAL("playbackStateChanged(int)"))
+        return sayilar
+    
+    def _zil(self, no: int):
+        """Sırayla tamamlanan, durdurulan ve yeni zille kesilen oturumlar"""
+        kayit = []
+        ogeler = [CalmaOgesi(ZIL, aciklama="zil"), CalmaOgesi("yok.mp3"), CalmaOgesi(ZIL, aciklama="anons")]
+        oturum = self.player.cal_sirayla(ogeler, her_ogede=lambda oge: kayit.append(oge.aciklama),
+                                         bitince=lambda o: kayit.append(o.durum))
+        self.assertTrue(oturum.calindi)
+        if no % 3 == 0:
+            self._bekle(lambda: oturum.bitti_mi)
+            self.assertEqual(oturum.durum, OTURUM_TAMAMLANDI)
+            self.assertEqual(kayit, ["zil", "anons", OTURUM_TAMAMLANDI])
+            self.assertEqual(oturum.atlananlar, ["yok.mp3"])
+        elif no % 3 == 1:
+            self.player.stop()
+            self.assertEqual(oturum.durum, OTURUM_DURDURULDU)
+        else:
+            yeni = self.player.cal_sirayla([CalmaOgesi(ZIL)])
+            self.assertEqual(oturum.durum, OTURUM_KESILDI)
+            self._bekle(lambda: yeni.bitti_mi)
+        self.assertEqual(oturum.geri_cagirma_sayisi(), 0)
+        self.assertIsNone(self.player.oturum)
+    
+    def _ziller(self, adet: int):
+        for no in range(adet):
+            self._zil(no)
+        # Ertelenmiş finished gönderimleri
+        self._bekle(lambda: not self.player.is_playing())
+        self.app.processEvents()
+    
+    def test_baglanti_ve_bellek_sabit(self):
+        self._ziller(ISINMA_ZIL_SAYISI)
+        baslangic = self._baglantilar()
+        gc.collect()
+        tracemalloc.start()
+        try:
+            self._ziller(HAFTA_ZIL_SAYISI)
+            gc.collect()
+            ilk = tracemalloc.take_snapshot()
+            self._ziller(10 * HAFTA_ZIL_SAYISI)
+            gc.collect()
+            son = tracemalloc.take_snapshot()
+        finally:
+            tracemalloc.stop()
+        
+        self.assertEqual(self._baglantilar(), baslangic)
+        artis = sum(fark.size_diff for fark in son.compare_to(ilk, "filename"))
+        self.assertLess(artis, EN_FAZLA_ARTIS_KB * 1024,
+                        "\n".join(str(fark) for fark in son.compare_to(ilk, "lineno")[:5]))
+
+
+
+class OtomatikZilSirasi(unittest.TestCase):
+    """Zamanlayıcıdan gelen zil, anonsu ve aynı tick'te birleşen ziller tek oturumda sırayla çalmalı"""
+    
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QCoreApplication.instance() or QCoreApplication([])
+        cls._gecici = tempfile.TemporaryDirectory()
+        cls.player = _oynatici_olustur(cls._gecici.name)
+    
+    @classmethod
+    def tearDownClass(cls):
+        cls.player.stop()
+        if cls.player.mikser is not None:
+            cls.player.mikser.kapat()
+        cls._gecici.cleanup()
+    
+    def setUp(self):
+        self.pencere = _ZilPenceresi(self.player)
+        # Dakika dönümüne denk gelen test zili geç çalınmış sayılmasın
+        self.zaman = datetime.now().replace(second=0, microsecond=0) + timedelta(minutes=1)
+    
+    def _olay(self, tip: str, ses: str, anons: str = "", ders: int = 1) -> "ZilOlayi":
+        return ZilOlayi(self.zaman.hour * 60 + self.zaman.minute, tip, ders, ses, anons,
+                        f"{ders}. Ders {tip}", "Pazartesi")
+    
+    def _zil_cal(self, olaylar, aciklama: str):
+        """Zamanlayıcının zil_calindi gönderimini taklit et; başlayan oturumu döndür"""
+        self.pencere.scheduler.gonderilen = [(self.zaman, olay) for olay in olaylar]
+        bas = olaylar[0]
+        self.pencere._on_zil_calindi(bas.tip, aciklama, bas.ses, bas.anons)
+        oturum = self.player.oturum
+        self.assertIsNotNone(oturum)
+        return oturum
+    
+    def _bekle(self, oturum, sure_sn: float = 5.0):
+        son = time.monotonic() + sure_sn
+        while not oturum.bitti_mi:
+            self.assertLess(time.monotonic(), son, "oturum zamanında bitmedi")
+            self.app.processEvents()
+    
+    def _sonuclar(self) -> list:
+        return [c.args for c in self.pencere.scheduler.sonuc_kaydet.call_args_list]
+    
+    def test_zil_ve_anons_sirayla(self):
+        olay = self._olay("ogrenci_giris", ZIL, ANONS)
+        oturum = self._zil_cal([olay], olay.aciklama)
+        self._bekle(oturum)
+        
+        self.assertEqual(oturum.durum, OTURUM_TAMAMLANDI)
+        self.assertEqual([oge.dosya for oge in oturum.calinanlar], [ZIL, ANONS])
+        self.assertEqual([oge.ses_seviyesi for oge in oturum.calinanlar], [80, 80])
+        self.assertEqual(oturum.geri_cagirma_sayisi(), 0)
+        # Her sesin log geri çağırması bir kez, zilin sonucu bir kez
+        saat = datetime.now().strftime('%H:%M')
+        self.assertEqual([c.args[0] for c in self.pencere.logger.log_otomatik.call_args_list],
+                         [f"{saat} {olay.aciklama}", f"{saat} Anons çalındı: {ANONS}"])
+        self.assertEqual(self._sonuclar(), [(self.zaman, olay, SONUC_CALINDI)])
+        self.assertEqual(self.pencere.logger.olay.call_count, 1)
+        self.assertEqual(self.pencere.logger.olay.call_args.args[1], SONUC_CALINDI)
+        self.pencere.scheduler.olcumler.iptal.assert_not_called()
+    
+    def test_birlesen_zillerin_sesleri_atlanmaz(self):
+        cikis = self._olay("ders_cikis", ZIL, ANONS, ders=1)
+        ogretmen = self._olay("ogretmen_giris", ZIL_2, ders=2)
+        ogrenci = self._olay("ogrenci_giris", ZIL, ANONS, ders=2)
+        oturum = self._zil_cal([cikis, ogretmen, ogrenci], f"{cikis.aciklama} + {ogrenci.aciklama}")
+        self._bekle(oturum)
+        
+        # Aynı ses ve anons bir kez çalar, farklı ses arkasından gelir
+        self.assertEqual([oge.dosya for oge in oturum.calinanlar], [ZIL, ANONS, ZIL_2])
+        self.assertEqual(self._sonuclar(), [(self.zaman, cikis, SONUC_CALINDI), (self.zaman, ogrenci, SONUC_CALINDI),
+                                            (self.zaman, ogretmen, SONUC_CALINDI)])
+    
+    def test_sesi_calmayan_zil_hata_olarak_kaydedilir(self):
+        cikis = self._olay("ders_cikis", ZIL, ders=1)
+        ogretmen = self._olay("ogretmen_giris", ZIL_2, ders=2)
+        oturum = self._zil_cal([cikis, ogretmen], cikis.aciklama)
+        self.player.stop()
+        
+        self.assertEqual(oturum.durum, OTURUM_DURDURULDU)
+        self.assertEqual(self._sonuclar(), [(self.zaman, cikis, SONUC_CALINDI), (self.zaman, ogretmen, SONUC_HATA)])
+        self.assertEqual(oturum.geri_cagirma_sayisi(), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
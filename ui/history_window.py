@@ -0,0 +1,143 @@
+"""
+Zil geçmişi penceresi - Olay günlüğünden günün veya ayın hatalı zillerini listeler
+"""
+from datetime import date, datetime
+from PySide6.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QComboBox, QDateEdit,
+    QTableWidget, QTableWidgetItem, QHeaderView
+)
+from PySide6.QtCore import QDate, Qt
+from PySide6.QtGui import QColor
+
+from core.event_log import (
+    BASARISIZ_SONUCLAR, SONUC_CALINDI, SONUC_ENGELLENDI, SONUC_GEC_CALINDI, SONUC_HATA,
+    SONUC_KACIRILDI, TUR_ACIL, TUR_MANUEL, TUR_MUZIK, TUR_OTOMATIK, OlayGunlugu
+)
+
+
+TUR_ADLARI = {
+    TUR_OTOMATIK: "Otomatik",
+    TUR_MANUEL: "Manuel",
+    TUR_ACIL: "Acil durum",
+    TUR_MUZIK: "Müzik"
+}
+
+SONUC_ADLARI = {
+    SONUC_CALINDI: "Çalındı",
+    SONUC_GEC_CALINDI: "Geç çalındı",
+    SONUC_KACIRILDI: "Kaçırıldı",
+    SONUC_ENGELLENDI: "Engellendi (zil kapalı / tatil)",
+    SONUC_HATA: "Çalınamadı"
+}
+
+# Satır renkleri
+SONUC_RENKLERI = {
+    SONUC_GEC_CALINDI: "#fff3e0",
+    SONUC_KACIRILDI: "#ffebee",
+    SONUC_ENGELLENDI: "#eeeeee",
+    SONUC_HATA: "#ffebee"
+}
+
+# Süzgeç seçenekleri: (ad, türler)
+SUZGECLER = [
+    ("Tüm olaylar", None),
+    ("Otomatik ziller", [TUR_OTOMATIK]),
+    ("Elle çalınanlar", [TUR_MANUEL]),
+    ("Acil durum", [TUR_ACIL]),
+    ("Teneffüs müziği", [TUR_MUZIK])
+]
+
+
+class GecmisPenceresi(QDialog):
+    """Zil geçmişi: seçilen günün olayları veya seçilen ayın kaçırılan/çalınamayan zilleri"""
+    
+    def __init__(self, olaylar: OlayGunlugu, parent=None):
+        super().__init__(parent)
+        self.olaylar = olaylar
+        self.setWindowTitle("Zil Geçmişi")
+        self.resize(860, 560)
+        self._setup_ui()
+        self._yukle()
+    
+    def _setup_ui(self):
+        layout = QVBoxLayout()
+        
+        ust_layout = QHBoxLayout()
+        ust_layout.addWidget(QLabel("Tarih:"))
+        self.tarih_edit = QDateEdit(QDate.currentDate())
+        self.tarih_edit.setCalendarPopup(True)
+        self.tarih_edit.setDisplayFormat("dd.MM.yyyy")
+        self.tarih_edit.dateChanged.connect(self._yukle)
+        ust_layout.addWidget(self.tarih_edit)
+        
+        self.suzgec_combo = QComboBox()
+        for ad, _ in SUZGECLER:
+            self.suzgec_combo.addItem(ad)
+        self.suzgec_combo.currentIndexChanged.connect(self._yukle)
+        ust_layout.addWidget(self.suzgec_combo)
+        
+        self.btn_hatalar = QPushButton("Ayın Hataları")
+        self.btn_hatalar.setCheckable(True)
+        self.btn_hatalar.setToolTip("Seçilen ayda kaçırılan veya çalınamayan ziller")
+        self.btn_hatalar.toggled.connect(self._yukle)
+        ust_layout.addWidget(self.btn_hatalar)
+        ust_layout.addStretch()
+        layout.addLayout(ust_layout)
+        
+        self.table = QTableWidget(0, 7)
+        self.table.setHorizontalHeaderLabels(["Zaman", "Tür", "Açıklama", "Planlanan", "Gecikme", "Sonuç", "Mod"])
+        self.table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        self.table.setSelectionBehavior(QTableWidget.SelectionBehavior.SelectRows)
+        self.table.verticalHeader().setVisible(False)
+        header = self.table.horizontalHeader()
+        header.setSectionResizeMode(QHeaderView.ResizeMode.ResizeToContents)
+        header.setSectionResizeMode(2, QHeaderView.ResizeMode.Stretch)
+        layout.addWidget(self.table, 1)
+        
+        alt_layout = QHBoxLayout()
+        self.ozet_label = QLabel("")
+        self.ozet_label.setStyleSheet("color: #666;")
+        alt_layout.addWidget(self.ozet_label)
+        alt_layout.addStretch()
+        btn_kapat = QPushButton("Kapat")
+        btn_kapat.clicked.connect(self.accept)
+        alt_layout.addWidget(btn_kapat)
+        layout.addLayout(alt_layout)
+        
+        self.setLayout(layout)
+    
+    def _yukle(self):
+        secili = self.tarih_edit.date()
+        tarih = date(secili.year(), secili.month(), secili.day())
+        turler = SUZGECLER[self.suzgec_combo.currentIndex()][1]
+        if self.btn_hatalar.isChecked():
+            kayitlar = [k for k in self.olaylar.basarisizlar(tarih.year, tarih.month)
+                        if turler is None or k.get("tur") in turler]
+        else:
+            kayitlar = self.olaylar.gun(tarih, turler)
+        
+        self.table.setRowCount(len(kayitlar))
+        for satir, kayit in enumerate(kayitlar):
+            zaman = datetime.fromisoformat(kayit["zaman"])
+            planlanan = kayit.get("planlanan")
+            gecikme = kayit.get("gecikme_ms")
+            hucreler = [
+                zaman.strftime("%d.%m %H:%M:%S") if self.btn_hatalar.isChecked() else zaman.strftime("%H:%M:%S"),
+                TUR_ADLARI.get(kayit.get("tur"), kayit.get("tur", "")),
+                kayit.get("aciklama", ""),
+                datetime.fromisoformat(planlanan).strftime("%d.%m %H:%M") if planlanan else "",
+                f"{gecikme / 1000:.1f} sn" if gecikme is not None else "",
+                SONUC_ADLARI.get(kayit.get("sonuc"), kayit.get("sonuc", "")),
+                kayit.get("mod", "")
+            ]
+            renk = SONUC_RENKLERI.get(kayit.get("sonuc"))
+            for sutun, metin in enumerate(hucreler):
+                item = QTableWidgetItem(metin)
+                if sutun != 2:
+                    item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
+                if renk:
+                    item.setBackground(QColor(renk))
+                self.table.setItem(satir, sutun, item)
+        
+        basarisiz = sum(1 for k in kayitlar if k.get("sonuc") in BASARISIZ_SONUCLAR)
+        self.ozet_label.setText(f"{len(kayitlar)} olay, {basarisiz} kaçırılan/çalınamayan")
@@ -0,0 +1,271 @@
+"""
+Log görüntüleyici - Etkin logu canlı izler, eski bölümleri açar ve tüm bölümlerde arar
+"""
+from array import array
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from PySide6.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QComboBox, QLineEdit,
+    QTableView, QHeaderView, QAbstractItemView
+)
+from PySide6.QtCore import QAbstractTableModel, QModelIndex, Qt, QTimer, Signal
+from PySide6.QtGui import QColor
+
+from core.log_reader import EN_FAZLA_SONUC, LogTakibi, ara, bolum_oku, satir_baslangiclari
+from core.logger import LOG_DOSYASI, segmentler
+
+
+# Etkin log bu aralıkla yeni satırlar için yoklanır
+TAKIP_MS = 1000
+
+# Süzgeç seçenekleri: (ad, satırda aranan etiket)
+SUZGECLER = [
+    ("Tümü", ""),
+    ("Otomatik", "[OTOMATIK]"),
+    ("Manuel", "[MANUEL]"),
+    ("Sistem", "[SISTEM]"),
+    ("Uyarı", "[UYARI]"),
+    ("Hata", "[HATA]")
+]
+
+SEVIYE_RENKLERI = {
+    "ERROR": QColor("#c62828"),
+    "WARNING": QColor("#ef6c00")
+}
+
+# Dosya okuma ve arama GUI thread'ini bekletmez
+_okuyucu = ThreadPoolExecutor(max_workers=1, thread_name_prefix="log-okuyucu")
+
+
+class LogModeli(QAbstractTableModel):
+    """Log satırlarını tek bir bayt tamponunda tutan model
+    
+    Satırlar yalnızca başlangıç konumlarıyla indekslenir; bir satır ancak görünüme
+    girdiğinde çözülüp sütunlarına ayrılır. Böylece yüz binlerce satır akıcı kaydırılır.
+    """
+    
+    SUTUNLAR = ["Zaman", "Seviye", "Mesaj"]
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._veri = bytearray()
+        self._baslangiclar = array('Q')
+    
+    def ayarla(self, veri: bytes):
+        """Tüm satırları değiştir"""
+        self.beginResetModel()
+        self._veri = bytearray(veri)
+        self._baslangiclar = satir_baslangiclari(self._veri)
+        self.endResetModel()
+    
+    def ekle(self, veri: bytes):
+        """Sona yeni satırlar ekle (veri tam satırlardan oluşmalı)"""
+        yeni = satir_baslangiclari(veri)
+        if not yeni:
+            return
+        taban = len(self._veri)
+        ilk = len(self._baslangiclar)
+        self.beginInsertRows(QModelIndex(), ilk, ilk + len(yeni) - 1)
+        self._veri.extend(veri)
+        self._baslangiclar.extend(taban + konum for konum in yeni)
+        self.endInsertRows()
+    
+    def _satir(self, no: int) -> str:
+        bas = self._baslangiclar[no]
+        bit = self._baslangiclar[no + 1] - 1 if no + 1 < len(self._baslangiclar) else len(self._veri) - 1
+        return self._veri[bas:bit].decode("utf-8", "replace").rstrip("\r")
+    
+    @staticmethod
+    def _parcala(satir: str):
+        """[TARIH SAAT] [SEVIYE] Mesaj -> (zaman, seviye, mesaj)"""
+        if satir.startswith("[") and satir[20:23] == "] [":
+            son = satir.find("] ", 23)
+            if son > 0:
+                return satir[1:20], satir[23:son], satir[son + 2:]
+        return "", "", satir
+    
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._baslangiclar)
+    
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.SUTUNLAR)
+    
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        if role == Qt.ItemDataRole.DisplayRole:
+            return self._parcala(self._satir(index.row()))[index.column()]
+        if role == Qt.ItemDataRole.ForegroundRole:
+            return SEVIYE_RENKLERI.get(self._parcala(self._satir(index.row()))[1])
+        return None
+    
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if orientation == Qt.Orientation.Horizontal and role == Qt.ItemDataRole.DisplayRole:
+            return self.SUTUNLAR[section]
+        return None
+
+
+class LogGoruntuleyici(QDialog):
+    """logs/ klasöründeki zil logunun görüntüleyicisi
+    
+    Etkin log okunduğu konumdan devam edilerek izlenir, yalnızca yeni satırlar eklenir.
+    Arama ve süzgeç tüm bölümlerde (sıkıştırılmış eski bölümler dahil) arka planda yapılır.
+    """
+    
+    _yuklendi = Signal(int, object)  # (istek no, bayt) - arka plandan GUI thread'ine
+    
+    def __init__(self, log_dir: Path, parent=None):
+        super().__init__(parent)
+        self.log_dir = Path(log_dir)
+        self.takip = LogTakibi(self.log_dir / LOG_DOSYASI)
+        # Her yükleme/aramada artar; eski isteklerin sonucu yok sayılır, süren arama kesilir
+        self._istek_no = 0
+        self.setWindowTitle("Zil Logları")
+        self.resize(900, 600)
+        self._setup_ui()
+        self._yuklendi.connect(self._on_yuklendi)
+        
+        self.takip_timer = QTimer(self)
+        self.takip_timer.setInterval(TAKIP_MS)
+        self.takip_timer.timeout.connect(self._takip_et)
+        self.finished.connect(lambda _: self._durdur())
+        
+        self._bolumleri_listele()
+        self._goster()
+    
+    def _setup_ui(self):
+        layout = QVBoxLayout()
+        
+        ust_layout = QHBoxLayout()
+        ust_layout.addWidget(QLabel("Bölüm:"))
+        self.bolum_combo = QComboBox()
+        self.bolum_combo.setMinimumWidth(220)
+        self.bolum_combo.currentIndexChanged.connect(self._goster)
+        ust_layout.addWidget(self.bolum_combo)
+        
+        self.suzgec_combo = QComboBox()
+        for ad, _ in SUZGECLER:
+            self.suzgec_combo.addItem(ad)
+        self.suzgec_combo.currentIndexChanged.connect(self._goster)
+        ust_layout.addWidget(self.suzgec_combo)
+        
+        self.arama_edit = QLineEdit()
+        self.arama_edit.setPlaceholderText("Tüm loglarda ara (Enter)")
+        self.arama_edit.returnPressed.connect(self._goster)
+        ust_layout.addWidget(self.arama_edit, 1)
+        
+        btn_temizle = QPushButton("Temizle")
+        btn_temizle.clicked.connect(self._aramayi_temizle)
+        ust_layout.addWidget(btn_temizle)
+        layout.addLayout(ust_layout)
+        
+        self.model = LogModeli(self)
+        self.view = QTableView()
+        self.view.setModel(self.model)
+        self.view.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.view.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.view.setWordWrap(False)
+        # Sabit satır yüksekliği ve sütun genişlikleri: görünüm tüm satırları ölçmez
+        dikey = self.view.verticalHeader()
+        dikey.setVisible(False)
+        dikey.setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
+        dikey.setDefaultSectionSize(self.view.fontMetrics().height() + 6)
+        yatay = self.view.horizontalHeader()
+        yatay.setSectionResizeMode(QHeaderView.ResizeMode.Interactive)
+        yatay.setStretchLastSection(True)
+        self.view.setColumnWidth(0, 150)
+        self.view.setColumnWidth(1, 80)
+        layout.addWidget(self.view, 1)
+        
+        alt_layout = QHBoxLayout()
+        self.durum_label = QLabel("")
+        self.durum_label.setStyleSheet("color: #666;")
+        alt_layout.addWidget(self.durum_label)
+        alt_layout.addStretch()
+        btn_kapat = QPushButton("Kapat")
+        btn_kapat.clicked.connect(self.accept)
+        alt_layout.addWidget(btn_kapat)
+        layout.addLayout(alt_layout)
+        
+        self.setLayout(layout)
+    
+    def _bolumleri_listele(self):
+        self.bolum_combo.blockSignals(True)
+        self.bolum_combo.clear()
+        self.bolum_combo.addItem("Güncel log", None)
+        for yol in reversed(segmentler(self.log_dir)):
+            if yol.name != LOG_DOSYASI:
+                self.bolum_combo.addItem(yol.name, str(yol))
+        self.bolum_combo.blockSignals(False)
+    
+    def _goster(self):
+        """Seçilen bölümü veya arama sonuçlarını yükle"""
+        self._istek_no += 1
+        no = self._istek_no
+        self.takip_timer.stop()
+        metin = self.arama_edit.text().strip()
+        etiket = SUZGECLER[self.suzgec_combo.currentIndex()][1]
+        bolum = self.bolum_combo.currentData()
+        
+        if metin or etiket:
+            # Süzgeç/arama: bölümler yeniden eskiye taranır, en yeni eşleşmeler gösterilir
+            self._arama = True
+            self.durum_label.setText("Aranıyor...")
+            bolumler = segmentler(self.log_dir)
+            iptal = lambda: self._istek_no != no
+            gelecek = _okuyucu.submit(lambda: b"".join(s + b"\n" for s in ara(bolumler, metin, etiket, iptal)))
+        elif bolum is None:
+            # Güncel log baştan okunur, sonra yalnızca eklenenler izlenir
+            self._arama = False
+            self.takip = LogTakibi(self.log_dir / LOG_DOSYASI)
+            gelecek = _okuyucu.submit(self._takip_baslat)
+        else:
+            self._arama = False
+            gelecek = _okuyucu.submit(bolum_oku, Path(bolum))
+        gelecek.add_done_callback(
+            lambda g: self._yuklendi.emit(no, b"" if g.exception() else g.result())
+        )
+    
+    def _takip_baslat(self) -> bytes:
+        veri = self.takip.yeni_satirlar()
+        return veri or b""
+    
+    def _on_yuklendi(self, no: int, veri: bytes):
+        if no != self._istek_no:
+            return
+        self.model.ayarla(veri)
+        self.view.scrollToBottom()
+        satir = self.model.rowCount()
+        if self._arama:
+            ek = f" (en yeni {EN_FAZLA_SONUC})" if satir >= EN_FAZLA_SONUC else ""
+            self.durum_label.setText(f"{satir} satır bulundu{ek}")
+        else:
+            self.durum_label.setText(f"{satir} satır")
+        if not self._arama and self.bolum_combo.currentData() is None:
+            self.takip_timer.start()
+    
+    def _takip_et(self):
+        """Etkin loga eklenen satırları modele ekle (en alttaysa kaydırarak)"""
+        veri = self.takip.yeni_satirlar()
+        if veri is None:
+            # Log döndü: yeni bölüm listeye eklenir, güncel log baştan okunur
+            self._bolumleri_listele()
+            self._goster()
+            return
+        if not veri:
+            return
+        kaydir = self.view.verticalScrollBar().value() == self.view.verticalScrollBar().maximum()
+        self.model.ekle(veri)
+        if kaydir:
+            self.view.scrollToBottom()
+        self.durum_label.setText(f"{self.model.rowCount()} satır")
+    
+    def _aramayi_temizle(self):
+        self.arama_edit.clear()
+        self.suzgec_combo.setCurrentIndex(0)
+        self._goster()
+    
+    def _durdur(self):
+        self.takip_timer.stop()
+        # Süren arama bir sonraki kontrolde kesilir
+        self._istek_no += 1
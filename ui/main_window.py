@@ -3,20 +3,40 @@ Ana pencere - Tek bakışta her şey
 """
 from datetime import datetime, timedelta
 from pathlib import Path
+from typing import Optional
 from PySide6.QtWidgets import (
     QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QLabel,
     QPushButton, QGridLayout, QMessageBox, QTableWidget, QTableWidgetItem,
     QHeaderView, QFrame
 )
-from PySide6.QtCore import QTimer, Qt, Signal, QRect, QPoint
-from PySide6.QtGui import QFont, QIcon, QPixmap, QPainter, QColor, QScreen, QPolygon
+from PySide6.QtCore import QTimer, Qt, Signal, QRect, QPoint, QEvent
+from PySide6.QtGui import QFont, QIcon, QPixmap, QPainter, QColor, QScreen, QPolygon, QShortcut, QKeySequence
 
+from core.audio_cache import VARSAYILAN_BUTCE_MB
+from core.break_music import TeneffusMuzigi
+from core.emergency import ACIL_SIREN, ACIL_SIREN_MARS, TURLER, AcilDurum
+from core.event_log import (
+    SONUC_CALINDI, SONUC_ENGELLENDI, SONUC_GEC_CALINDI, SONUC_HATA, SONUC_KACIRILDI,
+    TUR_ACIL, TUR_MANUEL, TUR_MUZIK, TUR_OTOMATIK
+)
+from core.hotkey import GenelKisayollar
+from core.ipc import KomutSunucusu
+from core.loudness import VARSAYILAN_HEDEF_LUFS
+from core.metrics import ARALIK_TOPLAM, ASAMA_TETIK
 from core.scheduler import Scheduler
-from core.sound_player import SoundPlayer
+from core.sound_player import CalmaOgesi, SoundPlayer
 from core.state_manager import StateManager, ZilModu, ZilDurumu
 from core.logger import ZilLogger
+from core.persistence import writer_for
+from core.settings_store import SettingsStore
+from core.sound_library import SesKutuphanesi
+from core.timeline import ses_dosyalari
 from ui.settings_window import SettingsWindow
 from ui.schedule_editor import ScheduleEditor
+from ui.metrics_window import OlcumlerPenceresi
+from ui.history_window import GecmisPenceresi
+from ui.log_viewer import LogGoruntuleyici
+from ui.report_window import MutabakatPenceresi
 
 
 class MainWindow(QMainWindow):
@@ -27,12 +47,48 @@ class MainWindow(QMainWindow):
         
         # Core bileşenler
         self.logger = ZilLogger()
+        self.settings = SettingsStore.instance()
         self.state_manager = StateManager()
         self.sound_player = SoundPlayer()
         self.scheduler = Scheduler()
         
         # Scheduler sinyallerini bağla
         self.scheduler.zil_calindi.connect(self._on_zil_calindi)
+        self.scheduler.zil_kacirildi.connect(self._on_zil_kacirildi)
+        self.scheduler.zaman_atlamasi.connect(self._on_zaman_atlamasi)
+        self.scheduler.program_yenilendi.connect(self._on_program_yenilendi)
+        self.scheduler.zil_yaklasiyor.connect(self._on_zil_yaklasiyor)
+        self.sound_player.basladi.connect(self._on_ses_basladi)
+        self.sound_player.oge_bulunamadi.connect(self._on_ses_bulunamadi)
+        # Zamanında çalan her zilin planlanan saatten ne kadar sonra duyulduğu
+        self.scheduler.olcumler.olculdu.connect(self._on_zil_olculdu)
+        self.scheduler.olay_kacirildi.connect(self._on_olay_kacirildi)
+        # Teneffüslerde sounds/muzik_yayini/ çalınır (ayarlardan açılır)
+        self.muzik = TeneffusMuzigi(self.sound_player, self.sound_player.sounds_dir / "muzik_yayini")
+        self.muzik.parca_basladi.connect(self._on_muzik_basladi)
+        # Acil durum sireni bellekte hazır bekler; tepsi menüsü, kısayol ve yerel komutla da çalar
+        self.acil = AcilDurum(self.sound_player, self.settings)
+        self.acil.calindi.connect(self._on_acil_calindi)
+        self.genel_kisayollar = GenelKisayollar()
+        self.genel_kisayollar.tetiklendi.connect(lambda tur: self.acil_tetikle(tur, "kısayol"))
+        self._uygulama_kisayollari = []
+        self.komut_sunucusu = KomutSunucusu()
+        for tur in TURLER:
+            self.komut_sunucusu.ekle(tur, lambda t=tur: self.acil_tetikle(t, "komut"))
+        self.komut_sunucusu.ekle("durdur", self._komutla_durdur)
+        self.komut_sunucusu.baslat()
+        # sounds/ klasöründe dosya silinir/eklenirse eksik dosyalar yeniden denetlenir
+        self._bildirilen_eksikler = set()
+        self.sound_player.indeks.degisti.connect(self._eksik_sesleri_bildir)
+        
+        # Ses kütüphanesi (süre, biçim, seviye) arka planda taranır; açılış beklemez
+        self.kutuphane = SesKutuphanesi.instance()
+        self.sound_player.indeks.degisti.connect(self.kutuphane.tara)
+        self.kutuphane.tara()
+        
+        # Arka plan kayıt hatalarını logla
+        writer_for(self.scheduler.schedule_file).hata.connect(self._on_kayit_hatasi)
+        writer_for(self.settings.settings_file).hata.connect(self._on_kayit_hatasi)
         
         # Zamanlayıcılar
         self.clock_timer = QTimer()
@@ -45,13 +101,13 @@ class MainWindow(QMainWindow):
         
         self._setup_ui()
         self._load_settings()
+        self.settings.degisti.connect(self._load_settings)
         
         # Ekran boyutuna göre pencere boyutunu ayarla
         self._adjust_window_size()
         
-        # Scheduler'ı başlat
-        if self.state_manager.zil_calabilir_mi():
-            self.scheduler.start()
+        # Scheduler zil kapalıyken de çalışır; o sürede gelen ziller engellendi olarak kaydedilir
+        self.scheduler.start()
         
         self.logger.log_sistem("Uygulama başlatıldı")
     
@@ -660,6 +716,30 @@ class MainWindow(QMainWindow):
         self.btn_ayarlar.clicked.connect(self._show_settings)
         bottom_layout.addWidget(self.btn_ayarlar)
         
+        self.btn_olcumler = QPushButton("Ölçümler")
+        self.btn_olcumler.setStyleSheet("padding: 8px; font-size: 11px; font-weight: bold; border-radius: 5px;")
+        self.btn_olcumler.setToolTip("Zillerin planlanan saate göre gecikmeleri")
+        self.btn_olcumler.clicked.connect(self._show_olcumler)
+        bottom_layout.addWidget(self.btn_olcumler)
+        
+        self.btn_gecmis = QPushButton("Geçmiş")
+        self.btn_gecmis.setStyleSheet("padding: 8px; font-size: 11px; font-weight: bold; border-radius: 5px;")
+        self.btn_gecmis.setToolTip("Çalan, kaçırılan ve çalınamayan ziller")
+        self.btn_gecmis.clicked.connect(self._show_gecmis)
+        bottom_layout.addWidget(self.btn_gecmis)
+        
+        self.btn_loglar = QPushButton("Loglar")
+        self.btn_loglar.setStyleSheet("padding: 8px; font-size: 11px; font-weight: bold; border-radius: 5px;")
+        self.btn_loglar.setToolTip("Zil loglarını izle ve ara")
+        self.btn_loglar.clicked.connect(self._show_loglar)
+        bottom_layout.addWidget(self.btn_loglar)
+        
+        self.btn_rapor = QPushButton("Rapor")
+        self.btn_rapor.setStyleSheet("padding: 8px; font-size: 11px; font-weight: bold; border-radius: 5px;")
+        self.btn_rapor.setToolTip("Programdaki zillerin çalıp çalmadığı (mutabakat raporu)")
+        self.btn_rapor.clicked.connect(self._show_rapor)
+        bottom_layout.addWidget(self.btn_rapor)
+        
         left_layout.addLayout(bottom_layout)
         
         # Alt boşluk yok - direkt ekle
@@ -842,7 +922,7 @@ class MainWindow(QMainWindow):
         """Bugünün ders programını tablo olarak göster - Resimdeki gibi: Ders, Giriş Zili, Öğretmen Zili, Çıkış Zili"""
         if not hasattr(self, 'today_schedule_table'):
             return
-            
+        
         simdi = datetime.now()
         simdiki_saat = simdi.time()
         gun_adi = self._get_day_name(simdi.weekday())
@@ -976,52 +1056,171 @@ class MainWindow(QMainWindow):
     
     def _on_zil_calindi(self, zil_tipi: str, aciklama: str, ses_dosyasi: str, anons_dosyasi: str = ""):
         """Otomatik zil çalındığında"""
+        gonderilen = list(self.scheduler.gonderilen)
         # Zil durumu kontrolü - eğer kapalıysa veya tatil modundaysa çalma
         if not self.state_manager.zil_calabilir_mi():
+            self.scheduler.olcumler.iptal()
             self.logger.log_uyari(f"Zil çalınmadı (Durum: {self.state_manager.durum.value}, Mod: {self.state_manager.mod.value})")
+            self._zilleri_kaydet(gonderilen, SONUC_ENGELLENDI)
             return
         
-        # Ses seviyesini ayarla
-        ses_seviyesi = 100
-        settings = self._get_settings()
-        volumes = settings.get("volumes", {})
-        
-        if zil_tipi == "ogrenci_giris":
-            ses_seviyesi = volumes.get("ogrenci", 100)
-        elif zil_tipi == "ogretmen_giris":
-            ses_seviyesi = volumes.get("ogretmen", 100)
-        elif zil_tipi == "ders_cikis":
-            ses_seviyesi = volumes.get("ogrenci", 100)
-        
-        # Zil sesini çal
-        if self.sound_player.play(ses_dosyasi, ses_seviyesi):
-            self.logger.log_otomatik(f"{datetime.now().strftime('%H:%M')} {aciklama}")
-            
-            # Zil bittikten sonra anons çal
-            if anons_dosyasi:
-                def play_anons_after_zil():
-                    # Zil bittikten sonra anons çal
-                    if self.sound_player.play(anons_dosyasi, ses_seviyesi):
-                        self.logger.log_otomatik(f"{datetime.now().strftime('%H:%M')} Anons çalındı: {anons_dosyasi}")
-                
-                # Zil bittiğinde anons çal
-                self.sound_player.finished.connect(play_anons_after_zil)
+        # Zil sesini, varsa ardından anonsu çal (bulunamayan dosya ayrıca loglanır)
+        ses_seviyesi = self._zil_seviyesi(zil_tipi)
+        ogeler = [CalmaOgesi(ses_dosyasi, ses_seviyesi, aciklama=aciklama)]
+        if anons_dosyasi:
+            ogeler.append(CalmaOgesi(anons_dosyasi, ses_seviyesi, self._sira_boslugu(),
+                                     f"Anons çalındı: {anons_dosyasi}"))
+        
+        # Aynı tick'te birleştirilen zillerin farklı sesleri ve anonsları aynı oturumda sıraya girer;
+        # her zil kendi sesi çalmaya başlayınca çalındı sayılır
+        bekleyenler = {}
+        for zaman, olay in gonderilen:
+            bekleyenler.setdefault(olay.ses, []).append((zaman, olay))
+        dosyalar = {oge.dosya for oge in ogeler}
+        for _, olay in gonderilen:
+            seviye = self._zil_seviyesi(olay.tip)
+            if olay.ses not in dosyalar:
+                dosyalar.add(olay.ses)
+                aciklamalar = dict.fromkeys(o.aciklama for _, o in bekleyenler[olay.ses])
+                ogeler.append(CalmaOgesi(olay.ses, seviye, self._sira_boslugu(), " + ".join(aciklamalar)))
+            if olay.anons and olay.anons not in dosyalar:
+                dosyalar.add(olay.anons)
+                ogeler.append(CalmaOgesi(olay.anons, seviye, self._sira_boslugu(), f"Anons çalındı: {olay.anons}"))
+        
+        dakika_basi = datetime.now().replace(second=0, microsecond=0)
+        
+        def ses_basladi(oge: CalmaOgesi):
+            self._zilleri_kaydet(bekleyenler.pop(oge.dosya, []), SONUC_CALINDI, dakika_basi)
+        
+        def oturum_bitti(oturum):
+            # Sesi hiç başlamayan ziller: dosya bulunamadı, oturum durduruldu veya kesildi
+            for ziller in bekleyenler.values():
+                self._zilleri_kaydet(ziller, SONUC_HATA)
+            bekleyenler.clear()
+        
+        if not self._sirayla_cal(ogeler, self.logger.log_otomatik, her_ogede=ses_basladi, bitince=oturum_bitti):
+            self.scheduler.olcumler.iptal()
+    
+    def _zil_seviyesi(self, zil_tipi: str) -> int:
+        """Zil tipine göre ayarlardaki ses seviyesi"""
+        if zil_tipi in ("ogrenci_giris", "ders_cikis"):
+            return self.settings.volume("ogrenci")
+        if zil_tipi == "ogretmen_giris":
+            return self.settings.volume("ogretmen")
+        return 100
+    
+    def _zilleri_kaydet(self, ziller, sonuc: str, dakika_basi: Optional[datetime] = None):
+        """Gönderilen zillerin sonucunu olay kaydına ve zamanlayıcının zil günlüğüne yaz
+        
+        dakika_basi verilirse ondan önce planlanmış (kaçırılıp tolerans içinde geç çalınan)
+        ziller geç çalındı olarak yazılır.
+        """
+        for zaman, olay in ziller:
+            zil_sonucu = SONUC_GEC_CALINDI if dakika_basi is not None and zaman < dakika_basi else sonuc
+            self._zil_olayi_kaydet(zaman, olay, zil_sonucu)
+            self.scheduler.sonuc_kaydet(zaman, olay, zil_sonucu)
+    
+    def _zil_olayi_kaydet(self, zaman: datetime, olay, sonuc: str):
+        self.logger.olay(
+            TUR_OTOMATIK, sonuc, olay.aciklama, olay.ses, planlanan=zaman, ders=olay.ders,
+            vardiya=olay.vardiya, tip=olay.tip, mod=self.state_manager.mod.value
+        )
+    
+    def _on_olay_kacirildi(self, zaman: datetime, olay):
+        # Zil kapalıyken veya tatil modunda kaçırılan zil zaten çalmayacaktı
+        sonuc = SONUC_KACIRILDI if self.state_manager.zil_calabilir_mi() else SONUC_ENGELLENDI
+        self._zil_olayi_kaydet(zaman, olay, sonuc)
+    
+    def _olay_kaydet(self, tur: str, calindi: bool, aciklama: str, ses: str = ""):
+        """Elle, acil durumda veya teneffüste çalınan sesin olay kaydı"""
+        self.logger.olay(tur, SONUC_CALINDI if calindi else SONUC_HATA, aciklama, ses,
+                         mod=self.state_manager.mod.value)
+    
+    def _on_zil_olculdu(self, aciklama: str, araliklar: dict):
+        self.logger.log_sistem(
+            f"Zil zamanlaması: {aciklama} planlanan saatten {araliklar[ARALIK_TOPLAM]:.0f} ms sonra başladı "
+            f"(zamanlayıcı {araliklar[ASAMA_TETIK]:.0f} ms)"
+        )
+    
+    def _on_zil_yaklasiyor(self, zil_tipi: str, ses_dosyasi: str):
+        """Zilden birkaç saniye önce ses dosyasını yükle ve ses cihazını aç"""
+        if self.state_manager.zil_calabilir_mi():
+            self.sound_player.hazirla(ses_dosyasi)
+    
+    def _sirayla_cal(self, ogeler, kayit, tur: str = "", her_ogede=None, bitince=None) -> bool:
+        """Sesleri arka arkaya çal; her ses başladığında açıklaması verilen log fonksiyonuyla yazılır
+        
+        Log geri çağırması oturuma aittir, oturum bitince bırakılır. Tür verilirse her ses
+        olay günlüğüne de eklenir, hiçbiri çalınamazsa ilk sesin hatası eklenir. her_ogede ve
+        bitince verilirse oturumun kendi geri çağırmalarına eklenir.
+        """
+        def oge_basladi(oge: CalmaOgesi):
+            self._oge_kaydet(kayit, oge, tur)
+            if her_ogede is not None:
+                her_ogede(oge)
+        
+        oturum = self.sound_player.cal_sirayla(ogeler, her_ogede=oge_basladi, bitince=bitince)
+        if tur and not oturum.calindi:
+            self._olay_kaydet(tur, False, ogeler[0].aciklama, ogeler[0].dosya)
+        return oturum.calindi
+    
+    def _sira_boslugu(self) -> int:
+        """Sıralı çalınan sesler arasındaki sessizlik (ms)"""
+        try:
+            return max(0, int(self.settings.system("sira_boslugu_ms", 0)))
+        except (TypeError, ValueError):
+            return 0
+    
+    def _oge_kaydet(self, kayit, oge: CalmaOgesi, tur: str = ""):
+        if oge.aciklama:
+            kayit(f"{datetime.now().strftime('%H:%M')} {oge.aciklama}")
+        if tur:
+            self._olay_kaydet(tur, True, oge.aciklama, oge.dosya)
+    
+    def _on_ses_bulunamadi(self, dosya: str):
+        self.logger.log_hata(f"Ses dosyası bulunamadı: {dosya}")
+    
+    def _on_ses_basladi(self, gecikme_ms: float, hazirdan: bool):
+        """play() çağrısından sesin duyulmasına kadar geçen süre"""
+        self.logger.log_sistem(f"Ses başlama gecikmesi: {gecikme_ms:.0f} ms ({'hazırlanmış' if hazirdan else 'hazırlıksız'})")
+    
+    def _on_zil_kacirildi(self, saat: str, aciklama: str, sonuc: str):
+        """Bilgisayar uyurken veya saat değişirken geçen zil"""
+        if sonuc == "gec_calindi":
+            self.logger.log_uyari(f"Kaçırılan zil geç çalınıyor: {saat} {aciklama}")
         else:
-            self.logger.log_hata(f"Ses dosyası bulunamadı: {ses_dosyasi}")
+            self.logger.log_uyari(f"Zil kaçırıldı: {saat} {aciklama}")
+    
+    def _on_zaman_atlamasi(self, tur: str, saniye: float):
+        """Saat ayarı değişikliği veya uyku/duraklama algılandı"""
+        aciklamalar = {
+            "saat_ileri": "Sistem saati ileri alındı",
+            "saat_geri": "Sistem saati geri alındı",
+            "duraklama": "Uyku/duraklama algılandı"
+        }
+        self.logger.log_uyari(f"{aciklamalar.get(tur, tur)} ({saniye:.0f} sn)")
+    
+    def _on_program_yenilendi(self, gunler: list):
+        """schedule.json dışarıdan değişti ve yeniden yüklendi"""
+        self.logger.log_sistem(f"Zil programı güncellendi: {', '.join(gunler)}")
+        self._update_today_schedule()
+        self._sesleri_hazirla()
+    
+    def _on_kayit_hatasi(self, dosya: str, mesaj: str):
+        """Arka planda yapılan dosya kaydı başarısız oldu"""
+        self.logger.log_hata(f"{Path(dosya).name} kaydedilemedi: {mesaj}")
     
     def _play_ogrenci_manuel(self):
         """Manuel öğrenci zili çal"""
         # Önce mevcut sesi durdur
         self.sound_player.stop()
         
-        settings = self._get_settings()
-        sounds = settings.get("sounds", {})
-        volumes = settings.get("volumes", {})
-        
-        dosya = sounds.get("ogrenci", "ziller/zil1.mp3")
-        ses_seviyesi = volumes.get("ogrenci", 100)
+        dosya = self.settings.sound("ogrenci", "ziller/zil1.mp3")
+        ses_seviyesi = self.settings.volume("ogrenci")
         
-        if self.sound_player.play(dosya, ses_seviyesi):
+        calindi = self.sound_player.play(dosya, ses_seviyesi)
+        self._olay_kaydet(TUR_MANUEL, calindi, "Öğrenci zili çalındı", dosya)
+        if calindi:
             self.logger.log_manuel(f"{datetime.now().strftime('%H:%M')} Öğrenci zili çalındı")
         else:
             QMessageBox.warning(self, "Hata", f"Ses dosyası bulunamadı:\n{dosya}")
@@ -1031,14 +1230,12 @@ class MainWindow(QMainWindow):
         # Önce mevcut sesi durdur
         self.sound_player.stop()
         
-        settings = self._get_settings()
-        sounds = settings.get("sounds", {})
-        volumes = settings.get("volumes", {})
+        dosya = self.settings.sound("ogretmen", "ziller/zil1.mp3")
+        ses_seviyesi = self.settings.volume("ogretmen")
         
-        dosya = sounds.get("ogretmen", "ziller/zil1.mp3")
-        ses_seviyesi = volumes.get("ogretmen", 100)
-        
-        if self.sound_player.play(dosya, ses_seviyesi):
+        calindi = self.sound_player.play(dosya, ses_seviyesi)
+        self._olay_kaydet(TUR_MANUEL, calindi, "Öğretmen zili çalındı", dosya)
+        if calindi:
             self.logger.log_manuel(f"{datetime.now().strftime('%H:%M')} Öğretmen zili çalındı")
         else:
             QMessageBox.warning(self, "Hata", f"Ses dosyası bulunamadı:\n{dosya}")
@@ -1048,26 +1245,23 @@ class MainWindow(QMainWindow):
         # Önce mevcut sesi durdur
         self.sound_player.stop()
         
-        settings = self._get_settings()
-        sounds = settings.get("sounds", {})
-        volumes = settings.get("volumes", {})
-        
-        dosya = sounds.get("cikis", "ziller/zil1.mp3")
-        ses_seviyesi = volumes.get("cikis", 100)
+        dosya = self.settings.sound("cikis", "ziller/zil1.mp3")
+        ses_seviyesi = self.settings.volume("cikis")
         
-        if self.sound_player.play(dosya, ses_seviyesi):
+        calindi = self.sound_player.play(dosya, ses_seviyesi)
+        self._olay_kaydet(TUR_MANUEL, calindi, "Çıkış zili çalındı", dosya)
+        if calindi:
             self.logger.log_manuel(f"{datetime.now().strftime('%H:%M')} Çıkış zili çalındı")
         else:
             QMessageBox.warning(self, "Hata", f"Ses dosyası bulunamadı:\n{dosya}")
     
     def _play_manuel(self, tip: str, dosya: str):
         """Manuel zil çal (genel - diğer ziller için)"""
-        settings = self._get_settings()
-        volumes = settings.get("volumes", {})
+        ses_seviyesi = self.settings.volume(tip)
         
-        ses_seviyesi = volumes.get(tip, 100)
-        
-        if self.sound_player.play(dosya, ses_seviyesi):
+        calindi = self.sound_player.play(dosya, ses_seviyesi)
+        self._olay_kaydet(TUR_MANUEL, calindi, f"{tip.upper()} zili çalındı", dosya)
+        if calindi:
             self.logger.log_manuel(f"{datetime.now().strftime('%H:%M')} {tip.upper()} zili çalındı")
         else:
             QMessageBox.warning(self, "Hata", f"Ses dosyası bulunamadı:\n{dosya}")
@@ -1077,113 +1271,94 @@ class MainWindow(QMainWindow):
         # Önce mevcut sesi durdur
         self.sound_player.stop()
         
-        settings = self._get_settings()
-        sounds = settings.get("sounds", {})
-        volumes = settings.get("volumes", {})
-        
-        dosya = sounds.get("mars", "marslar/istiklal.mp3")
-        ses_seviyesi = volumes.get("mars", 100)
+        dosya = self.settings.sound("mars", "marslar/istiklal.mp3")
+        ses_seviyesi = self.settings.volume("mars")
         
-        if self.sound_player.play(dosya, ses_seviyesi):
+        calindi = self.sound_player.play(dosya, ses_seviyesi)
+        self._olay_kaydet(TUR_MANUEL, calindi, "İstiklal Marşı çalındı", dosya)
+        if calindi:
             self.logger.log_manuel(f"{datetime.now().strftime('%H:%M')} İstiklal Marşı çalındı")
         else:
             QMessageBox.warning(self, "Hata", f"Ses dosyası bulunamadı:\n{dosya}")
     
     def _play_siren_manuel(self):
         """Manuel Siren çal"""
-        # Önce mevcut sesi durdur
-        self.sound_player.stop()
-        
-        settings = self._get_settings()
-        sounds = settings.get("sounds", {})
-        volumes = settings.get("volumes", {})
-        
-        dosya = sounds.get("siren", "siren/siren.mp3")
-        ses_seviyesi = volumes.get("siren", 100)
-        
-        if self.sound_player.play(dosya, ses_seviyesi):
-            self.logger.log_manuel(f"{datetime.now().strftime('%H:%M')} Siren çalındı")
-        else:
-            QMessageBox.warning(self, "Hata", f"Ses dosyası bulunamadı:\n{dosya}")
+        if not self.acil_tetikle(ACIL_SIREN, "düğme"):
+            QMessageBox.warning(self, "Hata", f"Ses dosyası bulunamadı:\n{self.acil.ogeler(ACIL_SIREN)[0].dosya}")
     
     def _play_saygi_durusu(self):
         """Saygı duruşu + İstiklal Marşı çal"""
-        # Önce mevcut sesi durdur ve tüm bağlantıları temizle
-        self.sound_player.stop()
-        # Tüm finished signal bağlantılarını temizle
-        try:
-            self.sound_player.finished.disconnect()
-        except:
-            pass
+        sounds = self.settings.sounds()
+        mars_dosya = sounds.get("mars", "marslar/istiklal.mp3")
+        ses_seviyesi = self.settings.volume("mars")
         
-        settings = self._get_settings()
-        sounds = settings.get("sounds", {})
-        volumes = settings.get("volumes", {})
-        
-        # Önce saygı duruşu (varsa)
+        # Önce saygı duruşu (varsa), bitince marş; bulunamazsa doğrudan marş çalar
         saygi = sounds.get("saygi", "")
         if saygi and saygi.strip():
-            ses_seviyesi = volumes.get("mars", 100)
-            if self.sound_player.play(saygi, ses_seviyesi):
-                # Ses bittiğinde marşı çal
-                def play_mars_after_saygi():
-                    self.sound_player.finished.disconnect(play_mars_after_saygi)
-                    mars_dosya = sounds.get("mars", "marslar/istiklal.mp3")
-                    mars_seviyesi = volumes.get("mars", 100)
-                    if self.sound_player.play(mars_dosya, mars_seviyesi):
-                        self.logger.log_manuel(f"{datetime.now().strftime('%H:%M')} İstiklal Marşı çalındı")
-                
-                self.sound_player.finished.connect(play_mars_after_saygi)
-                self.logger.log_manuel(f"{datetime.now().strftime('%H:%M')} Saygı Duruşu başladı")
-            else:
-                # Saygı duruşu dosyası bulunamadı, direkt marşı çal
-                mars_dosya = sounds.get("mars", "marslar/istiklal.mp3")
-                mars_seviyesi = volumes.get("mars", 100)
-                if self.sound_player.play(mars_dosya, mars_seviyesi):
-                    self.logger.log_manuel(f"{datetime.now().strftime('%H:%M')} İstiklal Marşı çalındı")
+            ogeler = [
+                CalmaOgesi(saygi, ses_seviyesi, aciklama="Saygı Duruşu başladı"),
+                CalmaOgesi(mars_dosya, ses_seviyesi, self._sira_boslugu(), "İstiklal Marşı çalındı")
+            ]
         else:
-            # Saygı duruşu yok, direkt marşı çal
-            mars_dosya = sounds.get("mars", "marslar/istiklal.mp3")
-            ses_seviyesi = volumes.get("mars", 100)
-            if self.sound_player.play(mars_dosya, ses_seviyesi):
-                self.logger.log_manuel(f"{datetime.now().strftime('%H:%M')} Saygı Duruşu + İstiklal Marşı çalındı")
+            ogeler = [CalmaOgesi(mars_dosya, ses_seviyesi, aciklama="Saygı Duruşu + İstiklal Marşı çalındı")]
+        self._sirayla_cal(ogeler, self.logger.log_manuel, TUR_MANUEL)
     
     def _play_siren_mars(self):
         """Siren + İstiklal Marşı çal"""
-        # Önce mevcut sesi durdur
-        self.sound_player.stop()
-        
-        settings = self._get_settings()
-        sounds = settings.get("sounds", {})
-        volumes = settings.get("volumes", {})
-        
-        # Önce siren (özel ses dosyası varsa onu kullan)
-        siren_dosya = sounds.get("siren_mars_siren", sounds.get("siren", "siren/siren.mp3"))
-        ses_seviyesi = volumes.get("siren", 100)
-        
-        if self.sound_player.play(siren_dosya, ses_seviyesi):
-            self.logger.log_manuel(f"{datetime.now().strftime('%H:%M')} Siren çalındı")
-            
-            # Siren bittiğinde marşı çal (özel ses dosyası varsa onu kullan)
-            def play_mars_after_siren():
-                self.sound_player.finished.disconnect(play_mars_after_siren)
-                mars_dosya = sounds.get("siren_mars_mars", sounds.get("mars", "marslar/istiklal.mp3"))
-                mars_seviyesi = volumes.get("mars", 100)
-                if self.sound_player.play(mars_dosya, mars_seviyesi):
-                    self.logger.log_manuel(f"{datetime.now().strftime('%H:%M')} İstiklal Marşı çalındı")
-            
-            self.sound_player.finished.connect(play_mars_after_siren)
-        else:
-            QMessageBox.warning(self, "Hata", f"Siren dosyası bulunamadı:\n{siren_dosya}")
+        # Önce siren, bitince marş (özel ses dosyaları varsa onlar kullanılır)
+        if not self.acil_tetikle(ACIL_SIREN_MARS, "düğme"):
+            QMessageBox.warning(self, "Hata", f"Siren dosyası bulunamadı:\n{self.acil.ogeler(ACIL_SIREN_MARS)[0].dosya}")
+    
+    def acil_tetikle(self, tur: str, tetikleyen: str) -> bool:
+        """Çalan her şeyi kesip acil durum sirenini çal (düğmeler, tepsi, kısayollar, yerel komutlar)
+        
+        Returns:
+            Siren çalmaya başladıysa True
+        """
+        oturum = self.acil.tetikle(tur, tetikleyen, lambda oge: self._oge_kaydet(self.logger.log_manuel, oge, TUR_ACIL))
+        if oturum is None:
+            return False
+        if not oturum.calindi:
+            ilk = self.acil.ogeler(tur)[0]
+            self._olay_kaydet(TUR_ACIL, False, ilk.aciklama, ilk.dosya)
+        # Teneffüs müziği ayrı oynatıcıda çalar; bu teneffüs için hemen susturulur
+        self.muzik.durdur(0)
+        return oturum.calindi
+    
+    def _on_acil_calindi(self, tur: str, tetikleyen: str, gecikme_ms: float):
+        ortanca, en_kotu = self.acil.ozet()
+        self.logger.log_sistem(
+            f"Acil durum sireni ({tetikleyen}): tetiklemeden sese {gecikme_ms:.0f} ms "
+            f"(son {len(self.acil.gecikmeler)} tetikleme: ortanca {ortanca:.0f} ms, en kötü {en_kotu:.0f} ms)"
+        )
+    
+    def _komutla_durdur(self) -> bool:
+        self._stop_sound()
+        return True
+    
+    def _kisayollari_kur(self):
+        """Acil durum kısayollarını kaydet (Windows'ta sistem genelinde, değilse uygulama içinde)"""
+        self.genel_kisayollar.temizle()
+        for kisayol in self._uygulama_kisayollari:
+            kisayol.setEnabled(False)
+            kisayol.deleteLater()
+        self._uygulama_kisayollari = []
+        for tur, tuslar in self.acil.kisayollar().items():
+            if not tuslar or self.genel_kisayollar.kaydet(tur, tuslar):
+                continue
+            if GenelKisayollar.kullanilabilir():
+                self.logger.log_uyari(f"Acil durum kısayolu sistem genelinde kaydedilemedi: {tuslar}")
+            # Yalnızca uygulamanın bir penceresi odaktayken çalışır
+            kisayol = QShortcut(QKeySequence(tuslar), self)
+            kisayol.setContext(Qt.ShortcutContext.ApplicationShortcut)
+            kisayol.activated.connect(lambda t=tur: self.acil_tetikle(t, "kısayol"))
+            self._uygulama_kisayollari.append(kisayol)
     
     def _stop_sound(self):
         """Sesi durdur"""
-        # Tüm finished signal bağlantılarını temizle
-        try:
-            self.sound_player.finished.disconnect()
-        except:
-            pass
+        # Sıradaki sesler de iptal edilir; teneffüs müziği bu teneffüs için susar
         self.sound_player.stop()
+        self.muzik.durdur()
         self.logger.log_manuel(f"{datetime.now().strftime('%H:%M')} Ses durduruldu")
     
     def _toggle_zil(self):
@@ -1203,7 +1378,6 @@ class MainWindow(QMainWindow):
             
             if choice == "Süresiz Kapat":
                 self.state_manager.zil_kapat()
-                self.scheduler.stop()
                 self.logger.log_sistem("Zil süresiz kapatıldı")
             elif choice == "Belirli Saate Kadar Kapat":
                 # Saat seç
@@ -1218,26 +1392,25 @@ class MainWindow(QMainWindow):
                         # Geçici kapatma için state_manager'a ekle
                         self.state_manager._gecici_kapatma_saati = kapatma_saati
                         self.state_manager.zil_kapat()
-                        self.scheduler.stop()
                         self.logger.log_sistem(f"Zil {saat_str} saatine kadar kapatıldı")
                     except:
                         QMessageBox.warning(self, "Hata", "Geçersiz saat formatı! HH:MM formatında girin.")
                         return
         else:
             self.state_manager.zil_ac()
-            if hasattr(self.state_manager, '_gecici_kapatma_saati'):
-                delattr(self.state_manager, '_gecici_kapatma_saati')
-            self.scheduler.start()
+            self.state_manager._gecici_kapatma_saati = None
             self.logger.log_sistem("Zil açıldı")
         
         self._update_status()
+        self._muzigi_ayarla()
     
     def _show_schedule_editor(self):
         """Ders programı editörünü göster"""
         editor = ScheduleEditor(parent=self)
         if editor.exec():
-            # Programı yeniden yükle
-            self.scheduler._load_schedule()
+            # Programı düzenleyiciden al (dosya arka planda yazılıyor)
+            self.scheduler.set_schedule_data(editor.schedule_data)
+            self._sesleri_hazirla()
             self._update_countdown()  # Geri sayımı güncelle
             self.logger.log_sistem("Ders programı güncellendi")
     
@@ -1245,16 +1418,29 @@ class MainWindow(QMainWindow):
         """Ayarlar penceresini göster"""
         settings_window = SettingsWindow(parent=self)
         if settings_window.exec():
-            # Ayarları yeniden yükle
-            self._load_settings()
+            # Ayarlar deposu değişikliği bildirir (mod, çizelge sesleri yeniden yüklenir)
             self.logger.log_sistem("Ayarlar güncellendi")
     
+    def _show_olcumler(self):
+        """Zil ölçümleri penceresini göster"""
+        OlcumlerPenceresi(parent=self).exec()
+    
+    def _show_gecmis(self):
+        """Zil geçmişi penceresini göster"""
+        GecmisPenceresi(self.logger.olaylar, parent=self).exec()
+    
+    def _show_loglar(self):
+        """Log görüntüleyiciyi göster"""
+        LogGoruntuleyici(self.logger.log_dir, parent=self).exec()
+    
+    def _show_rapor(self):
+        """Zil mutabakat raporunu göster"""
+        MutabakatPenceresi(self.scheduler.cizelge, self.logger.olaylar, parent=self).exec()
+    
     def _load_settings(self):
         """Ayarları yükle"""
-        settings = self._get_settings()
-        
         # Modu ayarla
-        mode_str = settings.get("mode", "normal")
+        mode_str = self.settings.mode()
         if mode_str == "tatil":
             self.state_manager.mod_degistir(ZilModu.TATIL)
         elif mode_str == "sinav":
@@ -1263,27 +1449,60 @@ class MainWindow(QMainWindow):
             self.state_manager.mod_degistir(ZilModu.NORMAL)
         
         self._update_status()
+        self._sesleri_hazirla()
+        self._kisayollari_kur()
     
-    def _get_settings(self) -> dict:
-        """Ayarları oku"""
-        # Çalışma dizinini bul (main.py'nin olduğu yer)
-        base_dir = Path(__file__).parent.parent
-        settings_file = base_dir / "data" / "settings.json"
+    def _sesleri_hazirla(self):
+        """Ayarlardaki ve programdaki sesleri denetle, önceden çözüp belleğe al"""
+        ek_klasorler = self.settings.system("ek_ses_klasorleri", [])
+        if isinstance(ek_klasorler, list):
+            self.sound_player.indeks.klasorleri_ayarla(ek_klasorler)
         try:
-            if settings_file.exists():
-                import json
-                with open(settings_file, 'r', encoding='utf-8') as f:
-                    return json.load(f)
-        except:
-            pass
-        return {}
+            butce_mb = float(self.settings.system("ses_onbellegi_mb", VARSAYILAN_BUTCE_MB))
+        except (TypeError, ValueError):
+            butce_mb = VARSAYILAN_BUTCE_MB
+        self.sound_player.onbellek.butce_ayarla(butce_mb)
+        self.sound_player.normalizasyon = bool(self.settings.system("ses_normalizasyonu", False))
+        try:
+            self.sound_player.hedef_lufs = float(self.settings.system("hedef_lufs", VARSAYILAN_HEDEF_LUFS))
+        except (TypeError, ValueError):
+            self.sound_player.hedef_lufs = VARSAYILAN_HEDEF_LUFS
+        # Önce zil sesleri (en sık çalınanlar), sonra marş/siren ve programdaki diğer sesler
+        dosyalar = list(self.settings.sounds().values()) + ses_dosyalari(self.scheduler.schedule_data)
+        self._eksik_sesleri_bildir(dosyalar)
+        self.sound_player.onbellege_al(dosyalar)
+        # Manuel düğmeler setSource beklemeden çalsın
+        self.sound_player.havuzu_kur(self.settings.sounds().values())
+        # Siren ve siren + marş önbellekten hiç atılmaz
+        self.acil.hazirla()
+        self._muzigi_ayarla()
+    
+    def _muzigi_ayarla(self):
+        """Teneffüs müziğine güncel ayarları ve programı ver"""
+        self.muzik.ayarla(self.settings.get("muzik", {}))
+        self.muzik.programi_ayarla(self.scheduler.cizelge, self._muzik_calabilir_mi)
+    
+    def _muzik_calabilir_mi(self) -> bool:
+        """Zil açıkken ve normal modda müzik çalar (tatil ve sınavda çalmaz)"""
+        return self.state_manager.zil_calabilir_mi() and self.state_manager.mod == ZilModu.NORMAL
+    
+    def _on_muzik_basladi(self, parca: str):
+        self.logger.log_otomatik(f"{datetime.now().strftime('%H:%M')} Teneffüs müziği: {parca}")
+        self._olay_kaydet(TUR_MUZIK, True, f"Teneffüs müziği: {parca}", parca)
+    
+    def _eksik_sesleri_bildir(self, dosyalar=None):
+        """Bulunamayan ses dosyalarını zil saati gelmeden logla (her dosya bir kez)"""
+        if dosyalar is None:
+            dosyalar = list(self.settings.sounds().values()) + ses_dosyalari(self.scheduler.schedule_data)
+        eksikler = set(self.sound_player.indeks.eksikler(dosyalar))
+        for dosya in sorted(eksikler - self._bildirilen_eksikler):
+            self.logger.log_hata(f"Ses dosyası bulunamadı: {dosya}")
+        self._bildirilen_eksikler = eksikler
     
     def closeEvent(self, event):
         """Pencere kapatılırken"""
         # Sistem tepsisine küçültme ayarını kontrol et
-        settings = self._get_settings()
-        system = settings.get("system", {})
-        tray_enabled = system.get("tray", True)
+        tray_enabled = self.settings.system("tray", True)
         
         if tray_enabled:
             # Sistem tepsisine küçült
@@ -1297,6 +1516,12 @@ class MainWindow(QMainWindow):
             self.logger.log_sistem("Uygulama kapatıldı")
             event.accept()
     
+    def changeEvent(self, event):
+        """Pencere etkinleştiğinde siren düğmeleri için ses cihazını hazırla"""
+        super().changeEvent(event)
+        if event.type() == QEvent.Type.ActivationChange and self.isActiveWindow():
+            self.acil.hazir_tut()
+    
     def showEvent(self, event):
         """Pencere gösterildiğinde"""
         super().showEvent(event)
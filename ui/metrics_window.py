@@ -0,0 +1,127 @@
+"""
+Zil ölçümleri penceresi - Günlük gecikme özetleri (p50/p95/en kötü) ve tek tek zillerin aşamaları
+"""
+from datetime import datetime
+from PySide6.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QComboBox,
+    QTableWidget, QTableWidgetItem, QHeaderView, QFileDialog, QMessageBox
+)
+from PySide6.QtCore import Qt
+
+from core.metrics import ARALIK_ADLARI, ARALIKLAR, ASAMALAR, ZilOlcumleri
+
+
+class OlcumlerPenceresi(QDialog):
+    """Otomatik zillerin planlanan saate göre ne kadar geç başladığı"""
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.olcumler = ZilOlcumleri.instance()
+        self.setWindowTitle("Zil Ölçümleri")
+        self.resize(760, 560)
+        self._setup_ui()
+        self._gunleri_yukle()
+        # Pencere açıkken çalan zil hemen eklenir
+        self.olcumler.olculdu.connect(self._on_olculdu)
+        self.finished.connect(lambda _: self.olcumler.olculdu.disconnect(self._on_olculdu))
+    
+    def _setup_ui(self):
+        layout = QVBoxLayout()
+        
+        ust_layout = QHBoxLayout()
+        ust_layout.addWidget(QLabel("Gün:"))
+        self.gun_combo = QComboBox()
+        self.gun_combo.setMinimumWidth(150)
+        self.gun_combo.currentIndexChanged.connect(self._gunu_goster)
+        ust_layout.addWidget(self.gun_combo)
+        ust_layout.addStretch()
+        layout.addLayout(ust_layout)
+        
+        aciklama = QLabel("Her aşama bir öncekinden (ilki zilin planlanan saatinden) bu yana geçen süredir.")
+        aciklama.setWordWrap(True)
+        aciklama.setStyleSheet("color: #666;")
+        layout.addWidget(aciklama)
+        
+        self.ozet_table = QTableWidget(len(ARALIKLAR), 4)
+        self.ozet_table.setHorizontalHeaderLabels(["Zil sayısı", "p50 (ms)", "p95 (ms)", "En kötü (ms)"])
+        self.ozet_table.setVerticalHeaderLabels([ARALIK_ADLARI[ad] for ad in ARALIKLAR])
+        self.ozet_table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        self.ozet_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+        self.ozet_table.setFixedHeight(self.ozet_table.verticalHeader().length() + 30)
+        layout.addWidget(self.ozet_table)
+        
+        layout.addWidget(QLabel("Ziller:"))
+        self.kayit_table = QTableWidget(0, 2 + len(ASAMALAR))
+        self.kayit_table.setHorizontalHeaderLabels(
+            ["Saat", "Açıklama"] + [f"{ARALIK_ADLARI[asama]} (ms)" for asama in ASAMALAR]
+        )
+        self.kayit_table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        self.kayit_table.setSelectionBehavior(QTableWidget.SelectionBehavior.SelectRows)
+        self.kayit_table.verticalHeader().setVisible(False)
+        header = self.kayit_table.horizontalHeader()
+        header.setSectionResizeMode(QHeaderView.ResizeMode.ResizeToContents)
+        header.setSectionResizeMode(1, QHeaderView.ResizeMode.Stretch)
+        layout.addWidget(self.kayit_table, 1)
+        
+        alt_layout = QHBoxLayout()
+        btn_disa_aktar = QPushButton("Dışa Aktar (JSON)")
+        btn_disa_aktar.clicked.connect(self._disa_aktar)
+        alt_layout.addWidget(btn_disa_aktar)
+        alt_layout.addStretch()
+        btn_kapat = QPushButton("Kapat")
+        btn_kapat.clicked.connect(self.accept)
+        alt_layout.addWidget(btn_kapat)
+        layout.addLayout(alt_layout)
+        
+        self.setLayout(layout)
+    
+    def _gunleri_yukle(self):
+        secili = self.gun_combo.currentText()
+        self.gun_combo.blockSignals(True)
+        self.gun_combo.clear()
+        self.gun_combo.addItems(self.olcumler.gunler())
+        self.gun_combo.setCurrentIndex(max(0, self.gun_combo.findText(secili)))
+        self.gun_combo.blockSignals(False)
+        self._gunu_goster()
+    
+    def _gunu_goster(self):
+        gun = self.gun_combo.currentText()
+        ozet = self.olcumler.ozet(gun) if gun else {}
+        for satir, ad in enumerate(ARALIKLAR):
+            degerler = ozet.get(ad)
+            hucreler = (["0", "-", "-", "-"] if degerler is None else
+                        [str(degerler["sayi"]), f"{degerler['p50']:.1f}", f"{degerler['p95']:.1f}",
+                         f"{degerler['max']:.1f}"])
+            for sutun, metin in enumerate(hucreler):
+                item = QTableWidgetItem(metin)
+                item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
+                self.ozet_table.setItem(satir, sutun, item)
+        
+        kayitlar = self.olcumler.kayitlar(gun) if gun else []
+        self.kayit_table.setRowCount(len(kayitlar))
+        for satir, kayit in enumerate(kayitlar):
+            self.kayit_table.setItem(satir, 0, QTableWidgetItem(kayit.get("planlanan", "")))
+            self.kayit_table.setItem(satir, 1, QTableWidgetItem(kayit.get("aciklama", "")))
+            # Kayıtta aşamaların planlanan saatten uzaklığı tutulur; tabloda aşama süreleri gösterilir
+            onceki = 0.0
+            for sutun, asama in enumerate(ASAMALAR, start=2):
+                deger = kayit.get("asamalar", {}).get(asama)
+                metin = "-" if deger is None else f"{deger - onceki:.1f}"
+                if deger is not None:
+                    onceki = deger
+                item = QTableWidgetItem(metin)
+                item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
+                self.kayit_table.setItem(satir, sutun, item)
+    
+    def _on_olculdu(self, _aciklama: str, _araliklar):
+        self._gunleri_yukle()
+    
+    def _disa_aktar(self):
+        varsayilan = f"zil_olcumleri_{datetime.now().strftime('%Y%m%d')}.json"
+        yol, _ = QFileDialog.getSaveFileName(self, "Ölçümleri Dışa Aktar", varsayilan, "JSON (*.json)")
+        if not yol:
+            return
+        try:
+            self.olcumler.disa_aktar(yol)
+        except OSError as e:
+            QMessageBox.warning(self, "Hata", f"Dosya yazılamadı:\n{e}")
@@ -0,0 +1,159 @@
+"""
+Mutabakat raporu penceresi - Seçilen tarih aralığında programdaki zillerin gerçekten çalıp çalmadığı
+"""
+import csv
+from datetime import date
+from PySide6.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QDateEdit, QCheckBox,
+    QTableWidget, QTableWidgetItem, QHeaderView, QFileDialog, QMessageBox, QApplication
+)
+from PySide6.QtCore import QDate, Qt
+from PySide6.QtGui import QColor
+
+from core.event_log import OlayGunlugu
+from core.reconciliation import (
+    SINIF_ADLARI, SINIF_CIFT, SINIF_ENGELLENDI, SINIF_GEC, SINIF_KACIRILDI, SINIF_PROGRAM_DISI,
+    SINIF_ZAMANINDA, SINIFLAR, mutabakat, ozet
+)
+from core.timeline import ZamanCizelgesi
+
+
+SINIF_RENKLERI = {
+    SINIF_GEC: "#fff3e0",
+    SINIF_KACIRILDI: "#ffebee",
+    SINIF_CIFT: "#fff3e0",
+    SINIF_ENGELLENDI: "#eeeeee",
+    SINIF_PROGRAM_DISI: "#e3f2fd"
+}
+
+
+def _tarih(qdate: QDate) -> date:
+    return date(qdate.year(), qdate.month(), qdate.day())
+
+
+class MutabakatPenceresi(QDialog):
+    """Zil programı ile olay günlüğünün karşılaştırması ("zil çalmadı" şikayetleri için)"""
+    
+    def __init__(self, cizelge: ZamanCizelgesi, olaylar: OlayGunlugu, parent=None):
+        super().__init__(parent)
+        self.cizelge = cizelge
+        self.olaylar = olaylar
+        self.satirlar = []
+        self.setWindowTitle("Zil Mutabakat Raporu")
+        self.resize(860, 600)
+        self._setup_ui()
+        self._hazirla()
+    
+    def _setup_ui(self):
+        layout = QVBoxLayout()
+        
+        ust_layout = QHBoxLayout()
+        ust_layout.addWidget(QLabel("Başlangıç:"))
+        bugun = QDate.currentDate()
+        self.bas_edit = QDateEdit(bugun.addDays(-6))
+        self.bas_edit.setCalendarPopup(True)
+        self.bas_edit.setDisplayFormat("dd.MM.yyyy")
+        ust_layout.addWidget(self.bas_edit)
+        ust_layout.addWidget(QLabel("Bitiş:"))
+        self.bit_edit = QDateEdit(bugun)
+        self.bit_edit.setCalendarPopup(True)
+        self.bit_edit.setDisplayFormat("dd.MM.yyyy")
+        ust_layout.addWidget(self.bit_edit)
+        
+        btn_hazirla = QPushButton("Raporu Hazırla")
+        btn_hazirla.clicked.connect(self._hazirla)
+        ust_layout.addWidget(btn_hazirla)
+        
+        self.sorunlu_check = QCheckBox("Yalnızca sorunlu ziller")
+        self.sorunlu_check.toggled.connect(self._tabloyu_doldur)
+        ust_layout.addWidget(self.sorunlu_check)
+        ust_layout.addStretch()
+        layout.addLayout(ust_layout)
+        
+        self.ozet_label = QLabel("")
+        self.ozet_label.setWordWrap(True)
+        self.ozet_label.setStyleSheet("font-weight: bold; padding: 4px;")
+        layout.addWidget(self.ozet_label)
+        
+        self.table = QTableWidget(0, 5)
+        self.table.setHorizontalHeaderLabels(["Planlanan", "Zil", "Durum", "Gecikme", "Ayrıntı"])
+        self.table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        self.table.setSelectionBehavior(QTableWidget.SelectionBehavior.SelectRows)
+        self.table.verticalHeader().setVisible(False)
+        header = self.table.horizontalHeader()
+        header.setSectionResizeMode(QHeaderView.ResizeMode.ResizeToContents)
+        header.setSectionResizeMode(4, QHeaderView.ResizeMode.Stretch)
+        layout.addWidget(self.table, 1)
+        
+        alt_layout = QHBoxLayout()
+        btn_kaydet = QPushButton("CSV Olarak Kaydet")
+        btn_kaydet.clicked.connect(self._csv_kaydet)
+        alt_layout.addWidget(btn_kaydet)
+        alt_layout.addStretch()
+        btn_kapat = QPushButton("Kapat")
+        btn_kapat.clicked.connect(self.accept)
+        alt_layout.addWidget(btn_kapat)
+        layout.addLayout(alt_layout)
+        
+        self.setLayout(layout)
+    
+    def _hazirla(self):
+        bas, bit = _tarih(self.bas_edit.date()), _tarih(self.bit_edit.date())
+        if bit < bas:
+            bas, bit = bit, bas
+        QApplication.setOverrideCursor(Qt.CursorShape.WaitCursor)
+        try:
+            self.satirlar = list(mutabakat(self.cizelge, self.olaylar, bas, bit))
+        finally:
+            QApplication.restoreOverrideCursor()
+        sayilar = ozet(self.satirlar)
+        self.ozet_label.setText(
+            f"{len(self.satirlar)} zil: " + ", ".join(f"{SINIF_ADLARI[s]} {sayilar[s]}" for s in SINIFLAR if sayilar[s])
+        )
+        self._tabloyu_doldur()
+    
+    def _gosterilecekler(self):
+        if self.sorunlu_check.isChecked():
+            return [s for s in self.satirlar if s.sinif != SINIF_ZAMANINDA]
+        return self.satirlar
+    
+    def _tabloyu_doldur(self):
+        satirlar = self._gosterilecekler()
+        self.table.setRowCount(len(satirlar))
+        for no, satir in enumerate(satirlar):
+            aciklama = f"{satir.aciklama} ({satir.vardiya})" if satir.vardiya else satir.aciklama
+            hucreler = [
+                satir.planlanan.strftime("%d.%m.%Y %H:%M"),
+                aciklama,
+                SINIF_ADLARI[satir.sinif],
+                f"{satir.gecikme_ms / 1000:.1f} sn" if satir.gecikme_ms is not None else "",
+                satir.ayrinti
+            ]
+            renk = SINIF_RENKLERI.get(satir.sinif)
+            for sutun, metin in enumerate(hucreler):
+                item = QTableWidgetItem(metin)
+                if sutun in (0, 2, 3):
+                    item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
+                if renk:
+                    item.setBackground(QColor(renk))
+                self.table.setItem(no, sutun, item)
+    
+    def _csv_kaydet(self):
+        bas, bit = _tarih(self.bas_edit.date()), _tarih(self.bit_edit.date())
+        varsayilan = f"zil_mutabakat_{bas:%Y%m%d}_{bit:%Y%m%d}.csv"
+        yol, _ = QFileDialog.getSaveFileName(self, "Raporu Kaydet", varsayilan, "CSV (*.csv)")
+        if not yol:
+            return
+        try:
+            # Excel'in Türkçe karakterleri tanıması için BOM'lu UTF-8 ve noktalı virgül
+            with open(yol, 'w', encoding='utf-8-sig', newline='') as f:
+                yazici = csv.writer(f, delimiter=';')
+                yazici.writerow(["Planlanan", "Zil", "Vardiya", "Durum", "Gecikme (ms)", "Ayrıntı"])
+                for satir in self._gosterilecekler():
+                    yazici.writerow([
+                        satir.planlanan.strftime("%Y-%m-%d %H:%M"), satir.aciklama, satir.vardiya,
+                        SINIF_ADLARI[satir.sinif], "" if satir.gecikme_ms is None else satir.gecikme_ms,
+                        satir.ayrinti
+                    ])
+        except OSError as e:
+            QMessageBox.warning(self, "Hata", f"Dosya yazılamadı:\n{e}")
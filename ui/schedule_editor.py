@@ -1,7 +1,6 @@
 """
 Ders Programı Oluşturucu ve Editörü
 """
-import json
 from datetime import datetime, time, timedelta
 from pathlib import Path
 from typing import Dict, List, Optional
@@ -14,6 +13,9 @@ from PySide6.QtWidgets import (
 from PySide6.QtCore import Qt, QTime
 from PySide6.QtGui import QColor
 
+from core.persistence import read_json, writer_for
+from core.settings_store import SettingsStore
+from core.sound_library import SesKutuphanesi
 
 
 class ScheduleEditor(QDialog):
@@ -25,6 +27,7 @@ class ScheduleEditor(QDialog):
         base_dir = Path(__file__).parent.parent
         self.schedule_file = base_dir / schedule_file
         self.settings_file = base_dir / settings_file
+        self.settings_store = SettingsStore.instance(settings_file)
         self.schedule_data: Dict = {}
         self.settings_data: Dict = {}
         self.defaults: Dict = {}
@@ -698,8 +701,13 @@ class ScheduleEditor(QDialog):
                 teneffus_item.setToolTip("Son ders - teneffüs yok")
             self.table.setItem(row, 4, teneffus_item)
             
-            # Ses Dosyası
-            self.table.setItem(row, 5, QTableWidgetItem(lesson.get("sound", "ziller/zil1.mp3")))
+            # Ses Dosyası (ipucunda süre/biçim bilgisi)
+            ses = lesson.get("sound", "ziller/zil1.mp3")
+            ses_item = QTableWidgetItem(ses)
+            bilgi = SesKutuphanesi.instance().bilgi(ses)
+            if bilgi is not None:
+                ses_item.setToolTip(bilgi.aciklama())
+            self.table.setItem(row, 5, ses_item)
         
         # Signal'ları tekrar aç
         self.table.blockSignals(False)
@@ -1540,11 +1548,7 @@ class ScheduleEditor(QDialog):
     def _load_settings(self):
         """Ayarları yükle"""
         try:
-            if self.settings_file.exists():
-                with open(self.settings_file, 'r', encoding='utf-8') as f:
-                    self.settings_data = json.load(f)
-            else:
-                self.settings_data = {}
+            self.settings_data = self.settings_store.to_dict()
             
             # Standart ayarları al
             self.defaults = self.settings_data.get("schedule_defaults", {
@@ -1571,26 +1575,24 @@ class ScheduleEditor(QDialog):
     def _save_settings(self):
         """Ayarları kaydet"""
         try:
-            if not self.settings_file.parent.exists():
-                self.settings_file.parent.mkdir(parents=True, exist_ok=True)
-            
             self.settings_data["schedule_defaults"] = self.defaults
-            
-            with open(self.settings_file, 'w', encoding='utf-8') as f:
-                json.dump(self.settings_data, f, ensure_ascii=False, indent=2)
+            # Sadece kendi bölümünü yaz, başka pencerelerin kaydettiği ayarları ezme
+            self.settings_store.set_section("schedule_defaults", self.defaults)
         except Exception as e:
             QMessageBox.warning(self, "Hata", f"Ayarlar kaydedilemedi: {str(e)}")
     
     def _load_schedule(self):
         """Mevcut programı yükle"""
-        try:
-            if self.schedule_file.exists():
-                with open(self.schedule_file, 'r', encoding='utf-8') as f:
-                    self.schedule_data = json.load(f)
+        # Henüz diske inmemiş bir kayıt varsa önce onu yaz
+        writer_for(self.schedule_file).flush()
+        if self.schedule_file.exists():
+            data = read_json(self.schedule_file)
+            if isinstance(data, dict):
+                self.schedule_data = data
             else:
+                QMessageBox.warning(self, "Uyarı", "Program yüklenirken hata: dosya ve yedekleri okunamadı")
                 self.schedule_data = self._default_schedule()
-        except Exception as e:
-            QMessageBox.warning(self, "Uyarı", f"Program yüklenirken hata: {e}")
+        else:
             self.schedule_data = self._default_schedule()
     
     def _default_schedule(self) -> Dict:
@@ -1621,13 +1623,8 @@ class ScheduleEditor(QDialog):
         self.accept()
     
     def _save_to_file(self):
-        """Programı dosyaya kaydet"""
-        try:
-            self.schedule_file.parent.mkdir(parents=True, exist_ok=True)
-            with open(self.schedule_file, 'w', encoding='utf-8') as f:
-                json.dump(self.schedule_data, f, ensure_ascii=False, indent=2)
-        except Exception as e:
-            QMessageBox.critical(self, "Hata", f"Program kaydedilirken hata: {e}")
+        """Programı dosyaya kaydet (arka planda, atomik; hata olursa ana pencere loglar)"""
+        writer_for(self.schedule_file).save(self.schedule_data)
     
     def get_schedule_data(self) -> Dict:
         """Program verisini döndür"""
@@ -1,7 +1,6 @@
 """
 Ayarlar penceresi
 """
-import json
 import hashlib
 import sys
 from pathlib import Path
@@ -9,11 +8,19 @@ from PySide6.QtWidgets import (
     QDialog, QVBoxLayout, QHBoxLayout, QLabel, QPushButton,
     QLineEdit, QSpinBox, QCheckBox, QTabWidget, QWidget,
     QTableWidget, QTableWidgetItem, QMessageBox, QFileDialog,
-    QScrollArea, QFormLayout, QGroupBox
+    QScrollArea, QFormLayout, QGroupBox, QComboBox, QKeySequenceEdit
 )
 from PySide6.QtCore import Qt
+from PySide6.QtGui import QKeySequence
 import os
 
+from core.break_music import VARSAYILAN_AYARLAR as MUZIK_VARSAYILANLARI
+from core.emergency import ACIL_SIREN, ACIL_SIREN_MARS, VARSAYILAN_KISAYOLLAR
+from core.hotkey import GenelKisayollar
+from core.loudness import VARSAYILAN_HEDEF_LUFS, YukseklikOnbellegi
+from core.settings_store import SettingsStore
+from core.sound_library import SesKutuphanesi
+
 
 class SettingsWindow(QDialog):
     """Ayarlar penceresi"""
@@ -23,6 +30,8 @@ class SettingsWindow(QDialog):
         # Çalışma dizinini bul (main.py'nin olduğu yer)
         base_dir = Path(__file__).parent.parent
         self.settings_file = base_dir / settings_file
+        self.store = SettingsStore.instance(settings_file)
+        self.kutuphane = SesKutuphanesi.instance()
         self.settings_data = {}
         self._load_settings()
         
@@ -62,6 +71,9 @@ class SettingsWindow(QDialog):
         
         self._setup_ui()
         self._load_ui_from_settings()
+        # Tarama sürerken açıldıysa bilgiler geldikçe ipuçları güncellenir
+        self.kutuphane.guncellendi.connect(self._update_sound_tooltips)
+        self.finished.connect(lambda _: self.kutuphane.guncellendi.disconnect(self._update_sound_tooltips))
     
     def _setup_ui(self):
         """UI'ı oluştur"""
@@ -244,6 +256,134 @@ class SettingsWindow(QDialog):
         sistem_group.setLayout(sistem_layout)
         genel_layout.addWidget(sistem_group)
         
+        # Kaçırılan ziller grubu (uyku, donma veya saat değişikliği sırasında geçen ziller)
+        kacirilan_group = QGroupBox("Kaçırılan Ziller")
+        kacirilan_layout = QFormLayout()
+        kacirilan_layout.setSpacing(10)
+        
+        self.kacirilan_combo = QComboBox()
+        self.kacirilan_combo.addItem("Tolerans içindeyse geç çal", "cal")
+        self.kacirilan_combo.addItem("Sadece logla", "logla")
+        self.kacirilan_combo.addItem("Atla", "atla")
+        kacirilan_layout.addRow("Politika:", self.kacirilan_combo)
+        
+        self.kacirilan_tolerans = QSpinBox()
+        self.kacirilan_tolerans.setRange(0, 60)
+        self.kacirilan_tolerans.setValue(5)
+        self.kacirilan_tolerans.setSuffix(" dk")
+        self.kacirilan_tolerans.setMinimumWidth(100)
+        kacirilan_layout.addRow("Tolerans:", self.kacirilan_tolerans)
+        
+        kacirilan_group.setLayout(kacirilan_layout)
+        genel_layout.addWidget(kacirilan_group)
+        
+        # Zil öncesi hazırlık (ses dosyası ve ses cihazı önceden açılır)
+        hazirlik_group = QGroupBox("Zil Hazırlığı")
+        hazirlik_layout = QFormLayout()
+        hazirlik_layout.setSpacing(10)
+        
+        self.on_hazirlik_spin = QSpinBox()
+        self.on_hazirlik_spin.setRange(0, 60)
+        self.on_hazirlik_spin.setValue(5)
+        self.on_hazirlik_spin.setSuffix(" sn")
+        self.on_hazirlik_spin.setMinimumWidth(100)
+        self.on_hazirlik_spin.setToolTip("Zil sesi bu kadar saniye önce yüklenir (0: kapalı)")
+        hazirlik_layout.addRow("Önceden hazırla:", self.on_hazirlik_spin)
+        
+        self.onbellek_spin = QSpinBox()
+        self.onbellek_spin.setRange(0, 1024)
+        self.onbellek_spin.setValue(64)
+        self.onbellek_spin.setSuffix(" MB")
+        self.onbellek_spin.setMinimumWidth(100)
+        self.onbellek_spin.setToolTip("Çözülmüş zil seslerinin bellekte tutulacağı en fazla alan (0: kapalı)")
+        hazirlik_layout.addRow("Ses önbelleği:", self.onbellek_spin)
+        
+        self.sira_boslugu_spin = QSpinBox()
+        self.sira_boslugu_spin.setRange(0, 5000)
+        self.sira_boslugu_spin.setSingleStep(100)
+        self.sira_boslugu_spin.setValue(0)
+        self.sira_boslugu_spin.setSuffix(" ms")
+        self.sira_boslugu_spin.setMinimumWidth(100)
+        self.sira_boslugu_spin.setToolTip("Zil → anons, saygı duruşu → marş gibi arka arkaya çalınan sesler arasındaki sessizlik")
+        hazirlik_layout.addRow("Sesler arası bekleme:", self.sira_boslugu_spin)
+        
+        self.normalizasyon_checkbox = QCheckBox("Ses yüksekliklerini eşitle")
+        self.hedef_lufs_spin = QSpinBox()
+        self.hedef_lufs_spin.setRange(-40, -5)
+        self.hedef_lufs_spin.setValue(int(VARSAYILAN_HEDEF_LUFS))
+        self.hedef_lufs_spin.setSuffix(" LUFS")
+        self.hedef_lufs_spin.setMinimumWidth(100)
+        self.hedef_lufs_spin.setToolTip("Seslerin getirileceği ortalama yükseklik (büyük değer daha yüksek)")
+        if YukseklikOnbellegi.kullanilabilir():
+            self.normalizasyon_checkbox.setToolTip(
+                "Farklı kaynaklardan gelen seslerin yüksekliği ölçülür ve aynı seviyede çalınır"
+            )
+            self.normalizasyon_checkbox.toggled.connect(self.hedef_lufs_spin.setEnabled)
+        else:
+            self.normalizasyon_checkbox.setEnabled(False)
+            self.normalizasyon_checkbox.setToolTip("Yükseklik ölçümü için numpy kurulmalıdır")
+        self.hedef_lufs_spin.setEnabled(False)
+        hazirlik_layout.addRow(self.normalizasyon_checkbox)
+        hazirlik_layout.addRow("Hedef yükseklik:", self.hedef_lufs_spin)
+        
+        hazirlik_group.setLayout(hazirlik_layout)
+        genel_layout.addWidget(hazirlik_group)
+        
+        # Teneffüs müziği (sounds/muzik_yayini/)
+        muzik_group = QGroupBox("Teneffüs Müziği")
+        muzik_layout = QFormLayout()
+        muzik_layout.setSpacing(10)
+        
+        self.muzik_checkbox = QCheckBox("Teneffüslerde müzik çal (sounds/muzik_yayini/)")
+        self.muzik_checkbox.setToolTip("Ders çıkış zilinden sonraki öğrenci giriş ziline kadar çalar; tatil ve sınav modunda çalmaz")
+        muzik_layout.addRow(self.muzik_checkbox)
+        
+        self.muzik_sira_combo = QComboBox()
+        self.muzik_sira_combo.addItem("Karışık", True)
+        self.muzik_sira_combo.addItem("Sıralı", False)
+        muzik_layout.addRow("Çalma sırası:", self.muzik_sira_combo)
+        
+        self.muzik_seviye_spin = QSpinBox()
+        self.muzik_seviye_spin.setRange(0, 100)
+        self.muzik_seviye_spin.setSuffix(" %")
+        self.muzik_seviye_spin.setMinimumWidth(100)
+        muzik_layout.addRow("Ses seviyesi:", self.muzik_seviye_spin)
+        
+        self.muzik_solma_spin = QSpinBox()
+        self.muzik_solma_spin.setRange(0, 60)
+        self.muzik_solma_spin.setSuffix(" sn")
+        self.muzik_solma_spin.setMinimumWidth(100)
+        self.muzik_solma_spin.setToolTip("Müzik, teneffüsü bitiren zilden bu kadar önce yavaşça kısılıp susar")
+        muzik_layout.addRow("Zilden önce sustur:", self.muzik_solma_spin)
+        
+        self.muzik_kisma_spin = QSpinBox()
+        self.muzik_kisma_spin.setRange(-60, 0)
+        self.muzik_kisma_spin.setSuffix(" dB")
+        self.muzik_kisma_spin.setMinimumWidth(100)
+        self.muzik_kisma_spin.setToolTip("Zil veya anons çalarken müziğin kısılma miktarı")
+        muzik_layout.addRow("Zil/anons sırasında kıs:", self.muzik_kisma_spin)
+        
+        muzik_group.setLayout(muzik_layout)
+        genel_layout.addWidget(muzik_group)
+        
+        # Acil durum kısayolları (Windows'ta başka bir uygulama odaktayken de çalışır)
+        acil_group = QGroupBox("Acil Durum Kısayolları")
+        acil_layout = QFormLayout()
+        acil_layout.setSpacing(10)
+        
+        ipucu = ("Uygulama arka planda veya bir pencere açıkken de çalışır" if GenelKisayollar.kullanilabilir()
+                 else "Yalnızca uygulama penceresi odaktayken çalışır")
+        self.acil_kisayol_edit = QKeySequenceEdit()
+        self.acil_kisayol_edit.setToolTip(ipucu)
+        acil_layout.addRow("Siren:", self.acil_kisayol_edit)
+        
+        self.acil_mars_kisayol_edit = QKeySequenceEdit()
+        self.acil_mars_kisayol_edit.setToolTip(ipucu)
+        acil_layout.addRow("Siren + İstiklal Marşı:", self.acil_mars_kisayol_edit)
+        
+        acil_group.setLayout(acil_layout)
+        genel_layout.addWidget(acil_group)
+        
         # Güvenlik grubu
         guvenlik_group = QGroupBox("Güvenlik")
         guvenlik_layout = QFormLayout()
@@ -307,16 +447,10 @@ class SettingsWindow(QDialog):
         self.setLayout(layout)
     
     def _load_settings(self):
-        """Ayarları yükle"""
-        try:
-            if self.settings_file.exists():
-                with open(self.settings_file, 'r', encoding='utf-8') as f:
-                    self.settings_data = json.load(f)
-            else:
-                self.settings_data = self._default_settings()
-                self._save_settings()
-        except Exception as e:
-            print(f"Ayarlar yüklenirken hata: {e}")
+        """Ayarları yükle (paylaşılan depodan düzenlenebilir kopya)"""
+        if self.store.exists():
+            self.settings_data = self.store.to_dict()
+        else:
             self.settings_data = self._default_settings()
     
     def _default_settings(self) -> dict:
@@ -341,11 +475,22 @@ class SettingsWindow(QDialog):
             },
             "system": {
                 "startup": False,
-                "tray": True
+                "tray": True,
+                "ses_onbellegi_mb": 64,
+                "sira_boslugu_ms": 0,
+                "ses_normalizasyonu": False,
+                "hedef_lufs": VARSAYILAN_HEDEF_LUFS,
+                "acil_kisayollari": dict(VARSAYILAN_KISAYOLLAR)
+            },
+            "scheduler": {
+                "kacirilan_zil": "cal",
+                "kacirilan_zil_toleransi_dk": 5,
+                "on_hazirlik_sn": 5
             },
             "security": {
                 "password_hash": None
             },
+            "muzik": dict(MUZIK_VARSAYILANLARI),
             "mode": "normal"
         }
     
@@ -368,10 +513,33 @@ class SettingsWindow(QDialog):
         self.saygi_sound_label.setText(saygi if saygi else "(Seçilmedi)")
         self.siren_mars_siren_label.setText(sounds.get("siren_mars_siren", "siren/siren.mp3"))
         self.siren_mars_mars_label.setText(sounds.get("siren_mars_mars", "marslar/istiklal.mp3"))
+        self._update_sound_tooltips()
         
         system = self.settings_data.get("system", {})
         self.startup_checkbox.setChecked(system.get("startup", False))
         self.tray_checkbox.setChecked(system.get("tray", True))
+        self.onbellek_spin.setValue(int(system.get("ses_onbellegi_mb", 64)))
+        self.sira_boslugu_spin.setValue(int(system.get("sira_boslugu_ms", 0)))
+        self.normalizasyon_checkbox.setChecked(
+            bool(system.get("ses_normalizasyonu", False)) and YukseklikOnbellegi.kullanilabilir()
+        )
+        self.hedef_lufs_spin.setValue(int(round(float(system.get("hedef_lufs", VARSAYILAN_HEDEF_LUFS)))))
+        kisayollar = {**VARSAYILAN_KISAYOLLAR, **system.get("acil_kisayollari", {})}
+        self.acil_kisayol_edit.setKeySequence(QKeySequence(kisayollar[ACIL_SIREN]))
+        self.acil_mars_kisayol_edit.setKeySequence(QKeySequence(kisayollar[ACIL_SIREN_MARS]))
+        
+        scheduler = self.settings_data.get("scheduler", {})
+        index = self.kacirilan_combo.findData(scheduler.get("kacirilan_zil", "cal"))
+        self.kacirilan_combo.setCurrentIndex(max(0, index))
+        self.kacirilan_tolerans.setValue(int(scheduler.get("kacirilan_zil_toleransi_dk", 5)))
+        self.on_hazirlik_spin.setValue(int(scheduler.get("on_hazirlik_sn", 5)))
+        
+        muzik = {**MUZIK_VARSAYILANLARI, **self.settings_data.get("muzik", {})}
+        self.muzik_checkbox.setChecked(bool(muzik["etkin"]))
+        self.muzik_sira_combo.setCurrentIndex(0 if muzik["karisik"] else 1)
+        self.muzik_seviye_spin.setValue(int(muzik["ses_seviyesi"]))
+        self.muzik_solma_spin.setValue(int(muzik["solma_sn"]))
+        self.muzik_kisma_spin.setValue(int(muzik["kisma_db"]))
         
         mode = self.settings_data.get("mode", "normal")
         self.normal_radio.setChecked(mode == "normal")
@@ -405,14 +573,36 @@ class SettingsWindow(QDialog):
             "siren_mars_mars": self.siren_mars_mars_label.text()
         }
         
-        # Sistem ayarları
-        self.settings_data["system"] = {
+        # Sistem ayarları (yalnızca dosyada tutulan anahtarlar, örn. ek_ses_klasorleri, korunur)
+        system = self.settings_data.setdefault("system", {})
+        old_startup = system.get("startup", False)
+        system.update({
             "startup": self.startup_checkbox.isChecked(),
-            "tray": self.tray_checkbox.isChecked()
+            "tray": self.tray_checkbox.isChecked(),
+            "ses_onbellegi_mb": self.onbellek_spin.value(),
+            "sira_boslugu_ms": self.sira_boslugu_spin.value(),
+            "ses_normalizasyonu": self.normalizasyon_checkbox.isChecked(),
+            "hedef_lufs": self.hedef_lufs_spin.value(),
+            "acil_kisayollari": {
+                ACIL_SIREN: self.acil_kisayol_edit.keySequence().toString(QKeySequence.SequenceFormat.PortableText),
+                ACIL_SIREN_MARS: self.acil_mars_kisayol_edit.keySequence().toString(QKeySequence.SequenceFormat.PortableText)
+            }
+        })
+        
+        scheduler = self.settings_data.setdefault("scheduler", {})
+        scheduler["kacirilan_zil"] = self.kacirilan_combo.currentData()
+        scheduler["kacirilan_zil_toleransi_dk"] = self.kacirilan_tolerans.value()
+        scheduler["on_hazirlik_sn"] = self.on_hazirlik_spin.value()
+        
+        self.settings_data["muzik"] = {
+            "etkin": self.muzik_checkbox.isChecked(),
+            "karisik": self.muzik_sira_combo.currentData(),
+            "ses_seviyesi": self.muzik_seviye_spin.value(),
+            "solma_sn": self.muzik_solma_spin.value(),
+            "kisma_db": self.muzik_kisma_spin.value()
         }
         
         # Startup ayarını uygula
-        old_startup = self.settings_data.get("system", {}).get("startup", False)
         new_startup = self.startup_checkbox.isChecked()
         if old_startup != new_startup:
             self._update_startup(new_startup)
@@ -433,11 +623,9 @@ class SettingsWindow(QDialog):
         elif self.sinav_radio.isChecked():
             self.settings_data["mode"] = "sinav"
         
-        # Dosyaya kaydet
+        # Depo üzerinden kaydet (diğer modüller değişiklikten haberdar olur)
         try:
-            self.settings_file.parent.mkdir(parents=True, exist_ok=True)
-            with open(self.settings_file, 'w', encoding='utf-8') as f:
-                json.dump(self.settings_data, f, ensure_ascii=False, indent=2)
+            self.store.save(self.settings_data)
             
             QMessageBox.information(self, "Başarılı", "Ayarlar kaydedildi!")
             self.accept()
@@ -518,6 +706,19 @@ class SettingsWindow(QDialog):
                 self.siren_mars_siren_label.setText(relative_path.replace("\\", "/"))
             elif tip == "siren_mars_mars":
                 self.siren_mars_mars_label.setText(relative_path.replace("\\", "/"))
+            
+            self._update_sound_tooltips()
+            bilgi = self.kutuphane.bilgi(relative_path)
+            if bilgi is not None and not bilgi.cozulebilir:
+                QMessageBox.warning(self, "Uyarı", f"Seçilen ses dosyası çalınamayabilir:\n{bilgi.hata}")
+    
+    def _update_sound_tooltips(self):
+        """Ses etiketlerine süre, biçim ve seviye bilgisini ipucu olarak ekle"""
+        for label in (self.ogrenci_sound_label, self.ogretmen_sound_label, self.cikis_sound_label,
+                      self.mars_sound_label, self.siren_sound_label, self.saygi_sound_label,
+                      self.siren_mars_siren_label, self.siren_mars_mars_label):
+            bilgi = self.kutuphane.bilgi(label.text())
+            label.setToolTip(bilgi.aciklama() if bilgi is not None else "")
     
     def _update_startup(self, enable: bool):
         """Windows startup klasörüne kısayol ekle/çıkar"""
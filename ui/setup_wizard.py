@@ -2,7 +2,6 @@
 Kurulum Sihirbazı - İlk Kullanım için Adım Adım Ayarlar
 Ekran görüntülerine göre revize edilmiş versiyon
 """
-import json
 from pathlib import Path
 from datetime import datetime, timedelta
 from PySide6.QtWidgets import (
@@ -14,6 +13,9 @@ from PySide6.QtWidgets import (
 from PySide6.QtCore import Qt, QTime, QTimer
 from PySide6.QtGui import QFont, QKeyEvent
 
+from core.persistence import writer_for
+from core.settings_store import SettingsStore
+
 
 class SetupWizard(QDialog):
     """Kurulum sihirbazı - Adım adım ayar alma"""
@@ -24,6 +26,7 @@ class SetupWizard(QDialog):
         base_dir = Path(__file__).parent.parent
         self.schedule_file = base_dir / schedule_file
         self.settings_file = base_dir / settings_file
+        self.settings_store = SettingsStore.instance(settings_file)
         
         self.setWindowTitle("Okul Zili - Kurulum Sihirbazı")
         self.setMinimumSize(900, 600)
@@ -671,11 +674,7 @@ class SetupWizard(QDialog):
         }
         
         try:
-            if not self.settings_file.parent.exists():
-                self.settings_file.parent.mkdir(parents=True, exist_ok=True)
-            
-            with open(self.settings_file, 'w', encoding='utf-8') as f:
-                json.dump(settings_data, f, ensure_ascii=False, indent=2)
+            self.settings_store.save(settings_data)
         except Exception as e:
             progress.close()
             QMessageBox.warning(self, "Hata", f"Ayarlar kaydedilemedi: {str(e)}")
@@ -758,11 +757,10 @@ class SetupWizard(QDialog):
         
         # Programı kaydet
         try:
-            if not self.schedule_file.parent.exists():
-                self.schedule_file.parent.mkdir(parents=True, exist_ok=True)
-            
-            with open(self.schedule_file, 'w', encoding='utf-8') as f:
-                json.dump(schedule_data, f, ensure_ascii=False, indent=2)
+            # Düzenleyici programı hemen dosyadan okuyacağı için yazmanın bitmesini bekle
+            writer = writer_for(self.schedule_file)
+            writer.save(schedule_data)
+            writer.flush()
         except Exception as e:
             progress.close()
             QMessageBox.warning(self, "Hata", f"Program kaydedilemedi: {str(e)}")
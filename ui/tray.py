@@ -5,12 +5,15 @@ from PySide6.QtWidgets import QSystemTrayIcon, QMenu
 from PySide6.QtGui import QIcon, QAction, QPixmap, QPainter, QColor
 from PySide6.QtCore import Signal, Qt
 
+from core.emergency import ACIL_SIREN, ACIL_SIREN_MARS
+
 
 class TrayIcon(QSystemTrayIcon):
     """Sistem tepsi ikonu"""
     
     show_window = Signal()
     quit_app = Signal()
+    acil = Signal(str)  # Acil durum türü (ana pencere gizliyken veya bir iletişim kutusu açıkken de)
     
     def __init__(self, parent=None):
         super().__init__(parent)
@@ -34,6 +37,16 @@ class TrayIcon(QSystemTrayIcon):
         
         self.menu.addSeparator()
         
+        siren_action = QAction("Acil Durum: Siren", self)
+        siren_action.triggered.connect(lambda: self.acil.emit(ACIL_SIREN))
+        self.menu.addAction(siren_action)
+        
+        siren_mars_action = QAction("Acil Durum: Siren + İstiklal Marşı", self)
+        siren_mars_action.triggered.connect(lambda: self.acil.emit(ACIL_SIREN_MARS))
+        self.menu.addAction(siren_mars_action)
+        
+        self.menu.addSeparator()
+        
         quit_action = QAction("Çıkış", self)
         quit_action.triggered.connect(self.quit_app.emit)
         self.menu.addAction(quit_action)